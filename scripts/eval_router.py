@@ -1,13 +1,25 @@
-"""Measure nodes.router.route's source-selection precision/recall against
-the golden dataset. Fully offline -- disables the LLM fallback so the
-scored behavior is exactly the deterministic rules pass.
+"""Measure nodes.router.route's source-selection precision/recall, and
+its latency, against the golden dataset.
 
     python scripts/eval_router.py --report evals/router.json
+    python scripts/eval_router.py --mode classifier
+    python scripts/eval_router.py --mode llm        # live: needs GOOGLE_API_KEY
+
+`--mode rules` (the default) is fully offline: the classifier and the LLM
+fallback are both off, so the scored behavior is exactly the
+deterministic rules pass. `--mode classifier` turns on the local intent
+classifier (nodes/intent_classifier.py; loads the embedding model) with
+the LLM still off, and also scores the classifier alone on every case,
+rules bypassed -- the golden set is not in its training data. `--mode llm`
+routes unmatched questions through Gemini instead, for a latency
+comparison.
 """
 import argparse
 import json
+import statistics
 import sys
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict
 from pathlib import Path
 
 import yaml
@@ -17,22 +29,87 @@ sys.path.insert(0, str(ROOT / "src"))
 
 import config  # noqa: E402
 from nodes.base import PipelineState  # noqa: E402
-from nodes.router import route  # noqa: E402
+from nodes.router import _sources_for, route  # noqa: E402
 
 GOLDEN_PATH = ROOT / "tests" / "fixtures" / "golden" / "router_cases.yaml"
 
 
-def run(cases):
-    config.ENABLE_LLM_ROUTER = False  # score the rules pass only, deterministically
+MODES = ("rules", "classifier", "llm")
+
+
+def _latency(samples_ms) -> dict:
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {}
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _configure(mode):
+    config.ENABLE_INTENT_CLASSIFIER = mode == "classifier"
+    config.ENABLE_LLM_ROUTER = mode == "llm"
+    if mode != "classifier":
+        return None
+    from nodes.intent_classifier import get_classifier
+
+    started = time.perf_counter()
+    # Train up front so it isn't timed as the first case's routing.
+    if get_classifier() is None:
+        raise SystemExit("The intent classifier could not be trained; see the log above.")
+    return round(time.perf_counter() - started, 3)
+
+
+def _classifier_alone(cases) -> dict:
+    """Score the classifier on every case with the rules bypassed."""
+    from nodes.intent_classifier import get_classifier
+
+    classifier = get_classifier()
+    exact = 0
+    latencies = []
+    misses = []
+    for case in cases:
+        started = time.perf_counter()
+        prediction = classifier.predict(case["question"])
+        latencies.append((time.perf_counter() - started) * 1000)
+        got = _sources_for(prediction.intents)
+        if got == frozenset(case["expect_sources"]):
+            exact += 1
+        else:
+            misses.append({"id": case["id"], "got": sorted(got), "confidence": round(prediction.confidence, 3)})
+    held_out = classifier.held_out_score(config.INTENT_CLASSIFIER_MIN_CONFIDENCE)
+    return {
+        "exact_match_rate": round(exact / len(cases), 3) if cases else 1.0,
+        "latency_ms": _latency(latencies),
+        "misses": misses,
+        "held_out": {
+            "min_confidence": config.INTENT_CLASSIFIER_MIN_CONFIDENCE,
+            "accuracy": round(held_out.accuracy, 3),
+            "coverage": round(held_out.coverage, 3),
+            "confident_accuracy": round(held_out.confident_accuracy, 3),
+        },
+    }
+
+
+def run(cases, mode="rules"):
+    train_seconds = _configure(mode)
 
     confusions = []
+    rows = []
+    methods = Counter()
     tag_stats = defaultdict(lambda: {"tp": 0, "fp": 0, "fn": 0})
     tp = fp = fn = 0
     exact_matches = 0
 
     for case in cases:
         state = PipelineState(question=case["question"], team_nums=(14469,), season=2022, region="All")
+        started = time.perf_counter()
         decision = route(state)
+        latency_ms = (time.perf_counter() - started) * 1000
+        methods[decision.method] += 1
         got = decision.sources
         expected = frozenset(case["expect_sources"])
 
@@ -45,6 +122,8 @@ def run(cases):
         fn += case_fn
         if got == expected:
             exact_matches += 1
+        rows.append({"id": case["id"], "method": decision.method, "latency_ms": round(latency_ms, 3),
+                     "correct": got == expected})
 
         for tag in case.get("tags", []):
             tag_stats[tag]["tp"] += case_tp
@@ -56,6 +135,7 @@ def run(cases):
                 "id": case["id"], "question": case["question"],
                 "expected": sorted(expected), "got": sorted(got),
                 "spurious": sorted(got - expected), "missed": sorted(expected - got),
+                "method": decision.method,
             })
 
     precision = tp / (tp + fp) if (tp + fp) else 1.0
@@ -68,7 +148,8 @@ def run(cases):
         r = s["tp"] / (s["tp"] + s["fn"]) if (s["tp"] + s["fn"]) else 1.0
         per_tag[tag] = {"precision": round(p, 3), "recall": round(r, 3)}
 
-    return {
+    results = {
+        "mode": mode,
         "n_cases": len(cases),
         "exact_match_rate": round(exact_matches / len(cases), 3) if cases else 1.0,
         "micro_precision": round(precision, 3),
@@ -76,24 +157,47 @@ def run(cases):
         "micro_f1": round(f1, 3),
         "per_tag": per_tag,
         "confusions": confusions,
+        "methods": dict(methods),
+        "latency_ms": _latency([r["latency_ms"] for r in rows]),
+        "cases": rows,
     }
+    if mode == "classifier":
+        results["classifier_train_seconds"] = train_seconds
+        results["classifier_alone"] = _classifier_alone(cases)
+    return results
 
 
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--report", help="path to write JSON results")
+    p.add_argument("--mode", choices=MODES, default="rules",
+                   help="what decides questions no rule matches (default: rules only)")
     args = p.parse_args()
 
     with open(GOLDEN_PATH, encoding="utf-8") as f:
         cases = yaml.safe_load(f)
 
-    results = run(cases)
+    results = run(cases, args.mode)
 
-    print(f"Cases: {results['n_cases']}  Exact-match rate: {results['exact_match_rate']}")
+    print(f"Mode: {results['mode']}  Cases: {results['n_cases']}  Exact-match rate: {results['exact_match_rate']}")
     print(f"Micro precision: {results['micro_precision']}  recall: {results['micro_recall']}  f1: {results['micro_f1']}")
     print("\nPer-tag:")
     for tag, s in sorted(results["per_tag"].items()):
         print(f"  {tag:25s} precision={s['precision']:.3f} recall={s['recall']:.3f}")
+    print(f"\n{'case':45s} {'method':11s} {'ms':>9s}  ok")
+    for row in results["cases"]:
+        print(f"  {row['id']:43s} {row['method']:11s} {row['latency_ms']:9.3f}  {'yes' if row['correct'] else 'NO'}")
+    lat = results["latency_ms"]
+    print(f"Routing latency ms: mean={lat['mean']} p50={lat['p50']} p95={lat['p95']} max={lat['max']}")
+    print("Decided by: " + ", ".join(f"{m}={n}" for m, n in sorted(results["methods"].items())))
+    if "classifier_alone" in results:
+        alone = results["classifier_alone"]
+        print(f"Classifier alone (rules bypassed): exact-match rate {alone['exact_match_rate']}, "
+              f"p50 {alone['latency_ms']['p50']} ms, trained in {results['classifier_train_seconds']}s")
+        held_out = alone["held_out"]
+        print(f"Cross-validated on intent_examples.yaml: accuracy {held_out['accuracy']}; at confidence >= "
+              f"{held_out['min_confidence']}, coverage {held_out['coverage']} with accuracy "
+              f"{held_out['confident_accuracy']}")
     if results["confusions"]:
         print(f"\n{len(results['confusions'])} case(s) with mismatches:")
         for c in results["confusions"]:
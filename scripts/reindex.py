@@ -10,54 +10,139 @@ script is how you get back to a working store:
 
 `--wipe` deletes both collections before rebuilding. Without it, existing
 data for teams/seasons not listed is left alone (useful for topping up).
+
+Payloads are read from the raw-payload store (payload_store.py) whenever
+it has them, so after a `processor.SCHEMA_VERSION` bump the rebuild is an
+offline reprocess rather than one FTCScout call per team/season. Pass
+`--refetch` to go to the network anyway, or `--from-store` (instead of
+`--teams`/`--seasons`) to rebuild everything the store holds:
+
+    python scripts/reindex.py --wipe --from-store
+
+Teams can also come from a file (`--teams-file`, one or more numbers per
+line, `#` comments allowed) or a whole region's team index
+(`--region-index USIL`). Ingestion runs as a pipeline (src/ingest.py):
+`--fetch-workers` concurrent batched FTCScout requests feed one
+chunk-and-embed stage that embeds `--embed-batch-size` documents per model
+call. Every finished team/season is recorded in `--checkpoint`; rerun the
+same command after a crash and it picks up where it stopped (`--wipe` is
+skipped while the checkpoint has progress in it). The checkpoint is tied
+to the run -- its targets, options and chunk schema -- so a leftover from
+any other command is ignored (and `--wipe` goes ahead). It is deleted once
+every target has been attempted, including ones FTCScout had no data for.
+
+    python scripts/reindex.py --wipe --region-index USIL --seasons 2019,2021,2022,2023,2024,2025
 """
 import argparse
+import asyncio
+import hashlib
+import json
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
 
-import chromadb  # noqa: E402
-
+import clients  # noqa: E402
 import config  # noqa: E402
-from data_retrieval import fetch_team_data  # noqa: E402
+import ftcscout  # noqa: E402
+import payload_store  # noqa: E402
+import processor  # noqa: E402
+from data_retrieval import PAYLOAD_SCHEMA_VERSION, get_cached_teams_by_region  # noqa: E402
+from ingest import Checkpoint, ingest  # noqa: E402
 from vectordb import VectorDBManager  # noqa: E402
 
 
+def _parse_numbers(text: str) -> list:
+    numbers = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        numbers.extend(int(n) for n in line.replace(",", " ").split())
+    return numbers
+
+
+def _teams(args) -> list:
+    teams = []
+    if args.teams:
+        teams.extend(_parse_numbers(args.teams))
+    if args.teams_file:
+        teams.extend(_parse_numbers(Path(args.teams_file).read_text(encoding="utf-8")))
+    if args.region_index:
+        index = get_cached_teams_by_region(args.region_index)
+        if index is None:
+            sys.exit(f"Could not load the team index for region '{args.region_index}'.")
+        teams.extend(sorted(int(n) for n in index.values()))
+    return list(dict.fromkeys(teams))
+
+
+def _targets(args):
+    if args.from_store:
+        seasons_filter = {int(s) for s in args.seasons.split(",") if s.strip()} if args.seasons else None
+        return payload_store.get_store().keys(PAYLOAD_SCHEMA_VERSION, seasons=seasons_filter)
+    seasons_list = [int(s) for s in args.seasons.split(",") if s.strip()]
+    return [(team, season, args.region) for team in _teams(args) for season in seasons_list]
+
+
+def _run_id(args, targets) -> str:
+    """What a checkpoint must have been written by for this run to resume it."""
+    run = {
+        "targets": sorted([int(t), int(s), r] for t, s, r in targets),
+        "wipe": args.wipe, "refetch": args.refetch,
+        "schema": [processor.SCHEMA_VERSION, processor.SHARED_MATCHES_SCHEMA_VERSION, PAYLOAD_SCHEMA_VERSION],
+    }
+    return hashlib.sha256(json.dumps(run, sort_keys=True).encode()).hexdigest()[:16]
+
+
+async def _run(args, manager, targets, checkpoint):
+    async with ftcscout.FTCScoutClient() as client:
+        return await ingest(
+            targets, manager, client=client, checkpoint=checkpoint, refetch=args.refetch,
+            fetch_workers=args.fetch_workers, fetch_batch_size=args.fetch_batch_size,
+            embed_batch_size=args.embed_batch_size,
+        )
+
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--wipe", action="store_true", help="delete existing collections before rebuilding")
-    p.add_argument("--teams", required=True, help="comma-separated team numbers")
-    p.add_argument("--seasons", required=True, help="comma-separated seasons")
+    p.add_argument("--teams", help="comma-separated team numbers")
+    p.add_argument("--teams-file", help="file of team numbers (whitespace/comma separated, # comments)")
+    p.add_argument("--region-index", metavar="REGION", help="every team in this region's FTCScout team index")
+    p.add_argument("--seasons", help="comma-separated seasons (with --from-store: optional filter)")
     p.add_argument("--region", default="All")
+    p.add_argument("--refetch", action="store_true", help="ignore stored payloads and fetch from FTCScout")
+    p.add_argument("--from-store", action="store_true", help="reprocess every payload in the raw-payload store")
+    p.add_argument("--fetch-workers", type=int, default=config.FTCSCOUT_MAX_CONCURRENCY,
+                   help="concurrent FTCScout requests")
+    p.add_argument("--fetch-batch-size", type=int, default=10, help="teams per batched FTCScout request")
+    p.add_argument("--embed-batch-size", type=int, default=256, help="documents per embedding-model call")
+    p.add_argument("--checkpoint", default=str(config.CHROMA_PATH / "reindex.checkpoint"),
+                   help="progress file an interrupted run resumes from")
     args = p.parse_args()
+    has_teams = args.teams or args.teams_file or args.region_index
+    if not args.from_store and not (has_teams and args.seasons):
+        p.error("--seasons and one of --teams/--teams-file/--region-index are required unless --from-store is given")
 
-    teams = [int(t) for t in args.teams.split(",") if t.strip()]
-    seasons_list = [int(s) for s in args.seasons.split(",") if s.strip()]
-
-    client = chromadb.PersistentClient(path=str(config.CHROMA_PATH))
+    client = clients.get_chroma_client()
+    targets = list(_targets(args))
+    checkpoint = Checkpoint(args.checkpoint, run=_run_id(args, targets))
 
-    if args.wipe:
+    if args.wipe and checkpoint.done:
+        print(f"Resuming from {args.checkpoint} ({len(checkpoint.done)} done); not wiping.")
+    elif args.wipe:
         for collection in client.list_collections():
             print(f"Deleting collection '{collection.name}'...")
             client.delete_collection(collection.name)
 
     manager = VectorDBManager(client=client)
-
-    for team in teams:
-        for season in seasons_list:
-            print(f"Fetching team {team}, season {season}, region {args.region}...")
-            raw = fetch_team_data(team_number=team, season=season, region=args.region)
-            if not raw:
-                print(f"  -> no data returned, skipping")
-                continue
-            manager.upsert_team_data(raw, season=season, region=args.region)
-            count = manager.collection.get(
-                where={"$and": [{"team": team}, {"season": season}]}
-            )
-            print(f"  -> {len(count['ids'])} chunks")
-
-    print(f"\nTotal chunks in '{config.CHROMA_COLLECTION}': {manager.collection.count()}")
+    stats = asyncio.run(_run(args, manager, targets, checkpoint))
+
+    for team, season, region in stats.missing:
+        print(f"  no data for team {team}, season {season}, region {region}; skipped")
+    # Every target has been attempted; a rerun would only refetch the misses.
+    checkpoint.clear()
+    removed = payload_store.get_store().prune()
+    print(f"\n{stats.summary()} in {stats.elapsed:.1f}s; pruned {removed} superseded payload blob(s).")
+    print(f"Total chunks in '{config.CHROMA_COLLECTION}': {manager.collection.count()}")
 
 
 if __name__ == "__main__":
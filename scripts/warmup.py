@@ -0,0 +1,57 @@
+"""Preload every team at an event (or in a region) before competition day.
+
+    python scripts/warmup.py --event USILCMP
+    python scripts/warmup.py --region USIL --season 2025
+
+Teams already cached and fresh are skipped; the rest are fetched, embedded
+and written through the bulk ingestion pipeline (src/warmup.py,
+src/ingest.py), so the first `/ask` about each of them is a cache hit.
+The bot's `/warmup` admin command does the same from Discord. Run this
+only while the bot is stopped: the Chroma directory has a single writer.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import config  # noqa: E402
+import ftcscout  # noqa: E402
+import warmup  # noqa: E402
+from seasons import CURRENT_SEASON  # noqa: E402
+from vectordb import VectorDBManager  # noqa: E402
+
+
+async def _run(args):
+    async with ftcscout.FTCScoutClient() as client:
+        return await warmup.warm_up(
+            VectorDBManager(), season=args.season, event_code=args.event, region=args.region, client=client,
+            report=print, fetch_workers=args.fetch_workers, embed_batch_size=args.embed_batch_size,
+        )
+
+
+def main():
+    p = argparse.ArgumentParser()
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("--event", help="FTCScout event code, e.g. USILCMP")
+    target.add_argument("--region", help="preload this region's whole team index")
+    p.add_argument("--season", type=int, default=CURRENT_SEASON)
+    p.add_argument("--fetch-workers", type=int, default=config.FTCSCOUT_MAX_CONCURRENCY,
+                   help="concurrent FTCScout requests")
+    p.add_argument("--embed-batch-size", type=int, default=256, help="documents per embedding-model call")
+    args = p.parse_args()
+    if args.event:
+        args.event = args.event.strip().upper()
+
+    try:
+        result = asyncio.run(_run(args))
+    except warmup.WarmupError as e:
+        sys.exit(str(e))
+    for team, season, region in result.stats.missing:
+        print(f"  no data for team {team}, season {season}, region {region}")
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Persistent exact-answer cache in front of `chain.answer`.
+
+During an event the same handful of questions ("how many matches did
+21333 win") get asked over and over, and each one used to cost a full
+retrieval plus a Gemini call even though nothing it read had changed.
+`AnswerCache` keeps every answer under a key made of:
+
+- the normalized question text (case, whitespace and trailing
+  punctuation folded),
+- the sorted team numbers, season and region,
+- the explicitly requested sources, or a fixed marker for a routed
+  question (its route follows from the question text, so the lookup can
+  happen before routing or any retrieval starts), and
+- the data version of every involved team: its manifest entry's
+  `fetched_at` and content hash (`VectorDBManager.data_version`).
+
+So a re-upsert that changes a team's chunks changes the key, and the old
+answer can't be served. The writer (`vectordb._ChromaWriter`) also calls
+`invalidate` after every write, which drops those answers outright rather
+than leaving them to age out.
+
+Entries are bounded by `config.ANSWER_CACHE_MAX_ENTRIES` (least recently
+used evicted first) and expire after `config.ANSWER_CACHE_TTL_HOURS`,
+which also bounds how stale any community context in them can get. They
+live in a SQLite file at `config.ANSWER_CACHE_PATH`, so a restart keeps
+them. Any cache I/O error is logged and treated as a miss, never failing
+the answer.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import config
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = "?!. "
+
+
+def normalize_question(question: str) -> str:
+    """`question` lower-cased, whitespace collapsed, trailing ?!. dropped."""
+    return _WHITESPACE_RE.sub(" ", question.strip().lower()).rstrip(_TRAILING_PUNCTUATION)
+
+
+def answer_key(question, team_nums, season, region, sources, data_version, k=None) -> str:
+    """The cache key for one `/ask`. `data_version` is the per-team tuple
+    from `VectorDBManager.data_version`; `k` is `chain.answer`'s."""
+    parts = [
+        normalize_question(question),
+        sorted(int(t) for t in team_nums),
+        season,
+        region,
+        sorted(sources),
+        [list(v) for v in data_version],
+        k,
+    ]
+    return hashlib.sha256(json.dumps(parts, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    def __init__(self, path, max_entries: int, ttl_seconds: float):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers "
+            "(key TEXT PRIMARY KEY, answer TEXT NOT NULL, stored_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answer_teams "
+            "(key TEXT NOT NULL, team INTEGER NOT NULL, season INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS answer_teams_slice ON answer_teams (team, season)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS answer_teams_key ON answer_teams (key)")
+        self.hits = 0
+        self.misses = 0
+
+    def _delete(self, keys) -> None:
+        rows = [(k,) for k in keys]
+        self._db.executemany("DELETE FROM answers WHERE key = ?", rows)
+        self._db.executemany("DELETE FROM answer_teams WHERE key = ?", rows)
+
+    def get(self, key: str, now: float = None):
+        """The cached answer for `key`, or None if absent or expired."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._db.execute("SELECT answer, stored_at FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._delete([key])
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE answers SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, answer: str, teams, now: float = None) -> None:
+        """Store `answer` under `key`, tagged with the `(team, season)`
+        slices it was built from so `invalidate` can find it."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._delete([key])
+                self._db.execute(
+                    "INSERT INTO answers (key, answer, stored_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, answer, now, now),
+                )
+                self._db.executemany(
+                    "INSERT INTO answer_teams (key, team, season) VALUES (?, ?, ?)",
+                    [(key, int(team), int(season)) for team, season in teams],
+                )
+                self._delete(k for (k,) in self._db.execute(
+                    "SELECT key FROM answers WHERE stored_at < ?", (now - self.ttl_seconds,),
+                ).fetchall())
+                overflow = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    self._delete(k for (k,) in self._db.execute(
+                        "SELECT key FROM answers ORDER BY last_used LIMIT ?", (overflow,),
+                    ).fetchall())
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, keys) -> int:
+        """Drop every answer built from any of these `(team, season)`
+        slices; returns how many were dropped."""
+        slices = [(int(team), int(season)) for team, season in keys]
+        if not slices:
+            return 0
+        with self._lock:
+            stale = set()
+            for team, season in slices:
+                stale.update(k for (k,) in self._db.execute(
+                    "SELECT key FROM answer_teams WHERE team = ? AND season = ?", (team, season),
+                ))
+            if stale:
+                self._db.execute("BEGIN")
+                try:
+                    self._delete(stale)
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+            return len(stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+
+@lru_cache(maxsize=None)
+def _cache_at(path: str, max_entries: int, ttl_seconds: float) -> AnswerCache:
+    return AnswerCache(path, max_entries, ttl_seconds)
+
+
+def get_cache() -> AnswerCache:
+    """The process-wide cache at `config.ANSWER_CACHE_PATH`."""
+    return _cache_at(
+        str(config.ANSWER_CACHE_PATH), config.ANSWER_CACHE_MAX_ENTRIES, config.ANSWER_CACHE_TTL_HOURS * 3600,
+    )
+
+
+def invalidate(keys) -> None:
+    """Drop the answers built from these `(team, season)` slices, if the
+    cache is enabled. Called by the writer after each write."""
+    if not config.ENABLE_ANSWER_CACHE:
+        return
+    try:
+        get_cache().invalidate(keys)
+    except (sqlite3.Error, OSError):
+        logger.warning("could not invalidate cached answers", exc_info=True)
@@ -1,6 +1,8 @@
 import asyncio
 import io
 import re
+import threading
+import time
 
 import discord
 from discord import app_commands
@@ -9,7 +11,9 @@ from discord.ext import commands
 import chain
 import config
 import clients
-from data_retrieval import fetch_team_data, get_cached_teams_by_region
+import ftcscout
+import warmup
+from data_retrieval import aload_teams_data, get_cached_teams_by_region
 from extraction import extract_info
 from logging_setup import get_logger
 from portfolio import compose as portfolio_compose
@@ -26,10 +30,6 @@ logger = get_logger(__name__)
 
 vectordb = VectorDBManager()
 
-# Chroma's PersistentClient is not safe for concurrent writers; serialize
-# upserts across simultaneous /ask invocations.
-_chroma_write_lock = asyncio.Lock()
-
 # Discord echoes whatever text we send verbatim; external community sources
 # (Reddit/Chief Delphi/YouTube captions) are attacker-reachable text that
 # could contain an @everyone/@here or a user/role mention. Disabling all
@@ -56,6 +56,10 @@ class MyBot(commands.Bot):
             await self.tree.sync()
             print("Synced slash commands globally (may take up to an hour to propagate).")
 
+    async def close(self):
+        await ftcscout.close_client()
+        await super().close()
+
 
 bot = MyBot()
 
@@ -146,6 +150,95 @@ def _chunk_message(text: str, limit: int = None) -> list[str]:
     return chunks
 
 
+async def _iterate_in_thread(fn, *args, **kwargs):
+    """Run the blocking generator `fn(*args, **kwargs)` on a worker thread,
+    yielding its items on the event loop as they're produced. If the
+    consumer stops early (an exception, a cancellation, a `break`), the
+    worker stops pulling items and closes the generator."""
+    loop = asyncio.get_running_loop()
+    items = asyncio.Queue()
+    done = object()
+    stop = threading.Event()
+
+    def put(item, exc=None):
+        if not stop.is_set():
+            loop.call_soon_threadsafe(items.put_nowait, (item, exc))
+
+    def pump():
+        gen = fn(*args, **kwargs)
+        try:
+            for item in gen:
+                if stop.is_set():
+                    break
+                put(item)
+        except Exception as exc:
+            put(done, exc)
+        else:
+            put(done)
+        finally:
+            gen.close()
+
+    worker = asyncio.ensure_future(asyncio.to_thread(pump))
+    try:
+        while True:
+            item, exc = await items.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+    await worker
+    if exc is not None:
+        raise exc
+
+
+class _StreamedReply:
+    """A reply shown while it's still being generated: the deferred
+    response is edited in place as text arrives, text past
+    `DISCORD_MESSAGE_LIMIT` rolls over into follow-up messages, and edits
+    are spaced at least `config.DISCORD_STREAM_EDIT_SECONDS` apart (the
+    first piece is shown at once)."""
+
+    def __init__(self, interaction: discord.Interaction, header: str, interval: float = None):
+        self._interaction = interaction
+        self._header = header
+        self._text = ""
+        self._interval = config.DISCORD_STREAM_EDIT_SECONDS if interval is None else interval
+        self._last_flush = None
+        self._shown = []  # what each message currently shows
+        self._followups = []  # messages after the original response
+
+    async def add(self, piece: str) -> None:
+        self._text += piece
+        if self._last_flush is None or time.monotonic() - self._last_flush >= self._interval:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Bring every message up to date with the text so far."""
+        for i, content in enumerate(_chunk_message(self._header + self._text)):
+            if i >= len(self._shown):
+                await self._send(i, content)
+                self._shown.append(content)
+            elif self._shown[i] != content:
+                await self._edit(i, content)
+                self._shown[i] = content
+        self._last_flush = time.monotonic()
+
+    async def _send(self, i: int, content: str) -> None:
+        if i == 0:
+            # The deferred "thinking..." response becomes the first message.
+            await self._edit(0, content)
+        else:
+            message = await self._interaction.followup.send(content, wait=True, allowed_mentions=_NO_MENTIONS)
+            self._followups.append(message)
+
+    async def _edit(self, i: int, content: str) -> None:
+        if i == 0:
+            await self._interaction.edit_original_response(content=content, allowed_mentions=_NO_MENTIONS)
+        else:
+            await self._followups[i - 1].edit(content=content, allowed_mentions=_NO_MENTIONS)
+
+
 @bot.tree.command(name="ask", description="Ask the FTC AI Bot a question")
 @app_commands.describe(
     season="FTC Season (OPTIONAL), Defaults to 2025",
@@ -191,32 +284,34 @@ async def ask(interaction: discord.Interaction,
     names_by_num = {num: name for name, num in region_dict.items()}
     team_names = [names_by_num[n] for n in team_nums if n in names_by_num]
 
-    async with _chroma_write_lock:
-        for team_num in team_nums:
-            try:
-                await asyncio.to_thread(
-                    vectordb.get_or_load_team,
-                    team_num=team_num,
-                    fetch_function=fetch_team_data,
-                    season=season_val,
-                    region=region_str,
-                )
-            except Exception:
-                logger.exception("failed to fetch/cache data for team %s", team_num)
-                await interaction.followup.send(
-                    f"Failed to fetch data for team {team_num}. Please try again shortly.",
-                    allowed_mentions=_NO_MENTIONS,
-                )
-                return
-
+    # One batched FTCScout request for every cache-miss team, so a
+    # multi-team comparison costs one round trip rather than one per team.
+    # No bot-level lock: VectorDBManager coalesces concurrent loads of the
+    # same team+season and serializes its own Chroma writes, so a user
+    # asking about one team never queues behind another team's fetch.
     try:
-        answer = await asyncio.to_thread(
-            chain.answer, question, team_nums=team_nums, season=season_val, region=region_str,
-            team_names=team_names,
+        await vectordb.aget_or_load_teams(
+            team_nums, aload_teams_data, season=season_val, region=region_str,
         )
-        reply = _format_reply(question, team_nums, season_val, region_str, answer)
-        for chunk in _chunk_message(reply):
-            await interaction.followup.send(chunk, allowed_mentions=_NO_MENTIONS)
+    except Exception:
+        logger.exception("failed to fetch/cache data for teams %s", team_nums)
+        await interaction.followup.send(
+            f"Failed to fetch data for team(s) {', '.join(str(t) for t in team_nums)}. "
+            "Please try again shortly.",
+            allowed_mentions=_NO_MENTIONS,
+        )
+        return
+
+    try:
+        # Streamed: the reply appears with Gemini's first tokens and grows
+        # in place, instead of after the whole generation.
+        reply = _StreamedReply(interaction, _format_reply(question, team_nums, season_val, region_str, ""))
+        async for piece in _iterate_in_thread(
+            chain.stream_answer, question, team_nums=team_nums, season=season_val, region=region_str,
+            team_names=team_names, data_version=vectordb.data_version(team_nums, season_val),
+        ):
+            await reply.add(piece)
+        await reply.flush()
     except Exception:
         logger.exception("unhandled error answering question: %r", question)
         await interaction.followup.send(
@@ -225,6 +320,49 @@ async def ask(interaction: discord.Interaction,
         )
 
 
+@bot.tree.command(name="warmup", description="Preload every team at an event or in a region (admin)")
+@app_commands.describe(
+    event_code="FTCScout event code, e.g. USILCMP (give this or a region)",
+    region="Region whose whole team index to preload (give this or an event code)",
+    season="FTC Season (OPTIONAL), defaults to the current season",
+)
+@app_commands.choices(season=[
+    app_commands.Choice(name=f"{name} ({year})", value=year)
+    for year, name in SEASON_NAMES.items()
+])
+@app_commands.autocomplete(region=region_autocomplete)
+@app_commands.default_permissions(administrator=True)
+@app_commands.guild_only()
+async def warmup_command(interaction: discord.Interaction,
+                         event_code: str = None,
+                         region: str = None,
+                         season: app_commands.Choice[int] = None):
+    if not event_code and not region:
+        await interaction.response.send_message(
+            "Give an `event_code` or a `region` to warm up.", ephemeral=True, allowed_mentions=_NO_MENTIONS,
+        )
+        return
+    await interaction.response.defer(ephemeral=True)
+
+    season_val = season.value if season is not None else CURRENT_SEASON
+    try:
+        result = await warmup.warm_up(
+            vectordb, season=season_val, event_code=event_code.strip().upper() if event_code else None,
+            region=region,
+        )
+    except warmup.WarmupError as e:
+        await interaction.followup.send(str(e), ephemeral=True, allowed_mentions=_NO_MENTIONS)
+        return
+    except Exception:
+        logger.exception("warm-up failed (event=%r, region=%r, season=%s)", event_code, region, season_val)
+        await interaction.followup.send(
+            "Warm-up failed partway; anything already loaded stays cached. Check the logs.",
+            ephemeral=True, allowed_mentions=_NO_MENTIONS,
+        )
+        return
+    await interaction.followup.send(result.summary(), ephemeral=True, allowed_mentions=_NO_MENTIONS)
+
+
 _OUTPUT_NAME_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]")
 
 
@@ -4,20 +4,81 @@
 client from scratch on every `/ask` call — reloading a sentence-transformer
 model off disk each time. These factories build each client once per
 process and cache it.
+
+The ingest side (`vectordb.VectorDBManager`, chromadb's embedding-function
+protocol) and the query side (`get_vector_store`, LangChain's `Embeddings`)
+used to load the sentence-transformer separately -- two copies of the same
+model and tokenizer -- and open two `PersistentClient`s on the same SQLite
+file. Both now go through `get_embedding_model` and `get_chroma_client`.
 """
+import os
+import sys
 from functools import lru_cache
 
 import chromadb
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_huggingface import HuggingFaceEmbeddings
 
 import config
+import embedding_cache
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model():
+    """The one loaded sentence-transformer, shared by every embedder below."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(config.EMBEDDING_MODEL)
+
+
+class _SentenceTransformerEmbeddings(Embeddings):
+    """LangChain adapter over the shared model. Encodes exactly as
+    `langchain_huggingface.HuggingFaceEmbeddings` (which this replaces)
+    does with its defaults -- newlines flattened, no normalization -- so
+    query vectors are unchanged."""
+
+    def __init__(self, model):
+        self._model = model
+
+    @staticmethod
+    def prepare(text: str) -> str:
+        return text.replace("\n", " ")
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        texts = [self.prepare(t) for t in texts]
+        return self._model.encode(texts, show_progress_bar=False).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> Embeddings:
+    """LangChain-protocol embedder (the vector store's query side)."""
+    embeddings = _SentenceTransformerEmbeddings(get_embedding_model())
+    if config.ENABLE_EMBEDDING_CACHE:
+        embeddings = embedding_cache.CachedEmbeddings(
+            embeddings, embedding_cache.get_cache(config.EMBEDDING_MODEL), prepare=embeddings.prepare,
+        )
+    return embeddings
 
 
 @lru_cache(maxsize=1)
-def get_embeddings() -> HuggingFaceEmbeddings:
-    return HuggingFaceEmbeddings(model_name=config.EMBEDDING_MODEL)
+def get_embedding_function():
+    """chromadb-protocol embedder (VectorDBManager's write side). Still a
+    real `SentenceTransformerEmbeddingFunction`, so the collection's
+    persisted embedding-function config is unchanged -- it's just handed
+    the shared model through its class-level model cache instead of
+    loading its own."""
+    SentenceTransformerEmbeddingFunction.models.setdefault(config.EMBEDDING_MODEL, get_embedding_model())
+    ef = SentenceTransformerEmbeddingFunction(model_name=config.EMBEDDING_MODEL)
+    if config.ENABLE_EMBEDDING_CACHE:
+        ef = embedding_cache.CachedEmbeddingFunction(ef, embedding_cache.get_cache(config.EMBEDDING_MODEL))
+    return ef
 
 
 @lru_cache(maxsize=1)
@@ -69,9 +130,45 @@ def get_vector_store() -> Chroma:
     )
 
 
+def _rss_bytes():
+    """Current resident set size, or None where it can't be read cheaply."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_report() -> dict:
+    """What the loaded singletons cost: process RSS, the shared embedding
+    model's parameter memory, and how many sentence-transformer copies are
+    loaded (should be exactly one)."""
+    report = {"rss_mb": None, "embedding_model_mb": None, "embedding_models_loaded": 0}
+    rss = _rss_bytes()
+    if rss is not None:
+        report["rss_mb"] = round(rss / 2**20, 1)
+    if get_embedding_model.cache_info().currsize:
+        model = get_embedding_model()
+        param_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+        report["embedding_model_mb"] = round(param_bytes / 2**20, 1)
+        report["embedding_models_loaded"] = len({id(m) for m in SentenceTransformerEmbeddingFunction.models.values()} | {id(model)})
+    return report
+
+
 def warm_up():
     """Force-load every singleton. Call once at startup so the first /ask
     isn't the one paying for the model load."""
     get_embeddings()
+    get_embedding_function()
     get_llm()
     get_vector_store()
+    if config.ENABLE_INTENT_CLASSIFIER:
+        from nodes.intent_classifier import get_classifier  # local import: nodes imports this module
+        get_classifier()
+    logger.info("startup memory: %s", memory_report())
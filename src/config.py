@@ -32,13 +32,41 @@ GEMINI_MAX_TOKENS = int(os.getenv("GEMINI_MAX_TOKENS", "1024"))
 RETRIEVAL_K = int(os.getenv("RETRIEVAL_K", "40"))
 
 # Current-season data changes during competition weekends; older seasons are
-# immutable once played, so they're cached forever.
+# immutable once played, so they're cached forever. How long a current-season
+# team stays cached is decided by freshness.py: "calendar" (the default) keys
+# the TTL off the team's own event dates -- short during and just after an
+# event, long otherwise; "flat" applies CACHE_TTL_HOURS to every team.
+FRESHNESS_POLICY = os.getenv("FRESHNESS_POLICY", "calendar").strip().lower()
 CACHE_TTL_HOURS = int(os.getenv("CACHE_TTL_HOURS", "24"))
+FRESHNESS_EVENT_TTL_MINUTES = float(os.getenv("FRESHNESS_EVENT_TTL_MINUTES", "30"))
+FRESHNESS_POST_EVENT_TTL_HOURS = float(os.getenv("FRESHNESS_POST_EVENT_TTL_HOURS", "6"))
+FRESHNESS_POST_EVENT_DAYS = int(os.getenv("FRESHNESS_POST_EVENT_DAYS", "3"))
+FRESHNESS_IDLE_TTL_HOURS = float(os.getenv("FRESHNESS_IDLE_TTL_HOURS", "168"))
+# Those checks read an in-memory manifest (manifest.py) built from the
+# collection at startup. Set this to also keep it in a sidecar file, so a
+# restart skips the full metadata scan. Unset: memory only.
+FRESHNESS_MANIFEST_PATH = os.getenv("FRESHNESS_MANIFEST_PATH") or None
+
+# FTCScout client (ftcscout.py): one pooled connection set per process,
+# a cap on simultaneous in-flight requests, and a bounded jittered retry for
+# 429/5xx/timeouts.
+FTCSCOUT_TIMEOUT_SECONDS = float(os.getenv("FTCSCOUT_TIMEOUT_SECONDS", "15"))
+FTCSCOUT_MAX_CONNECTIONS = int(os.getenv("FTCSCOUT_MAX_CONNECTIONS", "10"))
+FTCSCOUT_MAX_CONCURRENCY = int(os.getenv("FTCSCOUT_MAX_CONCURRENCY", "6"))
+FTCSCOUT_MAX_RETRIES = int(os.getenv("FTCSCOUT_MAX_RETRIES", "3"))
+
+# Raw FTCScout payloads (payload_store.py), kept so head-to-head and
+# reindexing can reuse them instead of refetching.
+PAYLOAD_STORE_DIR = Path(os.getenv("PAYLOAD_STORE_DIR", SRC_ROOT / "payloads"))
 
 TEAMS_INDEX_DIR = Path(os.getenv("TEAMS_INDEX_DIR", SRC_ROOT / "data"))
 TEAMS_INDEX_TTL_DAYS = int(os.getenv("TEAMS_INDEX_TTL_DAYS", "7"))
 
 DISCORD_MESSAGE_LIMIT = 1900  # Discord hard-caps at 2000; leave headroom.
+# /ask answers are streamed into Discord by editing the reply as it grows;
+# at most one edit per message every this many seconds keeps well inside
+# Discord's per-channel edit rate limit.
+DISCORD_STREAM_EDIT_SECONDS = float(os.getenv("DISCORD_STREAM_EDIT_SECONDS", "1.2"))
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
@@ -50,6 +78,46 @@ def _env_bool(name: str, default: bool) -> bool:
     return val.strip().lower() in ("1", "true", "yes", "on")
 
 
+# On-disk cache of document embeddings (embedding_cache.py), keyed by model
+# and text hash, so re-embedding unchanged chunk text is a disk read. LRU-
+# evicted once the vectors file reaches EMBEDDING_CACHE_MAX_MB.
+ENABLE_EMBEDDING_CACHE = _env_bool("ENABLE_EMBEDDING_CACHE", True)
+EMBEDDING_CACHE_DIR = Path(os.getenv("EMBEDDING_CACHE_DIR", SRC_ROOT / "embedding_cache"))
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "256"))
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+
+# Backend for team+season-filtered retrieval. "chroma" (the default) runs
+# Chroma's HNSW search with a metadata `where` filter; "memory" serves it
+# from vector_index.py's per-(team, season) NumPy matrices instead -- exact
+# cosine top-k over just the filtered chunks. Unfiltered queries always go
+# to Chroma. VECTOR_INDEX_MAX_SLICES caps how many (team, season) matrices
+# stay loaded (LRU).
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "chroma").strip().lower()
+VECTOR_INDEX_MAX_SLICES = int(os.getenv("VECTOR_INDEX_MAX_SLICES", "256"))
+
+# How match scores are chunked. "per_team" (the default) writes a
+# `match_granular` chunk per team per match; "shared" writes each (event,
+# match, alliance) breakdown once under a match-level id and has teams
+# reference it (processor.py), so a fully cached region stores and embeds
+# each match once instead of up to four times. It is a different chunk
+# schema version: switching needs `scripts/reindex.py --wipe`.
+MATCH_LAYOUT = os.getenv("MATCH_LAYOUT", "per_team").strip().lower()
+
+# Single-team stats lookups ("how many matches did 21333 win") recognized
+# by lookup.py's rules are answered from the stored facts with a template,
+# with no Gemini call; anything else goes to the LLM as before.
+ENABLE_TEMPLATED_ANSWERS = _env_bool("ENABLE_TEMPLATED_ANSWERS", True)
+
+# Exact-answer cache in front of chain.answer (answer_cache.py): an /ask
+# whose normalized question, teams, season, region, route and team data
+# versions all match an earlier one gets that answer back without a
+# retrieval or Gemini call. Bounded LRU with a TTL, kept in SQLite.
+ENABLE_ANSWER_CACHE = _env_bool("ENABLE_ANSWER_CACHE", True)
+ANSWER_CACHE_PATH = Path(os.getenv("ANSWER_CACHE_PATH", SRC_ROOT / "answer_cache" / "answers.sqlite3"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2000"))
+ANSWER_CACHE_TTL_HOURS = float(os.getenv("ANSWER_CACHE_TTL_HOURS", "6"))
+
+
 # --- Multi-source retrieval pipeline ---
 # Local sources (stats, chroma) are always on. Everything below is an
 # optional node that self-disables when unconfigured, so the bot's default
@@ -65,9 +133,22 @@ ENABLE_CHIEF_DELPHI = _env_bool("ENABLE_CHIEF_DELPHI", True)
 # Off by default: slowest, least reliable node (web search + captions).
 ENABLE_YOUTUBE = _env_bool("ENABLE_YOUTUBE", False)
 ENABLE_LLM_ROUTER = _env_bool("ENABLE_LLM_ROUTER", True)
+# Local embedding classifier (nodes/intent_classifier.py) for questions no
+# router rule matches; the LLM router is only asked when it is less sure
+# than INTENT_CLASSIFIER_MIN_CONFIDENCE (0..1). Training logs the
+# cross-validated accuracy and coverage at this threshold. Off until
+# `scripts/eval_router.py --mode classifier` has been compared against the
+# rules and llm modes on the real model and the threshold set from it.
+ENABLE_INTENT_CLASSIFIER = _env_bool("ENABLE_INTENT_CLASSIFIER", False)
+INTENT_CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("INTENT_CLASSIFIER_MIN_CONFIDENCE", "0.6"))
 
 NODE_TIMEOUT_SECONDS = float(os.getenv("NODE_TIMEOUT_SECONDS", "6"))
 PIPELINE_BUDGET_SECONDS = float(os.getenv("PIPELINE_BUDGET_SECONDS", "12"))
+# Process-wide caps for the node runner (nodes/base.py): worker threads for
+# sync nodes, and pooled connections for the async external adapters
+# (tools/http.py).
+NODE_WORKER_THREADS = int(os.getenv("NODE_WORKER_THREADS", "16"))
+EXTERNAL_MAX_CONNECTIONS = int(os.getenv("EXTERNAL_MAX_CONNECTIONS", "20"))
 EXTERNAL_CACHE_TTL_MINUTES = int(os.getenv("EXTERNAL_CACHE_TTL_MINUTES", "60"))
 
 MAX_EXTERNAL_CHARS_PER_SOURCE = int(os.getenv("MAX_EXTERNAL_CHARS_PER_SOURCE", "3000"))
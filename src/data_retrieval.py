@@ -1,168 +1,148 @@
-import requests
+import asyncio
 import json
 import time
+from functools import lru_cache
 from operator import itemgetter
 from collections import OrderedDict
 
 import config
+import freshness
+import ftcscout
+import payload_store
 from seasons import CURRENT_SEASON
 
-API_URL = "https://api.ftcscout.org/graphql"
+API_URL = ftcscout.API_URL
 CURRENT_FTC_SEASON = CURRENT_SEASON  # kept for backward compatibility; seasons.py is the source of truth
 DEFAULT_REGION = 'All'
 
-def fetch_team_data(team_number: int, season: int = None, region: str = None, event_code: str = None):
-    # This query requests EVERY field defined in the schema for Team, Awards, QuickStats, Events, and Matches.
-    # It explicitly expands all Fragments for seasons 2019-2025.
-    if season is None:
-        season = CURRENT_FTC_SEASON
-    if region is None:
-        region = DEFAULT_REGION  
+# Version of the shape of a `TeamSeason` payload, i.e. which fields the
+# query below selects. It keys the raw-payload store (payload_store.py), so
+# bump it whenever a field is added to or removed from the selection --
+# stored payloads from the old selection are then simply not found.
+# Unrelated to `processor.SCHEMA_VERSION`: a chunk-schema bump reprocesses
+# stored payloads as they are.
+PAYLOAD_SCHEMA_VERSION = 1
+
+# Every field defined in the schema for Team, Awards, QuickStats, Events, and
+# Matches, as one `Team` fragment so the single-team and batched queries share
+# it. The per-season `stats`/`scores` type spreads are filled in by
+# `_season_fragments`.
+_TEAM_SEASON_FRAGMENT_TEMPLATE = """
+    fragment TeamSeason on Team {
+      # --- 1. CORE IDENTITY ---
+      number
+      name
+      schoolName
+      sponsors
+      rookieYear
+      website
+      createdAt
+      updatedAt
+      location {
+        venue
+        city
+        state
+        country
+      }
 
-    query = """
-    query GetLiterallyEverything($number: Int!, $season: Int!, $region: RegionOption, $eventCode: String) {
-      teamByNumber(number: $number) {
-        # --- 1. CORE IDENTITY ---
-        number
-        name
-        schoolName
-        sponsors
-        rookieYear
-        website
+      # --- 2. AWARDS ---
+      awards(season: $season) {
+        season
+        eventCode
+        teamNumber
+        divisionName
+        personName
+        type
+        placement
         createdAt
         updatedAt
-        location {
-          venue
-          city
-          state
-          country
+        event {
+          name
         }
+      }
 
-        # --- 2. AWARDS ---
-        awards(season: $season) {
-          season
-          eventCode
-          teamNumber
-          divisionName
-          personName
-          type
-          placement
-          createdAt
-          updatedAt
-          event {
-            name
-          }
-        }
+      # --- 3. QUICKSTATS ---
+      quickStats(season: $season, region: $region) {
+        tot { value rank }
+        auto { value rank }
+        dc { value rank }
+        eg { value rank }
+        count
+      }
 
-        # --- 3. QUICKSTATS ---
-        quickStats(season: $season, region: $region) {
-          tot { value rank }
-          auto { value rank }
-          dc { value rank }
-          eg { value rank }
-          count
+      # --- 4. EVENTS & STATS ---
+      events(season: $season) {
+        season
+        eventCode
+        teamNumber
+        event {
+          code
+          name
+          start
+          end
+          type
+          location { city state country venue }
+          website
+          liveStreamURL
+          timezone
         }
-
-        # --- 4. EVENTS & STATS ---
-        events(season: $season) {
-          season
-          eventCode
-          teamNumber
-          event {
-            code
-            name
-            start
-            end
-            type
-            location { city state country venue }
-            website
-            liveStreamURL
-            timezone
-          }
-          stats {
-            ... on TeamEventStats2025 { ...Stats2025 }
-            ... on TeamEventStats2024 { ...Stats2024 }
-            ... on TeamEventStats2023 { ...Stats2023 }
-            ... on TeamEventStats2022 { ...Stats2022 }
-            ... on TeamEventStats2021Trad { ...Stats2021 }
-            ... on TeamEventStats2021Remote { ...Stats2021R }
-            ... on TeamEventStats2020Trad { ...Stats2020 }
-            ... on TeamEventStats2020Remote { ...Stats2020R }
-            ... on TeamEventStats2019 { ...Stats2019 }
-          }
+        stats {
+%(stats_spreads)s
         }
+      }
 
-        # --- 5. MATCHES & SCORES ---
-        matches(season: $season, eventCode: $eventCode) {
-          season
-          eventCode
-          matchId
-          station
-          alliance
-          allianceRole
-          surrogate
-          noShow
-          dq
-          onField
-          createdAt
-          updatedAt
-          match {
-            description
-            matchNum
-            series
-            tournamentLevel
-            scheduledStartTime
-            actualStartTime
-            postResultTime
-            hasBeenPlayed
-            scores {
-              # --- TRADITIONAL SEASONS (Red/Blue Objects) ---
-              ... on MatchScores2025 {
-                red { ...Score2025 }
-                blue { ...Score2025 }
-              }
-              ... on MatchScores2024 {
-                red { ...Score2024 }
-                blue { ...Score2024 }
-              }
-              ... on MatchScores2023 {
-                red { ...Score2023 }
-                blue { ...Score2023 }
-              }
-              ... on MatchScores2022 {
-                red { ...Score2022 }
-                blue { ...Score2022 }
-              }
-              ... on MatchScores2021Trad {
-                red { ...Score2021 }
-                blue { ...Score2021 }
-              }
-              ... on MatchScores2020Trad {
-                red { ...Score2020 }
-                blue { ...Score2020 }
-              }
-              ... on MatchScores2019 {
-                red { ...Score2019 }
-                blue { ...Score2019 }
-              }
-
-              # --- REMOTE SEASONS (Direct Fields - No Red/Blue) ---
-              # Fixed: Applied directly to the score object
-              ... on MatchScores2021Remote {
-                 ...Score2021R
-              }
-              ... on MatchScores2020Remote {
-                 ...Score2020R
-              }
-            }
-          }
+      # --- 5. MATCHES & SCORES ---
+      matches(season: $season, eventCode: $eventCode) {
+        season
+        eventCode
+        matchId
+        station
+        alliance
+        allianceRole
+        surrogate
+        noShow
+        dq
+        onField
+        createdAt
+        updatedAt
+        match {
+          description
+          matchNum
+          series
+          tournamentLevel
+          scheduledStartTime
+          actualStartTime
+          postResultTime
+          hasBeenPlayed
+%(match_scores)s
         }
       }
     }
-
-    # --- FRAGMENTS ---
-
-    # 2025: INTO THE DEEP
+"""
+
+_QUERY_VARIABLES = "$season: Int!, $region: RegionOption, $eventCode: String"
+
+# season -> ((TeamEventStats type, stats fragment, MatchScores type, score fragment, alliance-split), ...)
+# Remote seasons (2020/2021 COVID format) return a single flat score object
+# with no red/blue split, so their score fragment is spread directly.
+_SEASON_VARIANTS = {
+    2025: (("TeamEventStats2025", "Stats2025", "MatchScores2025", "Score2025", True),),
+    2024: (("TeamEventStats2024", "Stats2024", "MatchScores2024", "Score2024", True),),
+    2023: (("TeamEventStats2023", "Stats2023", "MatchScores2023", "Score2023", True),),
+    2022: (("TeamEventStats2022", "Stats2022", "MatchScores2022", "Score2022", True),),
+    2021: (
+        ("TeamEventStats2021Trad", "Stats2021", "MatchScores2021Trad", "Score2021", True),
+        ("TeamEventStats2021Remote", "Stats2021R", "MatchScores2021Remote", "Score2021R", False),
+    ),
+    2020: (
+        ("TeamEventStats2020Trad", "Stats2020", "MatchScores2020Trad", "Score2020", True),
+        ("TeamEventStats2020Remote", "Stats2020R", "MatchScores2020Remote", "Score2020R", False),
+    ),
+    2019: (("TeamEventStats2019", "Stats2019", "MatchScores2019", "Score2019", True),),
+}
+
+_FRAGMENTS = {
+    "Stats2025": """
     fragment Stats2025 on TeamEventStats2025 {
       rank wins losses ties rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints totalPointsNp }
@@ -178,6 +158,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Score2025": """
     fragment Score2025 on MatchScores2025Alliance {
       totalPoints totalPointsNp autoPoints dcPoints
       autoLeavePoints autoLeave1 autoLeave2
@@ -190,8 +172,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       minorsCommitted majorsCommitted penaltyPointsCommitted
       minorsByOpp majorsByOpp penaltyPointsByOpp
     }
-
-    # 2024: CENTERSTAGE
+    """,
+    "Stats2024": """
     fragment Stats2024 on TeamEventStats2024 {
       rank wins losses ties rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints totalPointsNp }
@@ -210,6 +192,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Score2024": """
     fragment Score2024 on MatchScores2024Alliance {
       totalPoints totalPointsNp autoPoints dcPoints
       autoPark1 autoPark2
@@ -223,8 +207,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       minorsCommitted majorsCommitted penaltyPointsCommitted
       minorsByOpp majorsByOpp penaltyPointsByOpp
     }
-
-    # 2023: POWERPLAY
+    """,
+    "Stats2023": """
     fragment Stats2023 on TeamEventStats2023 {
       rank wins losses ties rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints }
@@ -242,6 +226,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Score2023": """
     fragment Score2023 on MatchScores2023Alliance {
       totalPoints totalPointsNp autoPoints dcPoints egPoints
       egNav2023_1 egNav2023_2
@@ -257,8 +243,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       minorsCommitted majorsCommitted penaltyPointsCommitted
       minorsByOpp majorsByOpp penaltyPointsByOpp
     }
-
-    # 2022: FREIGHT FRENZY
+    """,
+    "Stats2022": """
     fragment Stats2022 on TeamEventStats2022 {
       rank wins losses ties rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints }
@@ -275,6 +261,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Score2022": """
     fragment Score2022 on MatchScores2022Alliance {
       totalPoints totalPointsNp autoPoints dcPoints egPoints
       autoNav2022_1 autoNav2022_2
@@ -287,8 +275,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       minorsCommitted majorsCommitted penaltyPointsCommitted
       minorsByOpp majorsByOpp penaltyPointsByOpp
     }
-
-    # 2021: ULTIMATE GOAL (Trad + Remote)
+    """,
+    "Stats2021": """
     fragment Stats2021 on TeamEventStats2021Trad {
       rank wins losses ties rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints }
@@ -305,6 +293,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Stats2021R": """
     fragment Stats2021R on TeamEventStats2021Remote {
       rank rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints }
@@ -320,6 +310,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Score2021": """
     fragment Score2021 on MatchScores2021Alliance {
       totalPoints totalPointsNp autoPoints dcPoints egPoints
       barcodeElement1 barcodeElement2
@@ -334,6 +326,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       egParkPoints cappingPoints
       minorsCommitted majorsCommitted penaltyPointsCommitted
     }
+    """,
+    "Score2021R": """
     fragment Score2021R on MatchScores2021Remote {
       totalPoints totalPointsNp autoPoints dcPoints egPoints
       barcodeElement autoCarousel autoNav2021 autoBonus
@@ -345,8 +339,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       egDuckPoints allianceBalancedPoints egParkPoints cappingPoints
       minorsCommitted majorsCommitted penaltyPointsCommitted
     }
-
-    # 2020: SKYSTONE (Trad + Remote)
+    """,
+    "Stats2020": """
     fragment Stats2020 on TeamEventStats2020Trad {
       rank wins losses ties rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints }
@@ -361,6 +355,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Stats2020R": """
     fragment Stats2020R on TeamEventStats2020Remote {
       rank rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints }
@@ -375,6 +371,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Score2020": """
     fragment Score2020 on MatchScores2020Alliance {
       totalPoints totalPointsNp autoPoints dcPoints egPoints
       autoWobble1 autoWobble2 autoNav2020_1 autoNav2020_2
@@ -386,6 +384,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       egWobblePoints egPowershotPoints egWobbleRingPoints
       minorsCommitted majorsCommitted penaltyPointsCommitted
     }
+    """,
+    "Score2020R": """
     fragment Score2020R on MatchScores2020Remote {
       totalPoints totalPointsNp autoPoints dcPoints egPoints
       autoWobble1 autoWobble2 autoNav2020
@@ -397,8 +397,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       egWobblePoints egPowershotPoints egWobbleRingPoints
       minorsCommitted majorsCommitted penaltyPointsCommitted
     }
-
-    # 2019: ROVER RUCKUS
+    """,
+    "Stats2019": """
     fragment Stats2019 on TeamEventStats2019 {
       rank wins losses ties rp qualMatchesPlayed
       opr { totalPoints autoPoints dcPoints }
@@ -414,6 +414,8 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
         totalPointsNp totalPoints
       }
     }
+    """,
+    "Score2019": """
     fragment Score2019 on MatchScores2019Alliance {
       totalPoints totalPointsNp autoPoints dcPoints egPoints
       autoNav2019_1 autoNav2019_2 repositioned
@@ -428,36 +430,393 @@ def fetch_team_data(team_number: int, season: int = None, region: str = None, ev
       minorsCommitted majorsCommitted penaltyPointsCommitted
       minorsByOpp majorsByOpp penaltyPointsByOpp
     }
+    """,
+}
+
+
+def _season_variants(season: int = None) -> tuple:
+    variants = _SEASON_VARIANTS.get(season)
+    if variants is None:
+        variants = tuple(v for season_variants in _SEASON_VARIANTS.values() for v in season_variants)
+    return variants
+
+
+def _score_spreads(variants) -> str:
+    score_spreads = []
+    for _, _, scores_type, score_fragment, alliance_split in variants:
+        if alliance_split:
+            score_spreads.append(
+                f"            ... on {scores_type} {{\n"
+                f"              red {{ ...{score_fragment} }}\n"
+                f"              blue {{ ...{score_fragment} }}\n"
+                f"            }}"
+            )
+        else:
+            score_spreads.append(f"            ... on {scores_type} {{ ...{score_fragment} }}")
+    return "\n".join(score_spreads)
+
+
+@lru_cache(maxsize=None)
+def _season_fragments(season: int = None, with_scores: bool = True) -> str:
+    """The `TeamSeason` fragment plus only the requested season's
+    `StatsNNNN`/`ScoreNNNN` fragments and inline spreads, instead of all of
+    2019-2025 on every call.
+
+    GraphQL rejects a document that defines a fragment it never spreads, so
+    definitions and spreads are always emitted together from
+    `_SEASON_VARIANTS`. A season with no known fragments (e.g. one older
+    than 2019, or a new game not yet added here) falls back to every
+    season's fragments, which is what every call used to send.
+
+    `with_scores=False` leaves each match's `scores` (and the `ScoreNNNN`
+    fragments) out, for the event path that fetches them once per event
+    instead (`afetch_event_data`).
     """
-    
+    variants = _season_variants(season)
+    stats_spreads = [f"          ... on {stats_type} {{ ...{stats_fragment} }}" for stats_type, stats_fragment, *_ in variants]
+    fragment_names = [stats_fragment for _, stats_fragment, *_ in variants]
+    match_scores = ""
+    if with_scores:
+        match_scores = f"          scores {{\n{_score_spreads(variants)}\n          }}"
+        fragment_names = [name for _, stats_fragment, _, score_fragment, _ in variants
+                          for name in (stats_fragment, score_fragment)]
+
+    team_fragment = _TEAM_SEASON_FRAGMENT_TEMPLATE % {
+        "stats_spreads": "\n".join(stats_spreads),
+        "match_scores": match_scores,
+    }
+    return team_fragment + "\n".join(_FRAGMENTS[name].rstrip() for name in fragment_names) + "\n"
+
+
+@lru_cache(maxsize=None)
+def build_team_query(season: int = None) -> str:
+    """The `GetLiterallyEverything` query for one team, pruned to `season`."""
+    return (
+        f"""
+    query GetLiterallyEverything($number: Int!, {_QUERY_VARIABLES}) {{
+      teamByNumber(number: $number) {{ ...TeamSeason }}
+    }}
+"""
+        + _season_fragments(season)
+    )
+
+
+@lru_cache(maxsize=None)
+def build_teams_batch_query(season: int, count: int) -> str:
+    """The same per-team selection as `build_team_query`, for `count` teams
+    in one request: each `teamByNumber` is aliased `t0..t{count-1}` and
+    takes its number from variable `$n0..$n{count-1}`, so the query text
+    depends only on (season, count) and is memoized on that, not on which
+    teams are asked about."""
+    number_vars = ", ".join(f"$n{i}: Int!" for i in range(count))
+    aliases = "\n".join(f"      t{i}: teamByNumber(number: $n{i}) {{ ...TeamSeason }}" for i in range(count))
+    return (
+        f"""
+    query GetTeamsBatch({number_vars}, {_QUERY_VARIABLES}) {{
+{aliases}
+    }}
+"""
+        + _season_fragments(season)
+    )
+
+
+@lru_cache(maxsize=None)
+def build_event_teams_query(season: int) -> str:
+    """Every team registered for one event (`$code`), each with the same
+    season selection as `build_team_query` minus its matches' scores --
+    those are shared between the teams on the field, so
+    `build_event_scores_query` fetches each one once instead."""
+    return (
+        f"""
+    query GetEventTeamSeasons($code: String!, {_QUERY_VARIABLES}) {{
+      eventByCode(season: $season, code: $code) {{
+        teams {{
+          teamNumber
+          team {{ ...TeamSeason }}
+        }}
+      }}
+    }}
+"""
+        + _season_fragments(season, with_scores=False)
+    )
+
+
+@lru_cache(maxsize=None)
+def build_event_scores_query(season: int, count: int) -> str:
+    """Every match's scores at `count` events in one request, aliased
+    `e0..e{count-1}` with codes from `$c0..$c{count-1}`."""
+    variants = _season_variants(season)
+    code_vars = ", ".join(f"$c{i}: String!" for i in range(count))
+    spreads = _score_spreads(variants)
+    aliases = "\n".join(
+        f"      e{i}: eventByCode(season: $season, code: $c{i}) {{\n"
+        f"        code\n"
+        f"        matches {{\n"
+        f"          id\n"
+        f"          scores {{\n{spreads}\n          }}\n"
+        f"        }}\n"
+        f"      }}"
+        for i in range(count)
+    )
+    fragments = "\n".join(_FRAGMENTS[score_fragment].rstrip() for _, _, _, score_fragment, _ in variants)
+    return f"""
+    query GetEventScores($season: Int!, {code_vars}) {{
+{aliases}
+    }}
+""" + fragments + "\n"
+
+
+async def _query(query: str, variables: dict = None, client=None):
+    """Decoded response body, or None (after printing why) on any transport
+    failure -- the same "print and return None" convention every fetch in
+    this module has always used."""
+    client = client or ftcscout.get_client()
+    try:
+        return await client.query(query, variables)
+    except Exception as e:
+        print(f"Connection Error: {e}")
+        return None
+
+
+async def afetch_team_data(team_number: int, season: int = None, region: str = None, event_code: str = None,
+                           *, client=None):
+    if season is None:
+        season = CURRENT_FTC_SEASON
+    if region is None:
+        region = DEFAULT_REGION
+
     variables = {
         "number": team_number,
         "season": season,
         "region": region,
         "eventCode": event_code
     }
-    
-    try:
-        response = requests.post(API_URL, json={"query": query, "variables": variables}, timeout=15)
-        
-        if response.status_code != 200:
-            print(f"API Error {response.status_code}: {response.text}")
-            return None
 
-        data = response.json()
-        
+    data = await _query(build_team_query(season), variables, client)
+    if data is None:
+        return None
+
+    if "errors" in data:
+        # This helps debug if the massive query has a typo
+        print(f"Schema Error: {data['errors'][0]['message']}")
+        return None
+
+    team = (data.get("data") or {}).get("teamByNumber")
+    if team and event_code is None:
+        await asyncio.to_thread(_store_payloads, {team_number: team}, season, region)
+    return team
+
+
+async def afetch_teams_data(team_numbers, season: int = None, region: str = None, event_code: str = None,
+                            *, client=None) -> dict:
+    """Batched `afetch_team_data`: every team in `team_numbers` for one
+    season in a single aliased GraphQL request, so a multi-team `/ask` pays
+    one round trip instead of one per team.
+
+    Returns `{team_number: payload}`, with None for any team FTCScout
+    doesn't know (or for every team, if the request itself fails) -- same
+    failure convention as `afetch_team_data`.
+    """
+    if season is None:
+        season = CURRENT_FTC_SEASON
+    if region is None:
+        region = DEFAULT_REGION
+
+    team_numbers = list(dict.fromkeys(int(t) for t in team_numbers))
+    results = {num: None for num in team_numbers}
+    if not team_numbers:
+        return results
+
+    variables = {f"n{i}": num for i, num in enumerate(team_numbers)}
+    variables.update({"season": season, "region": region, "eventCode": event_code})
+
+    data = await _query(build_teams_batch_query(season, len(team_numbers)), variables, client)
+    if data is None:
+        return results
+
+    if "errors" in data:
+        # GraphQL can return partial data alongside errors (e.g. one
+        # alias failed to resolve); keep whatever teams did come back.
+        print(f"Schema Error: {data['errors'][0]['message']}")
+
+    teams = data.get("data") or {}
+    for i, num in enumerate(team_numbers):
+        results[num] = teams.get(f"t{i}")
+    if event_code is None:
+        await asyncio.to_thread(_store_payloads, results, season, region)
+    return results
+
+
+# Events per `build_event_scores_query` request; a team-season rarely spans
+# more than a handful, so an event's whole roster usually needs one.
+_EVENT_SCORES_BATCH = 25
+
+
+async def afetch_event_roster(event_code: str, season: int = None, region: str = None, *, client=None):
+    """Every team registered at `event_code`, each with its season data but
+    no match scores: `afetch_event_data`'s first request on its own, so a
+    caller can look at the roster before paying for the scores.
+
+    Returns `{team_number: team}` (None for a team FTCScout has no season
+    for), or None (after printing why) if the request fails or the event
+    doesn't exist.
+    """
+    if season is None:
+        season = CURRENT_FTC_SEASON
+    if region is None:
+        region = DEFAULT_REGION
+
+    variables = {"code": event_code, "season": season, "region": region, "eventCode": None}
+    data = await _query(build_event_teams_query(season), variables, client)
+    if data is None:
+        return None
+    if "errors" in data:
+        print(f"Schema Error: {data['errors'][0]['message']}")
+        return None
+    event = (data.get("data") or {}).get("eventByCode")
+    if event is None:
+        print(f"No event '{event_code}' in season {season}.")
+        return None
+    return {entry["teamNumber"]: entry.get("team") for entry in event.get("teams") or [] if entry.get("teamNumber")}
+
+
+async def afetch_event_data(event_code: str, season: int = None, region: str = None, *, client=None,
+                            roster=None):
+    """`afetch_teams_data` for every team registered at `event_code`, in a
+    constant number of requests however many teams there are.
+
+    A per-team fetch carries full red and blue score objects for every match
+    the team played, so at a 40-team event each score object is downloaded
+    and parsed once per team on the field. Here the roster and each team's
+    season data come back in one request without match scores, then every
+    event those teams played this season has its scores fetched once
+    (`_EVENT_SCORES_BATCH` events per request) and the same score object is
+    attached to each team's entry for that match. The payloads are
+    identical to `afetch_team_data`'s and are written through to the
+    payload store the same way.
+
+    The trade-off: FTCScout can only return an event's scores whole, so
+    every match at every event a roster team attended is downloaded, not
+    just the roster's matches (only those are kept). At `event_code` itself
+    that costs nothing extra -- every match there is a roster match, and
+    each would otherwise arrive once per team on the field, up to four
+    times. At the roster's other events (league meets, other qualifiers)
+    most matches usually involve other teams and are downloaded for
+    nothing. So this path wins when the roster's matches at `event_code`
+    outweigh that overhead: a real event warm-up, where the roster is the
+    whole field. For a handful of teams, `afetch_teams_data` is cheaper.
+
+    Pass `roster` (an `afetch_event_roster` result for the same event,
+    season and region) to skip the roster request; its entries get their
+    scores filled in place.
+
+    Returns `{team_number: payload}`, or None (after printing why) if the
+    roster request fails or the event doesn't exist. If a scores request
+    fails, its matches keep `scores: None`, as unplayed matches do.
+    """
+    if season is None:
+        season = CURRENT_FTC_SEASON
+    if region is None:
+        region = DEFAULT_REGION
+
+    teams = roster
+    if teams is None:
+        teams = await afetch_event_roster(event_code, season, region, client=client)
+        if teams is None:
+            return None
+    entries = [entry for team in teams.values() if team for entry in team.get("matches") or []]
+    codes = sorted({entry.get("eventCode") for entry in entries if entry.get("eventCode")})
+
+    wanted = {(entry.get("eventCode"), entry.get("matchId")) for entry in entries}
+    scores = {}
+    for start in range(0, len(codes), _EVENT_SCORES_BATCH):
+        batch = codes[start:start + _EVENT_SCORES_BATCH]
+        variables = {f"c{i}": code for i, code in enumerate(batch)}
+        variables["season"] = season
+        data = await _query(build_event_scores_query(season, len(batch)), variables, client)
+        if data is None:
+            continue
         if "errors" in data:
-            # This helps debug if the massive query has a typo
             print(f"Schema Error: {data['errors'][0]['message']}")
-            return None
-            
-        return data.get("data", {}).get("teamByNumber")
-        
-    except Exception as e:
-        print(f"Connection Error: {e}")
+        for i, code in enumerate(batch):
+            for match in ((data.get("data") or {}).get(f"e{i}") or {}).get("matches") or []:
+                if (code, match.get("id")) in wanted:
+                    scores[(code, match.get("id"))] = match.get("scores")
+
+    # One score object per match, shared by every team that played in it.
+    for entry in entries:
+        if entry.get("match") is not None:
+            entry["match"]["scores"] = scores.get((entry.get("eventCode"), entry.get("matchId")))
+
+    await asyncio.to_thread(_store_payloads, teams, season, region)
+    return teams
+
+
+def _store_payloads(payloads: dict, season: int, region: str) -> None:
+    """Write-through to the raw-payload store. Event-filtered fetches aren't
+    stored: they're a subset of the team's season, not the payload the
+    store's key promises."""
+    store = payload_store.get_store()
+    for team_number, payload in payloads.items():
+        if not payload:
+            continue
+        try:
+            store.put(team_number, season, region, PAYLOAD_SCHEMA_VERSION, payload)
+        except OSError as e:
+            print(f"Could not store payload for team {team_number}: {e}")
+
+
+def _payload_is_fresh(stored, season: int) -> bool:
+    # Same policy as VectorDBManager.is_team_in_db, fed the same record
+    # upsert_team_data would have stamped onto the chunks.
+    record = {"fetched_at": stored.fetched_at, **freshness.event_calendar(stored.payload, stored.fetched_at)}
+    return freshness.default_policy().is_fresh(record, season)
+
+
+def get_stored_team_data(team_number: int, season: int = None, region: str = None, fresh_only: bool = True):
+    """The stored raw payload for this team/season/region, or None. With
+    `fresh_only`, a payload the freshness policy says is stale counts as
+    missing."""
+    season = season if season is not None else CURRENT_FTC_SEASON
+    region = region or DEFAULT_REGION
+    stored = payload_store.get_store().get(team_number, season, region, PAYLOAD_SCHEMA_VERSION)
+    if stored is None or (fresh_only and not _payload_is_fresh(stored, season)):
         return None
+    return stored.payload
 
-def fetch_teams():
+
+async def aload_teams_data(team_numbers, season: int = None, region: str = None, *, client=None) -> dict:
+    """`afetch_teams_data`, read through the raw-payload store: teams with a
+    fresh stored payload are served from disk, and only the rest go to
+    FTCScout (in one batched request, written back to the store)."""
+    season = season if season is not None else CURRENT_FTC_SEASON
+    region = region or DEFAULT_REGION
+    team_numbers = list(dict.fromkeys(int(t) for t in team_numbers))
+
+    results = await asyncio.to_thread(_stored_teams_data, team_numbers, season, region)
+    misses = [num for num, payload in results.items() if payload is None]
+    if misses:
+        results.update(await afetch_teams_data(misses, season, region, client=client))
+    return results
+
+
+def _stored_teams_data(team_numbers, season, region) -> dict:
+    return {num: get_stored_team_data(num, season, region) for num in team_numbers}
+
+
+def _teams_dict(data):
+    # dictionary format: team_name : team_number
+    teams_list = data['data']['teamsSearch']
+    teams_dict = {}
+    for team in teams_list:
+        if team['name']:
+          team_name = team.get('name')
+          team_number = team.get('number')
+          teams_dict.update({team_name : team_number})
+    return teams_dict
+
+
+async def afetch_teams(*, client=None):
     query = """
     query GetTeams {
       teamsSearch(limit: 30000) {
@@ -467,31 +826,18 @@ def fetch_teams():
     }
     """
 
-    response = requests.post(API_URL, json={"query": query}, timeout=15)
-
-    if response.status_code != 200:
-        print(f"API Error {response.status_code}: {response.text}")
+    data = await _query(query, client=client)
+    if data is None:
         return None
 
-    data = response.json()
-    
     if "errors" in data:
         print(f"Schema Error: {data['errors'][0]['message']}")
         return None
-    
-    
-    # dictionary format: team_name : team_number
-    teams_list = data['data']['teamsSearch']
-    teams_dict = {}
-    for team in teams_list:
-        if team['name']:
-          team_name = team.get('name')
-          team_number = team.get('number')
-          teams_dict.update({team_name : team_number})
 
-    return teams_dict
+    return _teams_dict(data)
 
-def fetch_teams_by_region(region: str = None):
+
+async def afetch_teams_by_region(region: str = None, *, client=None):
     if region is None:
         region = DEFAULT_REGION 
 
@@ -508,29 +854,87 @@ def fetch_teams_by_region(region: str = None):
         "region": region
     }
 
-    response = requests.post(API_URL, json={"query": query, "variables": variables}, timeout=15)
+    data = await _query(query, variables, client)
+    if data is None:
+        return None
 
-    if response.status_code != 200:
-        print(f"API Error {response.status_code}: {response.text}")
+    if "errors" in data:
+        print(f"Schema Error: {data['errors'][0]['message']}")
+        return None
+
+    return sort_dict(_teams_dict(data))
+
+
+async def afetch_event_teams(event_code: str, season: int = None, *, client=None):
+    """Sorted team numbers registered for one event, or None (after printing
+    why) if the request fails or FTCScout doesn't know the event."""
+    if season is None:
+        season = CURRENT_FTC_SEASON
+
+    query = """
+    query GetEventTeams($season: Int!, $code: String!) {
+      eventByCode(season: $season, code: $code) {
+        teams {
+          teamNumber
+        }
+      }
+    }
+    """
+
+    data = await _query(query, {"season": season, "code": event_code}, client)
+    if data is None:
         return None
 
-    data = response.json()
-    
     if "errors" in data:
         print(f"Schema Error: {data['errors'][0]['message']}")
         return None
-    
-    
-    # dictionary format: team_name : team_number
-    teams_list = data['data']['teamsSearch']
-    teams_dict = {}
-    for team in teams_list:
-        if team['name']:
-          team_name = team.get('name')
-          team_number = team.get('number')
-          teams_dict.update({team_name : team_number})
 
-    return sort_dict(teams_dict)
+    event = (data.get("data") or {}).get("eventByCode")
+    if event is None:
+        print(f"No event '{event_code}' in season {season}.")
+        return None
+    return sorted({entry["teamNumber"] for entry in event.get("teams") or [] if entry.get("teamNumber")})
+
+
+# Sync wrappers for scripts/ and the worker-thread call sites; the bot's
+# event loop awaits the `afetch_*` versions directly.
+
+def fetch_team_data(team_number: int, season: int = None, region: str = None, event_code: str = None):
+    return ftcscout.run_sync(afetch_team_data, team_number, season, region, event_code)
+
+
+def fetch_teams_data(team_numbers, season: int = None, region: str = None, event_code: str = None) -> dict:
+    return ftcscout.run_sync(afetch_teams_data, team_numbers, season, region, event_code)
+
+
+def load_team_data(team_number: int, season: int = None, region: str = None):
+    return load_teams_data([team_number], season, region)[int(team_number)]
+
+
+def load_teams_data(team_numbers, season: int = None, region: str = None) -> dict:
+    season = season if season is not None else CURRENT_FTC_SEASON
+    region = region or DEFAULT_REGION
+    results = _stored_teams_data(list(dict.fromkeys(int(t) for t in team_numbers)), season, region)
+    misses = [num for num, payload in results.items() if payload is None]
+    if misses:
+        results.update(fetch_teams_data(misses, season, region))
+    return results
+
+
+def fetch_teams():
+    return ftcscout.run_sync(afetch_teams)
+
+
+def fetch_teams_by_region(region: str = None):
+    return ftcscout.run_sync(afetch_teams_by_region, region)
+
+
+def fetch_event_teams(event_code: str, season: int = None):
+    return ftcscout.run_sync(afetch_event_teams, event_code, season)
+
+
+def fetch_event_data(event_code: str, season: int = None, region: str = None):
+    return ftcscout.run_sync(afetch_event_data, event_code, season, region)
 
 
 def get_cached_teams_by_region(region: str = None):
@@ -0,0 +1,267 @@
+"""Persistent embedding cache keyed by (model, sha256(text)).
+
+The same chunk text gets embedded over and over: every freshness refresh,
+every `scripts/reindex.py --wipe`, every schema bump that doesn't change a
+chunk's wording, and the facts documents whenever the numbers haven't
+moved. `EmbeddingCache` keeps each vector the model has produced on disk so
+the next request for the same text is a read, not a sentence-transformer
+forward pass.
+
+Layout, one directory per model under `config.EMBEDDING_CACHE_DIR`:
+
+    vectors.bin      float32 (or float16) rows, memory-mapped with NumPy
+    index.sqlite3    sha256 -> row slot, last-used time, plus dim/dtype
+
+The vectors file grows in steps up to `config.EMBEDDING_CACHE_MAX_MB`; once
+full, each new text takes over the slot of the least recently used one.
+Slots are always the contiguous range 0..n-1, so there is no free list.
+
+Two adapters put it in front of the models actually used here:
+`CachedEmbeddingFunction` for chromadb's `EmbeddingFunction` protocol
+(vectordb.py's write path) and `CachedEmbeddings` for LangChain's
+`Embeddings` (clients.py's vector store). Only documents are cached --
+one-off query strings would just churn the LRU. Any cache I/O error is
+logged and falls back to the model, never failing the embed.
+
+A cache directory must only be written by one process at a time -- the same
+constraint Chroma's PersistentClient already puts on the bot and
+`scripts/reindex.py`.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+import config
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+_GROW_SLOTS = 1024
+_SQL_CHUNK = 500
+_UNSAFE_PATH_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, root, model_name: str, max_bytes: int, dtype: str = "float32"):
+        self.dir = Path(root) / _UNSAFE_PATH_RE.sub("_", model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.dir / "index.sqlite3", check_same_thread=False, isolation_level=None)
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(digest TEXT PRIMARY KEY, slot INTEGER UNIQUE NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._path = self.dir / "vectors.bin"
+        self._vectors = None
+        self._dim = None
+
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if meta.get("dtype") not in (None, self.dtype.name):
+            logger.info("embedding cache %s: dtype changed to %s, starting over", self.dir, self.dtype.name)
+            self._clear()
+        elif "dim" in meta:
+            self._dim = int(meta["dim"])
+            if self._count() > self._max_slots():
+                logger.info("embedding cache %s: over its new size budget, starting over", self.dir)
+                self._clear()
+            else:
+                self._open_vectors()
+
+    # --- storage ---
+
+    def _max_slots(self) -> int:
+        return max(1, self.max_bytes // (self._dim * self.dtype.itemsize))
+
+    def _count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _allocated_slots(self) -> int:
+        if not self._path.exists():
+            return 0
+        return self._path.stat().st_size // (self._dim * self.dtype.itemsize)
+
+    def _open_vectors(self) -> None:
+        slots = self._allocated_slots()
+        self._vectors = np.memmap(self._path, dtype=self.dtype, mode="r+", shape=(slots, self._dim)) if slots else None
+
+    def _ensure_slots(self, needed: int) -> None:
+        allocated = self._allocated_slots()
+        if needed <= allocated:
+            return
+        slots = min(self._max_slots(), max(needed, allocated + _GROW_SLOTS))
+        with open(self._path, "ab") as f:
+            f.truncate(slots * self._dim * self.dtype.itemsize)
+        self._open_vectors()
+
+    def _clear(self) -> None:
+        self._vectors = None
+        self._dim = None
+        self._db.execute("DELETE FROM entries")
+        self._db.execute("DELETE FROM meta")
+        self._path.unlink(missing_ok=True)
+
+    # --- public API ---
+
+    def get_many(self, texts) -> list:
+        """One float32 vector per text, or None where it isn't cached."""
+        found = [None] * len(texts)
+        if self._dim is None or not texts:
+            return found
+        digests = [_digest(t) for t in texts]
+        with self._lock:
+            slots = {}
+            for start in range(0, len(digests), _SQL_CHUNK):
+                chunk = list(set(digests[start:start + _SQL_CHUNK]))
+                rows = self._db.execute(
+                    f"SELECT digest, slot FROM entries WHERE digest IN ({','.join('?' * len(chunk))})", chunk,
+                )
+                slots.update(rows)
+            if slots:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE digest = ?", [(now, d) for d in slots],
+                )
+            for i, digest in enumerate(digests):
+                slot = slots.get(digest)
+                if slot is not None and self._vectors is not None and slot < len(self._vectors):
+                    found[i] = np.array(self._vectors[slot], dtype=np.float32)
+        return found
+
+    def put_many(self, texts, vectors) -> None:
+        vectors = [np.asarray(v, dtype=np.float32) for v in vectors]
+        if not vectors:
+            return
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(vectors[0].shape[-1])
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [("dim", str(self._dim)), ("dtype", self.dtype.name), ("model", self.model_name)],
+                )
+            now = time.time()
+            self._db.execute("BEGIN")
+            try:
+                for digest, vector in dict(zip(map(_digest, texts), vectors)).items():
+                    self._put_one(digest, vector, now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            if self._vectors is not None:
+                self._vectors.flush()
+
+    def _put_one(self, digest: str, vector, now: float) -> None:
+        row = self._db.execute("SELECT slot FROM entries WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            slot = row[0]
+            self._db.execute("UPDATE entries SET last_used = ? WHERE digest = ?", (now, digest))
+        else:
+            count = self._count()
+            if count < self._max_slots():
+                slot = count
+                self._db.execute("INSERT INTO entries (digest, slot, last_used) VALUES (?, ?, ?)", (digest, slot, now))
+            else:
+                slot = self._db.execute("SELECT slot FROM entries ORDER BY last_used LIMIT 1").fetchone()[0]
+                self._db.execute(
+                    "UPDATE entries SET digest = ?, last_used = ? WHERE slot = ?", (digest, now, slot),
+                )
+        self._ensure_slots(slot + 1)
+        self._vectors[slot] = vector
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+
+def _embed_through(cache: EmbeddingCache, texts, embed) -> list:
+    """float32 vectors for `texts`, from `cache` where possible and from
+    `embed(missing_texts)` for the rest (which are then cached)."""
+    texts = list(texts)
+    try:
+        vectors = cache.get_many(texts)
+    except (sqlite3.Error, OSError, ValueError):
+        logger.warning("embedding cache read failed; embedding without it", exc_info=True)
+        vectors = [None] * len(texts)
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        fresh = [np.asarray(v, dtype=np.float32) for v in embed([texts[i] for i in missing])]
+        try:
+            cache.put_many([texts[i] for i in missing], fresh)
+        except (sqlite3.Error, OSError, ValueError):
+            logger.warning("embedding cache write failed", exc_info=True)
+        for i, vector in zip(missing, fresh):
+            vectors[i] = vector
+    return vectors
+
+
+class CachedEmbeddingFunction:
+    """chromadb `EmbeddingFunction` wrapper. Everything but `__call__` is
+    delegated, so Chroma sees the wrapped function's name and config and
+    an existing collection opens unchanged."""
+
+    def __init__(self, inner, cache: EmbeddingCache):
+        self._inner = inner
+        self.cache = cache
+
+    def __call__(self, input):  # noqa: A002 (name matches chromadb's protocol)
+        return _embed_through(self.cache, input, self._inner)
+
+    def embed_query(self, input):  # noqa: A002
+        return self._inner.embed_query(input)
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain `Embeddings` wrapper; caches `embed_documents` only.
+
+    `prepare` is whatever rewriting `inner` does to a text before encoding
+    it (newline flattening, for clients.py's adapter). Texts are cached
+    under the prepared form -- the exact string the model saw -- so an
+    entry means the same thing whichever wrapper wrote it."""
+
+    def __init__(self, inner: Embeddings, cache: EmbeddingCache, prepare=None):
+        self._inner = inner
+        self.cache = cache
+        self._prepare = prepare
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self._prepare is not None:
+            texts = [self._prepare(t) for t in texts]
+        return [v.tolist() for v in _embed_through(self.cache, texts, self._inner.embed_documents)]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._inner.embed_query(text)
+
+
+@lru_cache(maxsize=None)
+def _cache_at(root: str, model_name: str, max_bytes: int, dtype: str) -> EmbeddingCache:
+    return EmbeddingCache(root, model_name, max_bytes, dtype)
+
+
+def get_cache(model_name: str = None) -> EmbeddingCache:
+    """The process-wide cache for `model_name` (default: the configured
+    embedding model) under `config.EMBEDDING_CACHE_DIR`."""
+    return _cache_at(
+        str(config.EMBEDDING_CACHE_DIR),
+        model_name or config.EMBEDDING_MODEL,
+        config.EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+        config.EMBEDDING_CACHE_DTYPE,
+    )
@@ -0,0 +1,134 @@
+"""When is a cached current-season team stale?
+
+The cache used to apply one flat `CACHE_TTL_HOURS` to every current-season
+team. That was too slow on competition days, when a team's matches land
+every few minutes, and wasteful the rest of the time: most teams have no
+event in progress, and refetching them just re-embeds identical data.
+
+Each payload already lists its events' `start`/`end` dates, so
+`event_calendar` pulls out the team's next event (upcoming or in progress)
+and most recent finished event as of fetch time. `vectordb.upsert_team_data`
+stamps those dates onto every chunk's metadata next to `fetched_at`, and the
+payload store keeps them alongside each payload. `EventCalendarPolicy` then
+picks a TTL from where "now" falls relative to those dates:
+
+- an event began since the data was fetched -> stale immediately
+- during the event (+/- a day of timezone slack) -> `event_ttl`
+- for a few days after an event ends, while results settle -> `post_event_ttl`
+- otherwise -> `idle_ttl`, days rather than hours
+
+Past seasons never change and are always fresh, whatever the policy.
+`FlatTTLPolicy` is the old behaviour, kept selectable via
+`FRESHNESS_POLICY=flat`. Anything with an `is_fresh(record, season, now)`
+method can be passed to `VectorDBManager(freshness_policy=...)`.
+"""
+import datetime
+import time
+
+import config
+import seasons
+
+_SLACK = datetime.timedelta(days=1)
+
+
+def _utc_date(timestamp: float) -> datetime.date:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).date()
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def event_calendar(raw_data, fetched_at: float) -> dict:
+    """`{"next_event_start", "next_event_end", "last_event_end"}` (ISO dates)
+    for the team's events relative to `fetched_at`. Keys with no matching
+    event are left out -- Chroma metadata can't hold None."""
+    as_of = _utc_date(fetched_at)
+    upcoming, finished = [], []
+    for entry in (raw_data or {}).get("events") or []:
+        event = (entry or {}).get("event") or {}
+        start, end = _parse_date(event.get("start")), _parse_date(event.get("end"))
+        if start is None:
+            continue
+        end = end or start
+        (upcoming if end >= as_of else finished).append((start, end))
+
+    calendar = {}
+    if upcoming:
+        start, end = min(upcoming)
+        calendar["next_event_start"] = start.isoformat()
+        calendar["next_event_end"] = end.isoformat()
+    if finished:
+        calendar["last_event_end"] = max(end for _, end in finished).isoformat()
+    return calendar
+
+
+class FlatTTLPolicy:
+    """Every current-season team goes stale `ttl_hours` after it was fetched."""
+
+    def __init__(self, ttl_hours: float):
+        self.ttl_hours = ttl_hours
+
+    def is_fresh(self, record: dict, season: int, now: float = None) -> bool:
+        if season != seasons.CURRENT_SEASON:
+            return True
+        fetched_at = record.get("fetched_at")
+        if fetched_at is None:
+            return False
+        now = time.time() if now is None else now
+        return (now - fetched_at) / 3600 <= self.ttl_hours
+
+
+class EventCalendarPolicy:
+    def __init__(self, event_ttl_minutes: float, post_event_ttl_hours: float, post_event_days: int,
+                 idle_ttl_hours: float):
+        self.event_ttl = event_ttl_minutes * 60
+        self.post_event_ttl = post_event_ttl_hours * 3600
+        self.post_event_days = datetime.timedelta(days=post_event_days)
+        self.idle_ttl = idle_ttl_hours * 3600
+
+    def ttl_seconds(self, record: dict, now: float) -> float:
+        """How long data described by `record` stays fresh, given it's `now`."""
+        fetched_day, today = _utc_date(record["fetched_at"]), _utc_date(now)
+        next_start = _parse_date(record.get("next_event_start"))
+        next_end = _parse_date(record.get("next_event_end")) or next_start
+        last_end = _parse_date(record.get("last_event_end"))
+
+        if next_start is not None:
+            opens, closes = next_start - _SLACK, next_end + _SLACK
+            if fetched_day < opens <= today:
+                return 0.0
+            if opens <= today <= closes:
+                return self.event_ttl
+            if today > closes:
+                last_end = max(filter(None, (last_end, next_end)))
+
+        if last_end is not None and today <= last_end + _SLACK + self.post_event_days:
+            return self.post_event_ttl
+        return self.idle_ttl
+
+    def is_fresh(self, record: dict, season: int, now: float = None) -> bool:
+        if season != seasons.CURRENT_SEASON:
+            return True
+        if record.get("fetched_at") is None:
+            return False
+        now = time.time() if now is None else now
+        return now - record["fetched_at"] <= self.ttl_seconds(record, now)
+
+
+def default_policy():
+    """The policy named by `config.FRESHNESS_POLICY`, built from the current
+    config values (so tests can monkeypatch them)."""
+    if config.FRESHNESS_POLICY == "flat":
+        return FlatTTLPolicy(config.CACHE_TTL_HOURS)
+    return EventCalendarPolicy(
+        event_ttl_minutes=config.FRESHNESS_EVENT_TTL_MINUTES,
+        post_event_ttl_hours=config.FRESHNESS_POST_EVENT_TTL_HOURS,
+        post_event_days=config.FRESHNESS_POST_EVENT_DAYS,
+        idle_ttl_hours=config.FRESHNESS_IDLE_TTL_HOURS,
+    )
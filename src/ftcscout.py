@@ -0,0 +1,142 @@
+"""Asyncio-native transport for the FTCScout GraphQL API.
+
+Every FTCScout call used to be a bare `requests.post` run inside
+`asyncio.to_thread` from `bot.ask`: a fresh TCP+TLS handshake per call, no
+retry, no cap on how many could be in flight, and one blocked worker
+thread per outstanding request. `FTCScoutClient` replaces that with one
+pooled `httpx.AsyncClient` per event loop (keep-alive across `/ask`
+invocations), a semaphore bounding concurrent requests, and a small
+jittered retry for the failures that are actually transient -- 429, 5xx,
+timeouts, and connection errors. Any other HTTP error is raised
+immediately, since retrying it can't help.
+
+`data_retrieval` is the only intended caller. Its sync wrappers (kept for
+`scripts/` and the worker-thread call sites) go through `run_sync`, which
+runs the call on the retrieval-node loop (`nodes.base.node_loop`) with that
+loop's shared client, so sync callers keep their connections warm too.
+"""
+import asyncio
+import random
+import weakref
+
+import httpx
+
+import config
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+API_URL = "https://api.ftcscout.org/graphql"
+USER_AGENT = "ftc-scouting-bot/0.1 (+https://github.com/; research/scouting use)"
+
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_CAP_SECONDS = 8.0
+
+
+class FTCScoutError(RuntimeError):
+    """A non-retryable FTCScout failure, or a retryable one that ran out of retries."""
+
+
+def _retry_after_seconds(response: httpx.Response):
+    try:
+        return max(0.0, float(response.headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_seconds(attempt: int, retry_after=None) -> float:
+    """Full-jitter exponential backoff, so a burst of callers that all failed
+    together don't all retry together. A 429's `Retry-After` wins when present."""
+    if retry_after is not None:
+        return min(retry_after, _BACKOFF_CAP_SECONDS)
+    return random.uniform(0, min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class FTCScoutClient:
+    def __init__(self, *, url=API_URL, max_connections=None, max_concurrency=None, timeout=None,
+                 max_retries=None, transport=None):
+        self.url = url
+        self.max_retries = config.FTCSCOUT_MAX_RETRIES if max_retries is None else max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency or config.FTCSCOUT_MAX_CONCURRENCY)
+        max_connections = max_connections or config.FTCSCOUT_MAX_CONNECTIONS
+        self._http = httpx.AsyncClient(
+            timeout=timeout or config.FTCSCOUT_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"User-Agent": USER_AGENT},
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def query(self, query: str, variables: dict = None) -> dict:
+        """POST one GraphQL document and return the decoded response body
+        (`{"data": ..., "errors": ...}` -- GraphQL-level errors are the
+        caller's to interpret). Raises `FTCScoutError` on a non-retryable
+        HTTP error or once retries are exhausted."""
+        payload = {"query": query}
+        if variables is not None:
+            payload["variables"] = variables
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                # Held per attempt only: a request sleeping off its backoff
+                # shouldn't keep a healthy one from being sent.
+                async with self._semaphore:
+                    response = await self._http.post(self.url, json=payload)
+            except httpx.TransportError as exc:  # timeouts and connection errors
+                reason = f"{type(exc).__name__}: {exc}"
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code != 429 and response.status_code < 500:
+                    raise FTCScoutError(f"API Error {response.status_code}: {response.text}")
+                reason = f"HTTP {response.status_code}"
+                retry_after = _retry_after_seconds(response)
+
+            if attempt >= self.max_retries:
+                raise FTCScoutError(f"FTCScout request failed after {attempt + 1} attempt(s): {reason}")
+            delay = _backoff_seconds(attempt, retry_after)
+            logger.warning(
+                "FTCScout request failed (%s); retry %d/%d in %.2fs", reason, attempt + 1, self.max_retries, delay,
+            )
+            await asyncio.sleep(delay)
+
+
+# One client per event loop: httpx's connection pool and the semaphore are
+# both bound to the loop they're first used on.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, FTCScoutClient]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> FTCScoutClient:
+    """The shared, pooled client for the running event loop (the bot's)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = FTCScoutClient()
+    return client
+
+
+async def close_client() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def run_sync(fn, *args, **kwargs):
+    """Run one `async def fn(..., client=...)` call to completion from sync
+    code, on the retrieval-node loop and its long-lived client. For scripts
+    and worker threads only -- never call this from inside a running event
+    loop (on the node loop itself it would deadlock)."""
+    from nodes.base import node_loop  # nodes -> data_retrieval -> ftcscout
+
+    async def runner():
+        return await fn(*args, client=get_client(), **kwargs)
+    return asyncio.run_coroutine_threadsafe(runner(), node_loop()).result()
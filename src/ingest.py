@@ -0,0 +1,244 @@
+"""Bulk ingestion: many team/seasons into Chroma as one pipeline.
+
+`scripts/reindex.py` used to walk its targets one at a time -- fetch,
+then chunk and embed, then write, then the next team -- so a region
+rebuild took hours and a crash meant starting over. `ingest` overlaps the
+stages instead:
+
+    fetchers (fetch_workers, each one batched FTCScout request at a time)
+        -> bounded queue of payloads
+        -> one processor: chunk + diff, embed across teams in batches of
+           embed_batch_size, hand everything to VectorDBManager's writer,
+           which folds it into as few Chroma calls as it can
+
+Stored payloads (payload_store.py) are used instead of fetching unless
+`refetch` is set. Every target that's been written is appended to a
+`Checkpoint` file, so rerunning the same command with the same checkpoint
+skips what's already done. Progress and throughput go to `report` after
+each processed batch.
+
+`ingest_event` is the event-centric variant: one event's whole roster
+comes from `data_retrieval.afetch_event_data`, which fetches each shared
+match score once rather than once per team on the field.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import data_retrieval
+
+_DONE = object()
+
+
+class Checkpoint:
+    """Append-only record of finished `(team, season, region)` targets.
+
+    One line per target, flushed and fsynced as it's written, so a crash
+    loses at most the batch that was being processed. `run` identifies the
+    run the progress belongs to (`scripts/reindex.py` passes a digest of its
+    targets and options); it's written as the file's first line, and a file
+    left by a different run is ignored and overwritten on the first `mark`."""
+
+    _HEADER = "#run\t"
+
+    def __init__(self, path, run: str = None):
+        self.path = Path(path)
+        self.run = run
+        self.done = set()
+        self._ours = False  # whether the file on disk belongs to this run
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        header = lines[0][len(self._HEADER):] if lines and lines[0].startswith(self._HEADER) else None
+        if header != run:
+            return
+        self._ours = True
+        for line in lines:
+            parts = line.split("\t")
+            if len(parts) == 3:
+                self.done.add((int(parts[0]), int(parts[1]), parts[2]))
+
+    def mark(self, targets) -> None:
+        targets = [t for t in targets if t not in self.done]
+        if not targets:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a" if self._ours else "w", encoding="utf-8") as f:
+            if not self._ours and self.run is not None:
+                f.write(f"{self._HEADER}{self.run}\n")
+            f.writelines(f"{team}\t{season}\t{region}\n" for team, season, region in targets)
+            f.flush()
+            os.fsync(f.fileno())
+        self._ours = True
+        self.done.update(targets)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.done.clear()
+        self._ours = False
+
+
+@dataclass
+class IngestStats:
+    total: int
+    skipped: int = 0  # already in the checkpoint
+    teams: int = 0  # written this run
+    chunks: int = 0
+    fetched: int = 0  # payloads that came from FTCScout rather than the store
+    missing: list = field(default_factory=list)  # targets with no payload
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def summary(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        return (
+            f"{self.skipped + self.teams}/{self.total} team-seasons "
+            f"({self.teams / elapsed:.2f} teams/s, {self.chunks / elapsed:.0f} chunks/s, "
+            f"{self.fetched} fetched, {len(self.missing)} missing)"
+        )
+
+
+def _fetch_jobs(targets, fetch_batch_size: int) -> list:
+    """Group targets into per-(season, region) batches for one request each."""
+    groups = {}
+    for team, season, region in targets:
+        groups.setdefault((season, region), []).append(team)
+    return [
+        (season, region, teams[i:i + fetch_batch_size])
+        for (season, region), teams in groups.items()
+        for i in range(0, len(teams), fetch_batch_size)
+    ]
+
+
+def _stored(teams, season, region, fresh_only) -> dict:
+    return {team: data_retrieval.get_stored_team_data(team, season, region, fresh_only=fresh_only) for team in teams}
+
+
+async def _fetch(jobs: asyncio.Queue, ready: asyncio.Queue, stats: IngestStats, refetch: bool, fresh_only: bool,
+                 client) -> None:
+    while True:
+        try:
+            season, region, teams = jobs.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        payloads = dict.fromkeys(teams) if refetch else await asyncio.to_thread(
+            _stored, teams, season, region, fresh_only,
+        )
+        misses = [team for team, raw in payloads.items() if raw is None]
+        if misses:
+            fetched = await data_retrieval.afetch_teams_data(misses, season, region, client=client)
+            stats.fetched += sum(1 for raw in fetched.values() if raw)
+            payloads.update(fetched)
+        for team in teams:
+            await ready.put(((team, season, region), payloads.get(team)))
+
+
+async def _process(ready: asyncio.Queue, manager, stats: IngestStats, checkpoint, embed_batch_size: int,
+                   process_batch_size: int, report) -> None:
+    finished = False
+    while not finished:
+        batch = [await ready.get()]
+        while len(batch) < process_batch_size:
+            try:
+                batch.append(ready.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        if _DONE in batch:
+            finished = True
+            batch = [item for item in batch if item is not _DONE]
+
+        present = [(target, raw) for target, raw in batch if raw]
+        stats.missing.extend(target for target, raw in batch if not raw)
+        if present:
+            chunks = await asyncio.to_thread(
+                manager.upsert_many, [(raw, season, region) for (_, season, region), raw in present],
+                embed_batch_size,
+            )
+            stats.teams += len(present)
+            stats.chunks += sum(chunks.values())
+            if checkpoint is not None:
+                await asyncio.to_thread(checkpoint.mark, [target for target, _ in present])
+        if batch:
+            report(stats.summary())
+
+
+async def ingest(targets, manager, *, client=None, checkpoint: Checkpoint = None, refetch: bool = False,
+                 fresh_only: bool = False, fetch_workers: int = 4, fetch_batch_size: int = 10,
+                 embed_batch_size: int = 256, process_batch_size: int = 32, queue_size: int = 64,
+                 report=print) -> IngestStats:
+    """Fetch, embed and write every `(team, season, region)` in `targets`
+    into `manager`'s collection, skipping any `checkpoint` already has.
+    `client` is the FTCScout client to fetch with (the loop's shared one if
+    None). With `fresh_only`, stored payloads the freshness policy calls
+    stale are refetched rather than reused. A failed fetch leaves its
+    targets out of the checkpoint, so a rerun retries them; a failed write
+    raises."""
+    targets = list(dict.fromkeys((int(t), int(s), r) for t, s, r in targets))
+    stats = IngestStats(total=len(targets))
+    if checkpoint is not None:
+        pending = [t for t in targets if t not in checkpoint.done]
+        stats.skipped = len(targets) - len(pending)
+    else:
+        pending = targets
+
+    jobs = asyncio.Queue()
+    for job in _fetch_jobs(pending, fetch_batch_size):
+        jobs.put_nowait(job)
+    ready = asyncio.Queue(maxsize=queue_size)
+
+    processor = asyncio.create_task(
+        _process(ready, manager, stats, checkpoint, embed_batch_size, process_batch_size, report),
+    )
+    fetchers = [
+        asyncio.create_task(_fetch(jobs, ready, stats, refetch, fresh_only, client))
+        for _ in range(max(1, min(fetch_workers, jobs.qsize())))
+    ]
+    fetching = asyncio.gather(*fetchers)
+    try:
+        # A processor failure must stop the fetchers too, or they'd block
+        # forever on a full `ready` queue.
+        await asyncio.wait([processor, fetching], return_when=asyncio.FIRST_COMPLETED)
+        if processor.done():
+            processor.result()
+        await fetching
+        await ready.put(_DONE)
+        await processor
+    finally:
+        for task in (processor, *fetchers):
+            task.cancel()
+    return stats
+
+
+async def ingest_event(event_code: str, season: int, region: str, manager, *, client=None, teams=None,
+                       roster=None, embed_batch_size: int = 256, report=print) -> IngestStats:
+    """Fetch every team at `event_code` through the event path and write
+    them into `manager`'s collection. With `teams`, only those of the
+    roster are written (the rest of the fetched payloads are still stored).
+    `roster` is an `afetch_event_roster` result the caller already has.
+    Returns stats for the written teams; `missing` lists `teams` the event
+    didn't have. Raises `LookupError` if the event itself can't be fetched."""
+    stats = IngestStats(total=0)
+    payloads = await data_retrieval.afetch_event_data(event_code, season, region, client=client, roster=roster)
+    if payloads is None:
+        raise LookupError(f"Could not fetch event '{event_code}' ({season}).")
+    stats.fetched = sum(1 for raw in payloads.values() if raw)
+
+    wanted = list(payloads) if teams is None else [int(t) for t in teams]
+    stats.total = len(wanted)
+    present = [(team, payloads[team]) for team in wanted if payloads.get(team)]
+    stats.missing = [(team, season, region) for team in wanted if not payloads.get(team)]
+    if present:
+        chunks = await asyncio.to_thread(
+            manager.upsert_many, [(raw, season, region) for _, raw in present], embed_batch_size,
+        )
+        stats.teams = len(present)
+        stats.chunks = sum(chunks.values())
+    report(stats.summary())
+    return stats
@@ -0,0 +1,219 @@
+"""Templated answers for pure stats lookups -- no LLM call.
+
+The most common `/ask` questions ("how many matches did 21333 win",
+"what was 14469's highest score", "what awards did they win") are already
+answered exactly by the team's VERIFIED FACTS (`stats.render_facts_block`);
+the Gemini round trip only restated them. `answer` recognizes those
+questions and renders the answer straight from the `facts_json` dict
+stored on the team's `season_facts` chunk (`nodes.stats_node.stored_facts`).
+
+Recognition is rules only, and deliberately narrow. A question is answered
+here when:
+
+- it names exactly one team and a season is known,
+- at least one `LOOKUP_RULES` pattern matches it,
+- no router intent matches (`nodes.router` strategy/reputation/comparison
+  rules -- those want the full pipeline), and
+- nothing in it asks for reasoning or narrows the scope below the season
+  (`_DISQUALIFIERS`: "why", "predict", "at <event>", "last"...).
+
+It also needs every fact the template uses to be present. Anything else
+returns None and goes to the LLM as before.
+
+Every answer starts with the same `[Season: <name> <year>, Region:
+<region>]` header rule 1 of `rag_chain.SYSTEM_PROMPT` makes Gemini write.
+"""
+import re
+
+from logging_setup import get_logger
+from nodes.router import rule_intents
+from nodes.stats_node import stored_facts
+from seasons import season_name
+from textutils import fmt
+
+logger = get_logger(__name__)
+
+# intent -> pattern, matched against the lower-cased question. Rendered in
+# this order when several match ("record and highest score").
+LOOKUP_RULES: dict[str, re.Pattern] = {
+    "wins": re.compile(
+        r"\bhow many (?:matches |games )?(?:did|has|have)\b.*\b(?:win|won)\b"
+        r"|\bhow many (?:wins|matches won|games won)\b|\b(?:number of|total) wins\b"
+    ),
+    # Only the team's own record -- "14469's record", "their record" --
+    # not a "world record" or a "record score".
+    "record": re.compile(
+        r"\b(?:win[- ]loss|w-l|w/l)\b"
+        r"|(?:'s|\d|\b(?:team|their|its|season|overall))\s+(?:overall\s+)?record\b(?!\s*(?:score|high|points))"
+    ),
+    "matches_played": re.compile(
+        r"\bhow many (?:matches|games) (?:did|has|have)\b.*\bplay(?:ed)?\b|\b(?:number of|total) matches\b"
+    ),
+    "high_score": re.compile(r"\b(?:highest|best|top|max|maximum) (?:match )?(?:scores?|points)\b"),
+    "low_score": re.compile(r"\b(?:lowest|worst|min|minimum) (?:match )?(?:scores?|points)\b"),
+    "average": re.compile(r"\b(?:average|avg|mean|median) (?:match )?(?:scores?|points)\b"),
+    "awards": re.compile(r"\bawards?\b"),
+    "opr": re.compile(r"\bopr\b"),
+    "rank": re.compile(r"\b(?:rank|ranked|ranking)\b"),
+}
+
+# What a season-aggregate template can't answer, by reason: the question
+# wants reasoning, or narrows the scope below the whole season. Comparisons,
+# strategy and reputation are already caught by the router's rules. Each
+# pattern names phrasings, so team names like "Atlas" or "Worldwide
+# Robotics" don't trip it (tests/unit/test_lookup.py has both sides).
+_DISQUALIFIERS: dict[str, re.Pattern] = {
+    "reasoning": re.compile(
+        r"\b(?:why|how come|explain|predict\w*|chances?|likely|should|would|could|might"
+        r"|trend\w*|improv\w*|consisten\w*)\b"
+    ),
+    # "at the state championship", "during week 2"
+    "one_event": re.compile(r"\b(?:at|during)\b(?! all\b)"),
+    "part_of_season": re.compile(
+        r"\b(?:when|last|latest|recent|recently|first|next|this week)\b"
+        r"|\b(?:qualifications?|qualifiers?|qualifying|quals|eliminations?|elims|playoffs?"
+        r"|semi-?finals?|finals?)\b"
+        r"|\bleague (?:meets?|play|matches|tournament)\b"
+    ),
+    "match_phase": re.compile(
+        r"\b(?:auto|autonomous|tele-?op|driver[- ]controlled|endgame|end game)\b"
+    ),
+    "score_component": re.compile(r"\b(?:penalty|penalties|fouls?|without|excluding|except|minus)\b"),
+    "not_the_team": re.compile(r"\bworlds?\b|\balliance\b|\bpartners?\b"),
+}
+
+
+def classify(question: str) -> tuple:
+    """The lookup intents `question` asks for, in render order; () if it
+    isn't confidently a pure stats lookup."""
+    q = question.lower()
+    if rule_intents(question) or any(p.search(q) for p in _DISQUALIFIERS.values()):
+        return ()
+    return tuple(intent for intent, pattern in LOOKUP_RULES.items() if pattern.search(q))
+
+
+def _team(facts) -> str:
+    return f"Team {facts['team']} ({facts.get('name') or 'Unknown'})"
+
+
+def _event(entry) -> str:
+    return entry.get("event_name") or entry.get("event_code") or "an unknown event"
+
+
+def _record(facts) -> str:
+    return f"{facts['wins']}-{facts['losses']}-{facts['ties']}"
+
+
+def _wins(facts, season_label):
+    if not facts.get("events"):
+        return None
+    return (f"{_team(facts)} won {facts['wins']} matches in {season_label} "
+            f"(record {_record(facts)}, summed across events).")
+
+
+def _record_line(facts, season_label):
+    if not facts.get("events"):
+        return None
+    return (f"{_team(facts)}'s {season_label} record was {_record(facts)} (wins-losses-ties, summed across "
+            f"{len(facts['events'])} event{'s' if len(facts['events']) != 1 else ''}).")
+
+
+def _matches_played(facts, season_label):
+    if not facts.get("match_count"):
+        return None
+    return f"{_team(facts)} played {facts['match_count']} scored matches in {season_label}."
+
+
+def _score(label):
+    def render(facts, season_label):
+        score = facts.get(f"{label}_score")
+        if not facts.get("match_count") or not score:
+            return None
+        word = "highest" if label == "high" else "lowest"
+        return (f"{_team(facts)}'s {word} match score in {season_label} was {score['points']} points, "
+                f"in {score['match']} at {_event(score)}.")
+    return render
+
+
+def _average(facts, season_label):
+    if not facts.get("match_count"):
+        return None
+    return (f"{_team(facts)} averaged {fmt(facts['mean_points'])} points per match in {season_label} "
+            f"(median {fmt(facts['median_points'])}, over {facts['match_count']} matches).")
+
+
+def _awards(facts, season_label):
+    awards = facts.get("awards") or []
+    if not awards:
+        return f"{_team(facts)} won no awards in {season_label}."
+    lines = [f"{_team(facts)} won {len(awards)} award{'s' if len(awards) != 1 else ''} in {season_label}:"]
+    lines += [f"- {a['type']} (Placement {a['placement']}) at {a['event'] or 'an unknown event'}" for a in awards]
+    return "\n".join(lines)
+
+
+def _opr(facts, season_label):
+    if facts.get("season_opr") is None:
+        return None
+    return (f"{_team(facts)}'s {season_label} season OPR was {fmt(facts['season_opr'])} "
+            f"(rank #{facts.get('season_opr_rank') or 'N/A'}): auto {fmt(facts.get('auto_opr'))}, "
+            f"DC {fmt(facts.get('dc_opr'))}, endgame {fmt(facts.get('eg_opr'))}.")
+
+
+def _rank(facts, season_label):
+    events = facts.get("events") or []
+    if facts.get("season_opr_rank") is None and not events:
+        return None
+    lines = []
+    if facts.get("season_opr_rank") is not None:
+        lines.append(f"{_team(facts)}'s {season_label} season OPR rank was #{facts['season_opr_rank']}.")
+    else:
+        lines.append(f"{_team(facts)}'s {season_label} event rankings:")
+    lines += [f"- Ranked #{e['rank'] if e['rank'] is not None else 'N/A'} at {_event(e)} "
+              f"(record {e['wins']}-{e['losses']}-{e['ties']})" for e in events]
+    return "\n".join(lines)
+
+
+_TEMPLATES = {
+    "wins": _wins,
+    "record": _record_line,
+    "matches_played": _matches_played,
+    "high_score": _score("high"),
+    "low_score": _score("low"),
+    "average": _average,
+    "awards": _awards,
+    "opr": _opr,
+    "rank": _rank,
+}
+
+
+def render(intents, facts: dict, season: int, region: str):
+    """The templated answer for `intents` from one team's facts dict, or
+    None if any of them lacks the facts it needs."""
+    season_label = season_name(season)
+    if "opr" in intents and "rank" in intents:
+        intents = tuple(i for i in intents if i != "rank")  # the OPR line already gives its rank
+    lines = []
+    for intent in intents:
+        line = _TEMPLATES[intent](facts, season_label)
+        if line is None:
+            return None
+        lines.append(line)
+    header = f"[Season: {season_name(season)} {season}, Region: {region or 'Unknown'}]"
+    return header + "\n" + "\n".join(lines)
+
+
+def answer(question: str, team_nums, season, region, vector_store):
+    """A templated answer if `question` is a confident single-team stats
+    lookup whose facts are stored, else None (ask the LLM)."""
+    if len(team_nums) != 1 or season is None:
+        return None
+    intents = classify(question)
+    if not intents:
+        return None
+    facts = stored_facts(vector_store, team_nums, season).get(int(team_nums[0]))
+    if not facts:
+        return None
+    text = render(intents, facts, season, region)
+    if text is not None:
+        logger.info("templated answer (%s) for team %s", ",".join(intents), team_nums[0])
+    return text
@@ -0,0 +1,213 @@
+"""In-memory manifest of what the Chroma collection holds per (team, season).
+
+`VectorDBManager.is_team_in_db` runs once per team on every `/ask`, and
+used to be a Chroma `get` with a `$and` metadata filter each time -- a
+SQLite query per team just to read one chunk's `fetched_at`. The manifest
+answers it from a dict instead.
+
+Each `(team, season)` entry holds what freshness needs (`fetched_at` and
+the event-calendar dates `vectordb.upsert_team_data` stamps on every
+chunk), plus the slice's chunk count and a hash over its chunk ids and
+content hashes, so anything that wants to know "did this slice change"
+or "how big is it" doesn't have to ask Chroma either.
+
+It is built once from the collection's metadata when `VectorDBManager`
+starts, then kept current by `vectordb._ChromaWriter`, which re-reads the
+written teams' metadata after every write (the only place chunks are
+added or removed). With `config.FRESHNESS_MANIFEST_PATH` set it is also
+saved there after each write and loaded from there at startup, as long
+as the collection's chunk count is still what it was when the manifest
+was saved -- otherwise
+(a wipe, a crash mid-write) it's rebuilt from the collection.
+
+Entries are grouped by each chunk's own `season` metadata, exactly as the
+old `where={team, season}` lookup saw them, so a team/season counts as
+cached in the same cases as before. Team-less chunks (the shared
+`match_alliance` chunks of `MATCH_LAYOUT=shared`) belong to no entry.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+_FORMAT_VERSION = 1
+_PAGE_SIZE = 5000
+# Chunk metadata fields that describe the fetch, not the chunk.
+_FRESHNESS_FIELDS = ("fetched_at", "next_event_start", "next_event_end", "last_event_end")
+
+
+@dataclass
+class ManifestEntry:
+    chunk_count: int
+    content_hash: str
+    # The most recently fetched chunk's `_FRESHNESS_FIELDS`, in the shape
+    # `freshness` policies' `is_fresh(record, ...)` expect.
+    record: dict = field(default_factory=dict)
+
+    @property
+    def fetched_at(self):
+        return self.record.get("fetched_at")
+
+
+def _entries_from(ids, metadatas) -> dict:
+    """`{(team, season): ManifestEntry}` for these chunks."""
+    grouped = {}
+    for chunk_id, meta in zip(ids, metadatas):
+        meta = meta or {}
+        if meta.get("team") is None or meta.get("season") is None:
+            continue
+        grouped.setdefault((int(meta["team"]), int(meta["season"])), []).append((chunk_id, meta))
+
+    entries = {}
+    for key, chunks in grouped.items():
+        digest = hashlib.sha256()
+        for chunk_id, meta in sorted(chunks, key=lambda c: c[0]):
+            digest.update(f"{chunk_id}\0{meta.get('content_hash') or ''}\n".encode())
+        latest = max((meta for _, meta in chunks), key=lambda m: m.get("fetched_at") or 0)
+        entries[key] = ManifestEntry(
+            chunk_count=len(chunks),
+            content_hash=digest.hexdigest(),
+            record={k: latest[k] for k in _FRESHNESS_FIELDS if latest.get(k) is not None},
+        )
+    return entries
+
+
+class FreshnessManifest:
+    def __init__(self, collection, path=None):
+        self._collection = collection
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+
+    def _load(self) -> dict:
+        if self.path is not None:
+            entries = self._read_sidecar()
+            if entries is not None:
+                return entries
+        entries = self._scan()
+        if self.path is not None:
+            self._write_sidecar(entries)
+        return entries
+
+    def _scan(self, where=None) -> dict:
+        ids, metadatas = [], []
+        offset = 0
+        while True:
+            page = self._collection.get(where=where, include=["metadatas"], limit=_PAGE_SIZE, offset=offset)
+            ids.extend(page["ids"])
+            metadatas.extend(page["metadatas"])
+            if len(page["ids"]) < _PAGE_SIZE:
+                break
+            offset += _PAGE_SIZE
+        return _entries_from(ids, metadatas)
+
+    def _read_sidecar(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != _FORMAT_VERSION:
+                return None
+            entries = {
+                (int(e["team"]), int(e["season"])): ManifestEntry(
+                    chunk_count=e["chunk_count"], content_hash=e["content_hash"], record=e["record"],
+                )
+                for e in data["entries"]
+            }
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("unreadable freshness manifest %s; rebuilding it", self.path, exc_info=True)
+            return None
+        if data.get("collection_count") != self._collection.count():
+            logger.info("freshness manifest %s is out of date with the collection; rebuilding it", self.path)
+            return None
+        return entries
+
+    def _write_sidecar(self, entries) -> None:
+        data = {
+            "version": _FORMAT_VERSION,
+            "written_at": time.time(),
+            "collection_count": self._collection.count(),
+            "entries": [{"team": team, "season": season, **asdict(e)} for (team, season), e in entries.items()],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".manifest-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.warning("could not save freshness manifest to %s", self.path, exc_info=True)
+            Path(tmp).unlink(missing_ok=True)
+
+    def get(self, team: int, season: int):
+        """The entry for this team/season, or None if nothing is stored."""
+        with self._lock:
+            return self._entries.get((int(team), int(season)))
+
+    def is_fresh(self, team: int, season: int, policy, now: float = None) -> bool:
+        """Whether this team/season is stored and `policy` still trusts it.
+        Counted in `stats()` as a hit, a stale entry or a miss."""
+        entry = self.get(team, season)
+        fresh = entry is not None and policy.is_fresh(entry.record, int(season), now)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            elif entry is not None:
+                self.stale += 1
+            else:
+                self.misses += 1
+        return fresh
+
+    def refresh_teams(self, teams) -> None:
+        """Re-read every stored season of `teams` from the collection.
+        Called by the writer after each write."""
+        teams = sorted({int(t) for t in teams})
+        if not teams:
+            return
+        where = {"team": teams[0]} if len(teams) == 1 else {"team": {"$in": teams}}
+        fresh = self._scan(where)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in teams]:
+                del self._entries[key]
+            self._entries.update(fresh)
+            snapshot = dict(self._entries) if self.path is not None else None
+        if snapshot is not None:
+            self._write_sidecar(snapshot)
+
+    def stale_keys(self, policy, now: float = None) -> list:
+        """Every stored `(team, season)` `policy` no longer considers fresh,
+        oldest fetch first -- what a refresh pass should reload."""
+        now = time.time() if now is None else now
+        with self._lock:
+            items = list(self._entries.items())
+        stale = [(key, e) for key, e in items if not policy.is_fresh(e.record, key[1], now)]
+        return [key for key, _ in sorted(stale, key=lambda item: item[1].fetched_at or 0)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "slices": len(self._entries),
+                "chunks": sum(e.chunk_count for e in self._entries.values()),
+                "hits": self.hits,
+                "stale": self.stale,
+                "misses": self.misses,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
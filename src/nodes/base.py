@@ -1,16 +1,33 @@
 """Node contract for the retrieval pipeline.
 
-A node is any callable `(state) -> NodeResult`. `@retrieval_node(name)`
-wraps a node body so it can never raise -- an unhandled exception in one
+A node is any callable `(state) -> NodeResult`, or a coroutine function
+`async (state) -> NodeResult`. `@retrieval_node(name)` wraps either kind
+of node body so it can never raise -- an unhandled exception in one
 source must never take down `/ask`; `stats` and `chroma` (which always run,
 see `chain.py`) are what guarantee the pipeline can always answer even if
 every external node fails.
+
+Every node runs on one process-wide event loop in a daemon thread
+(`node_loop`). Async nodes (Chief Delphi, Reddit -- network-bound, over
+`tools.http`'s pooled `httpx.AsyncClient`) are tasks on it. A task past
+its `node_timeout`, or still running when the caller's budget runs out,
+is cancelled, which aborts its HTTP request and frees the connection at
+once. Sync nodes (stats, chroma, YouTube, whose libraries are sync-only)
+run on the loop's default executor, bounded by
+`config.NODE_WORKER_THREADS` for the whole process rather than a fresh
+pool per request. A sync node past its budget is abandoned, not killed
+(Python threads can't be): its slot frees up once its own `timeout=`
+fires.
 """
+import asyncio
 import concurrent.futures
 import functools
+import inspect
+import threading
 import time
 from dataclasses import dataclass
 
+import config
 from logging_setup import get_logger
 
 logger = get_logger(__name__)
@@ -32,6 +49,9 @@ class NodeResult:
     # Discord (an exception's str() can contain paths or partial secrets --
     # see docs/security.md).
     detail: str = ""
+    # The retrieved items `text` was rendered from, for callers that reuse
+    # them (chroma_node's Documents; see chain.py).
+    documents: tuple = ()
 
     def __repr__(self):
         return f"NodeResult(source={self.source!r}, status={self.status!r}, len(text)={len(self.text)})"
@@ -44,63 +64,130 @@ class PipelineState:
     season: "int | None" = None
     region: "str | None" = None
     team_names: tuple = ()  # resolved names for the identified team_nums, if known
+    k: "int | None" = None  # retrieval depth override (chain.answer's `k`); None scales with team count
 
 
 def retrieval_node(source: str):
-    """Decorate a node body `(state) -> NodeResult` so it can never raise."""
+    """Decorate a node body `(state) -> NodeResult` (or an `async def`
+    one) so it can never raise. Cancellation still propagates: it isn't an
+    `Exception`, and it's how the runner stops an async node."""
     def decorator(fn):
-        @functools.wraps(fn)
-        def wrapper(state: PipelineState) -> NodeResult:
-            try:
-                return fn(state)
-            except Exception as exc:  # noqa: BLE001 -- a node must never crash the pipeline
-                logger.exception("node %s failed", source)
-                return NodeResult(source=source, status=STATUS_ERROR, detail=str(exc))
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(state: PipelineState) -> NodeResult:
+                try:
+                    return await fn(state)
+                except Exception as exc:  # noqa: BLE001 -- a node must never crash the pipeline
+                    logger.exception("node %s failed", source)
+                    return NodeResult(source=source, status=STATUS_ERROR, detail=str(exc))
+        else:
+            @functools.wraps(fn)
+            def wrapper(state: PipelineState) -> NodeResult:
+                try:
+                    return fn(state)
+                except Exception as exc:  # noqa: BLE001 -- a node must never crash the pipeline
+                    logger.exception("node %s failed", source)
+                    return NodeResult(source=source, status=STATUS_ERROR, detail=str(exc))
         wrapper._node_source = source
         return wrapper
     return decorator
 
 
-def run_nodes(nodes: dict, state: PipelineState, *, node_timeout: float, total_budget: float) -> dict:
-    """Run every node in `nodes` (name -> callable) concurrently.
-
-    Bounded by `total_budget` overall; a node still running past that is
-    reported as `status="timeout"` rather than awaited further. The worker
-    thread itself is not force-killed (Python threads can't be) -- it's
-    left to die on its own once the HTTP call inside it hits its own
-    `timeout=` (every tools.http call is required to pass one <=
-    `node_timeout`), so nothing leaks past a few extra seconds.
-    """
-    if not nodes:
-        return {}
+_loop = None
+_loop_lock = threading.Lock()
+
 
+def node_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop every node runs on, started on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+                max_workers=config.NODE_WORKER_THREADS, thread_name_prefix="retrieval-node",
+            ))
+            threading.Thread(target=loop.run_forever, name="retrieval-nodes", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+async def _run_node(name: str, fn, state: PipelineState, node_timeout: float) -> NodeResult:
+    """One node under its own timeout; never raises (short of cancellation)."""
+    try:
+        async with asyncio.timeout(node_timeout):
+            if inspect.iscoroutinefunction(fn):
+                return await fn(state)
+            return await asyncio.to_thread(fn, state)
+    except TimeoutError:
+        logger.warning("node %s exceeded its timeout", name)
+        return NodeResult(source=name, status=STATUS_TIMEOUT)
+    except Exception as exc:  # noqa: BLE001 -- defense in depth if a node skips @retrieval_node
+        logger.exception("node %s raised outside its decorator", name)
+        return NodeResult(source=name, status=STATUS_ERROR, detail=str(exc))
+
+
+async def gather_nodes(nodes: dict, state: PipelineState, *, node_timeout: float, total_budget: float) -> dict:
+    """Run every node in `nodes` (name -> callable) concurrently on the
+    current event loop. Each gets `node_timeout`; whatever is still running
+    when `total_budget` expires is cancelled and reported as
+    `status="timeout"`."""
     results: dict[str, NodeResult] = {}
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(nodes))
-    futures = {executor.submit(fn, state): name for name, fn in nodes.items()}
-    deadline = time.monotonic() + total_budget
+
+    async def run(name, fn):
+        results[name] = await _run_node(name, fn, state, node_timeout)
 
     try:
-        for future in concurrent.futures.as_completed(futures, timeout=total_budget):
-            name = futures[future]
-            remaining = max(0.01, min(node_timeout, deadline - time.monotonic()))
-            try:
-                results[name] = future.result(timeout=remaining)
-            except concurrent.futures.TimeoutError:
-                logger.warning("node %s exceeded its timeout", name)
-                results[name] = NodeResult(source=name, status=STATUS_TIMEOUT)
-            except Exception as exc:  # noqa: BLE001 -- defense in depth if a node skips @retrieval_node
-                logger.exception("node %s raised outside its decorator", name)
-                results[name] = NodeResult(source=name, status=STATUS_ERROR, detail=str(exc))
-    except concurrent.futures.TimeoutError:
-        still_running = [n for f, n in futures.items() if not f.done()]
-        logger.warning("pipeline budget exhausted with nodes still running: %s", still_running)
-    finally:
-        # Don't block the response on abandoned threads; they die on their
-        # own request timeout shortly after (tools.http enforces
-        # timeout <= node_timeout on every call).
-        executor.shutdown(wait=False)
+        async with asyncio.timeout(total_budget), asyncio.TaskGroup() as group:
+            for name, fn in nodes.items():
+                group.create_task(run(name, fn))
+    except TimeoutError:
+        logger.warning("pipeline budget exhausted with nodes still running: %s",
+                       [name for name in nodes if name not in results])
 
     for name in nodes:
         results.setdefault(name, NodeResult(source=name, status=STATUS_TIMEOUT))
+    return results
+
 
+def run_nodes(nodes: dict, state: PipelineState, *, node_timeout: float, total_budget: float) -> dict:
+    """`gather_nodes` on the node loop, from sync code (never from a node)."""
+    if not nodes:
+        return {}
+    return asyncio.run_coroutine_threadsafe(
+        gather_nodes(nodes, state, node_timeout=node_timeout, total_budget=total_budget), node_loop(),
+    ).result()
+
+
+def submit_nodes(nodes: dict, state: PipelineState, *, node_timeout: float) -> dict:
+    """Start every node in `nodes` on the node loop, each under
+    `node_timeout`; returns `{future: name}` for `collect_nodes`. For
+    callers that start nodes at different times (chain.py)."""
+    loop = node_loop()
+    return {
+        asyncio.run_coroutine_threadsafe(_run_node(name, fn, state, node_timeout), loop): name
+        for name, fn in nodes.items()
+    }
+
+
+def collect_nodes(futures: dict, *, deadline: float) -> dict:
+    """Wait for `submit_nodes` futures until the `time.monotonic()`
+    `deadline`. A node still running then is cancelled and reported as
+    `status="timeout"` rather than awaited further."""
+    results: dict[str, NodeResult] = {}
+    done, pending = concurrent.futures.wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+    for future in done:
+        if not future.cancelled():
+            results[futures[future]] = future.result()
+    if pending:
+        logger.warning("pipeline budget exhausted with nodes still running: %s", [futures[f] for f in pending])
+        cancel_nodes(pending)
+
+    for name in futures.values():
+        results.setdefault(name, NodeResult(source=name, status=STATUS_TIMEOUT))
     return results
+
+
+def cancel_nodes(futures) -> None:
+    """Cancel `submit_nodes` futures that haven't finished."""
+    for future in futures:
+        future.cancel()
@@ -1,7 +1,12 @@
 """Chief Delphi Node: community forum search, activated by the router for
 strategy/reputation questions (see nodes/router.py). No auth required --
 enabled by default (`config.ENABLE_CHIEF_DELPHI`).
+
+An async node: its searches run concurrently over `tools.http.aget`, and the
+runner cancels them if the node overruns its budget (nodes/base.py).
 """
+import asyncio
+
 import config
 from nodes.base import NodeResult, PipelineState, STATUS_DISABLED, STATUS_EMPTY, STATUS_OK, retrieval_node
 from tools import discourse
@@ -16,25 +21,26 @@ def _search_terms(state: PipelineState) -> list[str]:
     return terms or [f"{state.question} FTC"]
 
 
-def _cached_search(term: str) -> list[dict]:
+async def _cached_search(term: str) -> list[dict]:
     cache_key = f"chief_delphi:{term}"
     cached = _cache.get(cache_key)
     if cached is not None:
         return cached
-    results = discourse.search(term, limit=config.CHIEF_DELPHI_MAX_POSTS)
+    results = await discourse.asearch(term, limit=config.CHIEF_DELPHI_MAX_POSTS)
     _cache.set(cache_key, results)
     return results
 
 
 @retrieval_node("chief_delphi")
-def chief_delphi_node(state: PipelineState) -> NodeResult:
+async def chief_delphi_node(state: PipelineState) -> NodeResult:
     if not config.ENABLE_CHIEF_DELPHI:
         return NodeResult(source="chief_delphi", status=STATUS_DISABLED, detail="ENABLE_CHIEF_DELPHI is false")
 
     seen_urls = set()
     posts = []
-    for term in _search_terms(state):
-        for post in _cached_search(term):
+    # Every term's search at once; cancelling the node cancels them all.
+    for found in await asyncio.gather(*(_cached_search(term) for term in _search_terms(state))):
+        for post in found:
             if post["url"] in seen_urls:
                 continue
             seen_urls.add(post["url"])
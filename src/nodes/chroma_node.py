@@ -11,9 +11,13 @@ through `chroma_node` -- that's what lets `chain.answer` fall back to it
 unchanged (byte-identical prompt) whenever no external source has anything
 to add. `chroma_node` exists for the *other* case: when `chain.answer` is
 building a fused, multi-source prompt by hand and needs Chroma's context as
-plain text alongside the other sources.
+plain text alongside the other sources. `chain.answer` starts it before
+routing has decided which case applies, so the result also carries the
+retrieved Documents, which `ask_bot(docs=...)` stuffs into the unchanged
+prompt instead of retrieving them a second time.
 """
 import config
+import vector_index
 from clients import get_vector_store
 from nodes.base import NodeResult, PipelineState, STATUS_EMPTY, STATUS_OK, retrieval_node
 
@@ -32,21 +36,35 @@ def build_where(team_nums, season):
 
 
 def get_retriever(team_nums, season, k=None):
-    """Builds the same filtered retriever `rag_chain.ask_bot` has always used."""
-    vector_store = get_vector_store()
-    where = build_where(team_nums, season)
+    """Builds the filtered retriever `rag_chain.ask_bot` uses. With
+    `RETRIEVAL_BACKEND=memory`, a query scoped to specific teams and a
+    season is served by vector_index.py's exact in-memory search instead
+    of Chroma; anything unscoped still goes to Chroma. A scoped query
+    whose `k` covers every chunk in scope skips ranking altogether
+    (`vector_index.SliceRetriever`)."""
+    # Scale k with team count so a multi-team question doesn't starve later
+    # teams of retrieval budget.
     default_k = config.RETRIEVAL_K * max(1, len(team_nums or []))
-    search_kwargs = {"k": k or min(120, default_k)}
-    if where:
-        search_kwargs["filter"] = where
-    return vector_store.as_retriever(search_kwargs=search_kwargs)
+    k = k or min(120, default_k)
+    scoped = bool(team_nums) and season is not None
+    if scoped and config.RETRIEVAL_BACKEND == "memory":
+        ranked = vector_index.get_retriever(team_nums, season, k)
+    else:
+        vector_store = get_vector_store()
+        where = build_where(team_nums, season)
+        search_kwargs = {"k": k}
+        if where:
+            search_kwargs["filter"] = where
+        ranked = vector_store.as_retriever(search_kwargs=search_kwargs)
+    return vector_index.get_slice_retriever(team_nums, season, k, ranked) if scoped else ranked
 
 
 @retrieval_node("chroma")
 def chroma_node(state: PipelineState) -> NodeResult:
-    retriever = get_retriever(state.team_nums, state.season)
+    retriever = get_retriever(state.team_nums, state.season, state.k)
     docs = retriever.invoke(state.question)
     if not docs:
         return NodeResult(source="chroma", status=STATUS_EMPTY)
+    # Joined exactly as create_stuff_documents_chain fills {context}.
     text = "\n\n".join(d.page_content for d in docs)
-    return NodeResult(source="chroma", status=STATUS_OK, text=text)
+    return NodeResult(source="chroma", status=STATUS_OK, text=text, documents=tuple(docs))
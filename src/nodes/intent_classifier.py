@@ -0,0 +1,163 @@
+"""Local intent classifier for questions no router rule matches.
+
+`nodes.router.route` used to send every such question to a structured-
+output Gemini call before retrieval could start -- a full LLM round trip
+on a large share of `/ask` traffic. `IntentClassifier` answers most of
+them locally instead: one logistic-regression head per intent
+(strategy/reputation/comparison, the router's `INTENT_SOURCES` keys) over
+the sentence embeddings of the already-loaded MiniLM model, trained at
+first use from the labeled questions in `intent_examples.yaml`. Training
+embeds about a hundred short strings (read back from the embedding cache
+after the first run) and a few hundred NumPy gradient steps; prediction
+is one query embedding and a matrix-vector product.
+
+`predict` returns the intents whose probability is at least 0.5, and a
+confidence: how far the least decided intent is from 0.5, scaled to
+0..1. The router only trusts a prediction at or above
+`config.INTENT_CLASSIFIER_MIN_CONFIDENCE`; anything less still goes to
+Gemini (when `ENABLE_LLM_ROUTER` is on).
+
+Training also cross-validates the examples (`_FOLDS` folds), and
+`get_classifier` logs the held-out accuracy overall and at the configured
+confidence threshold -- the numbers to tune that threshold against.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+import config
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+EXAMPLES_PATH = Path(__file__).with_name("intent_examples.yaml")
+INTENTS = ("strategy", "reputation", "comparison")
+
+_EPOCHS = 400
+_LEARNING_RATE = 0.5
+_L2 = 1e-3
+_FOLDS = 5
+
+
+@dataclass(frozen=True)
+class IntentPrediction:
+    intents: frozenset
+    confidence: float  # 0..1: how decided the least certain intent is
+
+
+def load_examples(path=EXAMPLES_PATH) -> list:
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _normalized(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _fit(x, y):
+    """Logistic-regression heads for the label columns of `y`, over the
+    normalized embedding rows `x`."""
+    # Standardized features keep plain gradient descent well conditioned
+    # whatever the embedding model's scale.
+    mean = x.mean(axis=0)
+    scale = x.std(axis=0) + 1e-6
+    x = (x - mean) / scale
+    n, dim = x.shape
+    weights = np.zeros((dim, y.shape[1]))
+    bias = np.zeros(y.shape[1])
+    for _ in range(_EPOCHS):
+        error = _sigmoid(x @ weights + bias) - y
+        weights -= _LEARNING_RATE * (x.T @ error / n + _L2 * weights)
+        bias -= _LEARNING_RATE * error.mean(axis=0)
+    return mean, scale, weights, bias
+
+
+def _apply(model, x):
+    mean, scale, weights, bias = model
+    return _sigmoid(((x - mean) / scale) @ weights + bias)
+
+
+def _confidence(p):
+    return np.min(np.abs(2 * p - 1), axis=-1)
+
+
+@dataclass(frozen=True)
+class HeldOutScore:
+    examples: int
+    accuracy: float  # exact intent-set match, over every held-out example
+    coverage: float  # share of held-out examples at or above the threshold
+    confident_accuracy: float  # accuracy over just those (nan if none)
+
+
+class IntentClassifier:
+    def __init__(self, embeddings, examples, intents=INTENTS):
+        """`embeddings` is a LangChain `Embeddings`; `examples` are
+        `{"question", "intents"}` dicts (see `load_examples`)."""
+        self._embeddings = embeddings
+        self.intents = tuple(intents)
+        x = _normalized(np.asarray(embeddings.embed_documents([e["question"] for e in examples]), dtype=np.float64))
+        y = np.array([[float(i in (e.get("intents") or ())) for i in self.intents] for e in examples])
+        self._model = _fit(x, y)
+
+        # Each example's prediction from a model that never saw it.
+        self._held_out_correct = np.zeros(len(examples), dtype=bool)
+        self._held_out_confidence = np.zeros(len(examples))
+        fold = np.arange(len(examples)) % _FOLDS
+        for k in range(min(_FOLDS, len(examples))):
+            test = fold == k
+            if test.all():
+                break
+            p = _apply(_fit(x[~test], y[~test]), x[test])
+            self._held_out_correct[test] = ((p >= 0.5) == (y[test] == 1)).all(axis=1)
+            self._held_out_confidence[test] = _confidence(p)
+
+    def held_out_score(self, min_confidence: float) -> HeldOutScore:
+        """Cross-validated accuracy on the training examples, overall and
+        for the predictions the router would trust at `min_confidence`."""
+        trusted = self._held_out_confidence >= min_confidence
+        return HeldOutScore(
+            examples=len(self._held_out_correct),
+            accuracy=float(self._held_out_correct.mean()) if len(self._held_out_correct) else float("nan"),
+            coverage=float(trusted.mean()) if len(trusted) else 0.0,
+            confident_accuracy=float(self._held_out_correct[trusted].mean()) if trusted.any() else float("nan"),
+        )
+
+    def probabilities(self, question: str) -> dict:
+        x = _normalized(np.asarray([self._embeddings.embed_query(question)], dtype=np.float64))
+        return dict(zip(self.intents, _apply(self._model, x)[0].tolist()))
+
+    def predict(self, question: str) -> IntentPrediction:
+        probabilities = self.probabilities(question)
+        return IntentPrediction(
+            intents=frozenset(i for i, p in probabilities.items() if p >= 0.5),
+            confidence=min(abs(2 * p - 1) for p in probabilities.values()),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_classifier() -> "IntentClassifier | None":
+    """The process-wide classifier over the shared embedding model, or None
+    if it couldn't be trained. Either outcome is kept for the life of the
+    process, so a failed training is logged once, not retried per `/ask`."""
+    from clients import get_embeddings  # local import: router stays importable with no model installed
+    try:
+        classifier = IntentClassifier(get_embeddings(), load_examples())
+    except Exception:  # noqa: BLE001 -- routing falls back to the LLM router without it
+        logger.exception("could not train the intent classifier; routing without it")
+        return None
+    score = classifier.held_out_score(config.INTENT_CLASSIFIER_MIN_CONFIDENCE)
+    logger.info(
+        "intent classifier trained on %d examples: held-out accuracy %.2f; at confidence >= %.2f, "
+        "%.0f%% of questions with accuracy %.2f",
+        score.examples, score.accuracy, config.INTENT_CLASSIFIER_MIN_CONFIDENCE,
+        100 * score.coverage, score.confident_accuracy,
+    )
+    return classifier
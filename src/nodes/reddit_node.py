@@ -2,7 +2,12 @@
 reputation/comparison questions (see nodes/router.py). Self-disables when
 Reddit credentials aren't configured -- `config.ENABLE_REDDIT` is derived
 from their presence, not a literal on/off flag.
+
+An async node over `reddit.asearch_ftc`; the runner cancels its requests if
+it overruns its budget (nodes/base.py).
 """
+import asyncio
+
 import config
 from nodes.base import NodeResult, PipelineState, STATUS_DISABLED, STATUS_EMPTY, STATUS_OK, retrieval_node
 from tools import reddit
@@ -17,25 +22,26 @@ def _search_terms(state: PipelineState) -> list[str]:
     return terms or [state.question]
 
 
-def _cached_search(term: str) -> list[dict]:
+async def _cached_search(term: str) -> list[dict]:
     cache_key = f"reddit:{term}"
     cached = _cache.get(cache_key)
     if cached is not None:
         return cached
-    results = reddit.search_ftc(term, limit=config.REDDIT_MAX_POSTS)
+    results = await reddit.asearch_ftc(term, limit=config.REDDIT_MAX_POSTS)
     _cache.set(cache_key, results)
     return results
 
 
 @retrieval_node("reddit")
-def reddit_node(state: PipelineState) -> NodeResult:
+async def reddit_node(state: PipelineState) -> NodeResult:
     if not config.ENABLE_REDDIT:
         return NodeResult(source="reddit", status=STATUS_DISABLED, detail="ENABLE_REDDIT is false (missing creds)")
 
     seen_urls = set()
     posts = []
-    for term in _search_terms(state):
-        for post in _cached_search(term):
+    # Every term's search at once; cancelling the node cancels them all.
+    for found in await asyncio.gather(*(_cached_search(term) for term in _search_terms(state))):
+        for post in found:
             if post["url"] in seen_urls:
                 continue
             seen_urls.add(post["url"])
@@ -1,8 +1,12 @@
 """Deterministic-first query router.
 
-Rules run first and cost nothing offline-testable and zero-latency; a
-structured-output Gemini call only fires when no rule matches AND
-`config.ENABLE_LLM_ROUTER` is set. Any failure of that call (timeout,
+Rules run first and cost nothing offline-testable and zero-latency. When
+no rule matches, the local intent classifier (nodes/intent_classifier.py,
+a millisecond over the already-loaded embedding model) decides, if
+`config.ENABLE_INTENT_CLASSIFIER` is set and it is at least
+`config.INTENT_CLASSIFIER_MIN_CONFIDENCE` sure. Only below that does a
+structured-output Gemini call fire, and only if `config.ENABLE_LLM_ROUTER`
+is set. Any failure of that call (timeout,
 malformed output, disabled) falls back to `{stats, chroma}` -- the same
 sources that already guarantee the pipeline can always answer.
 
@@ -53,10 +57,14 @@ INTENT_SOURCES: dict[str, frozenset] = {
 class RouteDecision:
     intents: frozenset
     sources: frozenset
-    method: str  # "rules" | "llm" | "fallback"
+    method: str  # "rules" | "classifier" | "llm" | "fallback"
 
 
-def _match_rules(question: str) -> frozenset:
+def rule_intents(question: str) -> frozenset:
+    """The intents the keyword rules alone find in `question` (empty if no
+    rule matches). Free and deterministic, so callers outside the router
+    (`lookup.classify`) can use it to tell a plain question from one that
+    wants the full pipeline."""
     q = f" {question.lower()} "
     intents = set()
     for intent, phrases in INTENT_RULES.items():
@@ -72,6 +80,27 @@ def _sources_for(intents: frozenset) -> frozenset:
     return frozenset(sources)
 
 
+def _classifier_route(question: str) -> "RouteDecision | None":
+    """The local classifier's decision, or None if it's disabled, unsure
+    or unavailable (the caller then asks the LLM)."""
+    if not config.ENABLE_INTENT_CLASSIFIER:
+        return None
+    try:
+        from nodes.intent_classifier import get_classifier  # local import: loads the embedding model
+
+        classifier = get_classifier()
+        if classifier is None:  # training failed at first use; already logged
+            return None
+        prediction = classifier.predict(question)
+    except Exception:  # noqa: BLE001 -- a routing failure must never block /ask
+        logger.exception("intent classifier failed; asking the LLM router")
+        return None
+    if prediction.confidence < config.INTENT_CLASSIFIER_MIN_CONFIDENCE:
+        return None
+    intents = frozenset(i for i in prediction.intents if i in INTENT_SOURCES)
+    return RouteDecision(intents=intents, sources=_sources_for(intents), method="classifier")
+
+
 def _llm_route(question: str) -> "RouteDecision | None":
     """Structured-output classification for questions no rule matched.
     Returns None on any failure so the caller falls back to {stats, chroma}."""
@@ -105,10 +134,14 @@ def _llm_route(question: str) -> "RouteDecision | None":
 
 
 def route(state: PipelineState) -> RouteDecision:
-    intents = _match_rules(state.question)
+    intents = rule_intents(state.question)
     if intents:
         return RouteDecision(intents=intents, sources=_sources_for(intents), method="rules")
 
+    local_decision = _classifier_route(state.question)
+    if local_decision is not None:
+        return local_decision
+
     llm_decision = _llm_route(state.question)
     if llm_decision is not None:
         return llm_decision
@@ -14,27 +14,35 @@ public surface changes.
 
 `render_head_to_head` is new: ADR 0002 deliberately left cross-team
 comparison out of scope ("the facts block is season/team-scoped, not
-cross-team"). For a 2-3 team comparison question, this fetches each team's
-raw FTCScout data (the same client `vectordb.get_or_load_team` already
-uses) and runs it through the same `compute_team_season_facts` -- still
-100%-deterministic Python, never LLM arithmetic -- to build a side-by-side
-table. It is strictly best-effort and time-boxed on its own short budget
-independent of the node's overall timeout: if it can't finish quickly, the
-per-team VERIFIED FACTS blocks (the guaranteed part) are still returned
+cross-team"). For a 2-6 team comparison question (as many teams as
+`extraction` returns), it builds a side-by-side table from each team's
+`stats.compute_team_season_facts` dict -- still 100%-deterministic
+Python, never LLM arithmetic. Those dicts are stored as `facts_json`
+metadata on each team's `season_facts` chunk when the team is upserted
+(processor.py), and `/ask` has just loaded every team it's asking about,
+so they come back in the same Chroma `get` that reads the facts blocks:
+no fetch, no parse, no budget to run out. Only a team whose chunk
+predates `facts_json` falls back to loading its raw payload (normally
+from the raw-payload store, from the network on a store miss), and that
+fallback is time-boxed on its own short budget independent of the
+node's overall timeout: if it can't finish quickly, the per-team
+VERIFIED FACTS blocks (the guaranteed part) are still returned
 untouched, just without the comparison table appended.
 """
 import concurrent.futures
+import json
 
 import data_retrieval
 from clients import get_vector_store
 from logging_setup import get_logger
 from nodes.base import NodeResult, PipelineState, STATUS_EMPTY, STATUS_OK, retrieval_node
 from stats import compute_team_season_facts
+from team_season import TeamSeason
 from textutils import fmt
 
 logger = get_logger(__name__)
 
-_MAX_COMPARISON_TEAMS = 3
+_MAX_COMPARISON_TEAMS = 6
 _HEAD_TO_HEAD_BUDGET_SECONDS = 4.0
 
 # Marker prefix identifying head-to-head content within the rendered facts
@@ -54,45 +62,72 @@ _COMPARISON_AXES = [
 ]
 
 
+def _get_facts_chunks(vector_store, team_nums, season, include=("documents",)) -> dict:
+    return vector_store.get(ids=[f"{t}|{season}|facts" for t in team_nums], include=list(include))
+
+
+def _render_facts_chunks(result) -> str:
+    docs = result.get("documents") or []
+    if not docs:
+        return "No verified facts available for the requested team(s)/season."
+    return "\n\n".join(docs)
+
+
 def facts_block(vector_store, team_nums, season) -> str:
     """Force-include the precomputed facts chunk for every asked team, so
     aggregate answers never depend on winning similarity ranking."""
     if not team_nums or season is None:
         return "No verified facts available (no specific team/season identified)."
-    ids = [f"{t}|{season}|facts" for t in team_nums]
-    result = vector_store.get(ids=ids, include=["documents"])
-    docs = result.get("documents") or []
-    if not docs:
-        return "No verified facts available for the requested team(s)/season."
-    return "\n\n".join(docs)
+    return _render_facts_chunks(_get_facts_chunks(vector_store, team_nums, season))
+
+
+def _stored_facts_dicts(result) -> dict:
+    """`{team: facts dict}` from the `facts_json` metadata of fetched
+    `season_facts` chunks; teams whose chunk has none are left out."""
+    stored = {}
+    for meta in result.get("metadatas") or []:
+        meta = meta or {}
+        if meta.get("facts_json") and meta.get("team") is not None:
+            try:
+                stored[int(meta["team"])] = json.loads(meta["facts_json"])
+            except ValueError:
+                logger.warning("unreadable facts_json for team %s", meta["team"])
+    return stored
+
+
+def stored_facts(vector_store, team_nums, season) -> dict:
+    """`{team: facts dict}` for `team_nums` from their stored `facts_json`
+    -- one Chroma `get`, no payload load. What `lookup.py` answers from."""
+    return _stored_facts_dicts(_get_facts_chunks(vector_store, team_nums, season, include=("metadatas",)))
 
 
 def _fetch_facts_dict(team_num, season, region):
-    """Live FTCScout fetch + compute -- used only by head-to-head rendering,
-    which needs numeric values rather than `facts_block`'s pre-rendered
-    text. Not persisted to Chroma: the existing `season_facts` chunk
-    already covers single-team lookups, this is purely for the ephemeral
-    comparison render. Returns None on any failure."""
+    """Fallback facts dict for a head-to-head team with no stored
+    `facts_json` (see `_head_to_head_facts`): loads the payload through
+    `data_retrieval.load_team_data` (a fresh payload from `payload_store`,
+    else a live FTCScout fetch) and computes the facts from it. Not persisted to Chroma
+    -- the next ingest writes the team's `season_facts` chunk, and with it
+    the `facts_json` that `stored_facts` reads. Returns None on any failure."""
     try:
-        raw = data_retrieval.fetch_team_data(team_number=team_num, season=season, region=region)
+        raw = data_retrieval.load_team_data(team_number=team_num, season=season, region=region)
     except Exception:
-        logger.exception("head-to-head: fetch_team_data failed for team %s", team_num)
+        logger.exception("head-to-head: load_team_data failed for team %s", team_num)
         return None
     if not raw:
         return None
-    return compute_team_season_facts(raw, season, region)
+    return compute_team_season_facts(TeamSeason.from_payload(raw, season), season, region)
 
 
 def _fetch_facts_dicts_bounded(team_nums, season, region, budget_seconds):
     """Fetches every team's facts dict in parallel, bounded by a single
     overall budget so a slow/unreachable FTCScout call can never make the
-    always-on stats node blow past its own timeout in run_nodes.
+    always-on stats node blow past its own node timeout.
 
     Deliberately NOT a `with ThreadPoolExecutor(...)` block -- its __exit__
     calls `shutdown(wait=True)` unconditionally, which would silently
     re-block on the very threads this function is trying to stop waiting
     for. `executor.shutdown(wait=False)` below must be the only shutdown
-    call (mirrors nodes.base.run_nodes, which has the same constraint)."""
+    call."""
     results = {}
     executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(team_nums))
     futures = {executor.submit(_fetch_facts_dict, t, season, region): t for t in team_nums}
@@ -151,16 +186,36 @@ def render_head_to_head(facts_list: list) -> str:
     return "\n".join(lines)
 
 
+def _head_to_head_facts(result, team_nums, season, region) -> list:
+    """Every team's facts dict, in `team_nums` order: stored ones from
+    `result`, and a bounded payload load for any that aren't stored."""
+    stored = _stored_facts_dicts(result)
+    missing = [t for t in team_nums if int(t) not in stored]
+    if missing:
+        logger.info("head-to-head: no stored facts for %s; loading payloads", missing)
+        stored.update(zip(
+            (int(t) for t in missing),
+            _fetch_facts_dicts_bounded(missing, season, region, _HEAD_TO_HEAD_BUDGET_SECONDS),
+        ))
+    return [stored.get(int(t)) for t in team_nums]
+
+
 @retrieval_node("stats")
 def stats_node(state: PipelineState) -> NodeResult:
-    vector_store = get_vector_store()
-    text = facts_block(vector_store, state.team_nums, state.season)
+    if not state.team_nums or state.season is None:
+        text = facts_block(None, state.team_nums, state.season)
+        return NodeResult(source="stats", status=STATUS_EMPTY, text=text)
+
+    compare = 2 <= len(state.team_nums) <= _MAX_COMPARISON_TEAMS
+    result = _get_facts_chunks(
+        get_vector_store(), state.team_nums, state.season,
+        include=("documents", "metadatas") if compare else ("documents",),
+    )
+    text = _render_facts_chunks(result)
 
-    if 2 <= len(state.team_nums) <= _MAX_COMPARISON_TEAMS and state.season is not None:
+    if compare:
         try:
-            facts_dicts = _fetch_facts_dicts_bounded(
-                state.team_nums, state.season, state.region, _HEAD_TO_HEAD_BUDGET_SECONDS,
-            )
+            facts_dicts = _head_to_head_facts(result, state.team_nums, state.season, state.region)
             head_to_head = render_head_to_head(facts_dicts)
             if head_to_head:
                 text = f"{text}\n\n{head_to_head}"
@@ -169,5 +224,4 @@ def stats_node(state: PipelineState) -> NodeResult:
             # is the guaranteed part and must never be lost because of this.
             logger.exception("head-to-head comparison failed; continuing with per-team facts only")
 
-    status = STATUS_OK if (state.team_nums and state.season is not None) else STATUS_EMPTY
-    return NodeResult(source="stats", status=status, text=text)
+    return NodeResult(source="stats", status=STATUS_OK, text=text)
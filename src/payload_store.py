@@ -0,0 +1,152 @@
+"""Persistent, compressed store for raw FTCScout team/season payloads.
+
+A full team/season payload is 100-200 KB of JSON, and it used to be thrown
+away as soon as `processor.process_team_data` had chunked it. Everything
+that needed it again -- the head-to-head comparison in `nodes.stats_node`,
+`scripts/reindex.py` after a `SCHEMA_VERSION` bump -- went back to the
+network for a fresh copy. This keeps every payload we fetch on disk so
+those paths can read it back instead.
+
+Layout under `config.PAYLOAD_STORE_DIR`:
+
+    blobs/ab/<sha256>.json.zst       zstd-compressed canonical JSON
+    refs/q<schema>/<season>/<region>/<team>.json
+                                     {"sha256": ..., "fetched_at": ...}
+
+Blobs are content-addressed, so refetching an unchanged payload rewrites
+only its small ref file. `schema` is `data_retrieval.PAYLOAD_SCHEMA_VERSION`
+-- the shape of the GraphQL selection, not `processor.SCHEMA_VERSION` --
+so a chunk-schema bump leaves every stored payload valid for an offline
+reprocess. Region is part of the key because `quickStats(region:)` makes
+the OPR ranks region-relative.
+
+Writes go to a temp file and `os.replace` into place, so a crash or a
+concurrent reader never sees a half-written blob or ref.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import zstandard
+
+import config
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+_ZSTD_LEVEL = 10
+_UNSAFE_PATH_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+@dataclass(frozen=True)
+class StoredPayload:
+    team: int
+    season: int
+    region: str
+    schema: int
+    fetched_at: float
+    sha256: str
+    payload: dict
+
+
+def _canonical_bytes(payload) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class RawPayloadStore:
+    def __init__(self, root=None):
+        self.root = Path(root or config.PAYLOAD_STORE_DIR)
+
+    def _ref_path(self, team: int, season: int, region: str, schema: int) -> Path:
+        return self.root / "refs" / f"q{schema}" / str(season) / _UNSAFE_PATH_RE.sub("_", region) / f"{team}.json"
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / f"{sha256}.json.zst"
+
+    def put(self, team: int, season: int, region: str, schema: int, payload: dict, fetched_at: float = None) -> str:
+        """Store `payload` and point (team, season, region, schema) at it.
+        Returns the payload's sha256."""
+        raw = _canonical_bytes(payload)
+        sha256 = hashlib.sha256(raw).hexdigest()
+        blob = self._blob_path(sha256)
+        if not blob.exists():
+            _atomic_write(blob, zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw))
+        ref = {"sha256": sha256, "fetched_at": time.time() if fetched_at is None else fetched_at}
+        _atomic_write(self._ref_path(team, season, region, schema), json.dumps(ref).encode("utf-8"))
+        return sha256
+
+    def get(self, team: int, season: int, region: str, schema: int):
+        """The stored payload for this key as a `StoredPayload`, or None if
+        there isn't one (or it's unreadable)."""
+        ref_path = self._ref_path(team, season, region, schema)
+        try:
+            ref = json.loads(ref_path.read_bytes())
+            compressed = self._blob_path(ref["sha256"]).read_bytes()
+            payload = json.loads(zstandard.ZstdDecompressor().decompress(compressed))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, zstandard.ZstdError):
+            logger.warning("unreadable payload store entry %s; ignoring it", ref_path, exc_info=True)
+            return None
+        return StoredPayload(
+            team=team, season=season, region=region, schema=schema,
+            fetched_at=ref["fetched_at"], sha256=ref["sha256"], payload=payload,
+        )
+
+    def keys(self, schema: int, seasons=None):
+        """Every stored `(team, season, region)` for `schema`, optionally
+        restricted to `seasons`."""
+        base = self.root / "refs" / f"q{schema}"
+        if not base.is_dir():
+            return []
+        keys = []
+        for ref in sorted(base.glob("*/*/*.json")):
+            season, region, team = int(ref.parent.parent.name), ref.parent.name, int(ref.stem)
+            if seasons is None or season in seasons:
+                keys.append((team, season, region))
+        return keys
+
+    def prune(self) -> int:
+        """Delete blobs no ref points at any more (superseded refetches).
+        Returns how many were removed. Only safe while nothing else is
+        writing -- `scripts/reindex.py` runs it at the end of a rebuild."""
+        live = set()
+        for ref in (self.root / "refs").glob("*/*/*/*.json"):
+            try:
+                live.add(json.loads(ref.read_bytes())["sha256"])
+            except (OSError, ValueError, KeyError):
+                continue
+        removed = 0
+        for blob in (self.root / "blobs").glob("*/*.json.zst"):
+            if blob.name.split(".", 1)[0] not in live:
+                blob.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+@lru_cache(maxsize=None)
+def _store_at(root: str) -> RawPayloadStore:
+    return RawPayloadStore(root)
+
+
+def get_store() -> RawPayloadStore:
+    """The process-wide store at `config.PAYLOAD_STORE_DIR`."""
+    return _store_at(str(config.PAYLOAD_STORE_DIR))
@@ -4,39 +4,56 @@ Every chunk gets a content-addressed id and complete metadata
 (team/season/region/type/schema_version). This is what makes retrieval
 filterable by team+season (see rag_chain.py) and makes re-upserting a
 smaller payload correctly drop stale chunks (see vectordb.py).
+
+With `shared_matches=True` (the `MATCH_LAYOUT=shared` layout, schema
+version `SHARED_MATCHES_SCHEMA_VERSION`), the per-team `match_granular`
+chunks are replaced by a `match_alliance` chunk per (event, match,
+alliance) -- a team-less score breakdown under a match-level id, so up to
+four teams' payloads all produce the same chunk and it is embedded once --
+plus one `match_schedule` chunk per team per event listing the team's
+station and role in each match, whose `match_refs` metadata names the
+`match_alliance` ids it played in. Retrieval expands those references
+(vector_index.py).
 """
+import json
+
 from stats import compute_team_season_facts, render_facts_block
+from team_season import TeamSeason
 from textutils import clean_value, fmt
 
 SCHEMA_VERSION = 2
+SHARED_MATCHES_SCHEMA_VERSION = 3
+
+# Separates ids in a `match_schedule` chunk's `match_refs` metadata (Chroma
+# metadata values must be scalars).
+MATCH_REF_SEPARATOR = ";"
+
+# Every chunk `type` this module writes, in the order `process_team_data`
+# emits them. Retrieval that returns a whole team/season without ranking
+# (vector_index.SliceRetriever) orders chunks by this.
+CHUNK_TYPES = (
+    "identity", "stats", "award", "event_performance", "match_granular", "match_schedule", "match_alliance",
+    "season_facts",
+)
+
+
+def schema_version(shared_matches: bool = False) -> int:
+    return SHARED_MATCHES_SCHEMA_VERSION if shared_matches else SCHEMA_VERSION
 
 
-def _meta(team_num, season, region, chunk_type, **extra):
+def _meta(team_num, season, region, chunk_type, version=SCHEMA_VERSION, **extra):
     meta = {
         "type": chunk_type,
         "team": team_num,
         "season": season,
         "region": region,
-        "schema_version": SCHEMA_VERSION,
+        "schema_version": version,
     }
     for key, value in extra.items():
         meta[key] = clean_value(value)
     return meta
 
 
-def _match_scores(match_info, alliance):
-    """Return the score dict for this alliance, handling remote-season payloads.
-
-    Traditional seasons key scores by alliance color (`{"red": {...}, "blue": {...}}`).
-    Remote seasons (2020/2021 COVID format) return a single flat score object
-    with no red/blue split at all.
-    """
-    scores_obj = match_info.get("scores") or {}
-    if "red" in scores_obj or "blue" in scores_obj:
-        return scores_obj.get(alliance) or {}
-    return scores_obj
-
-
 _BREAKDOWN_EXCLUDE = {"totalPoints", "totalPointsNp"}
 _BREAKDOWN_EXCLUDE_PREFIXES = ("penaltyPointsByOpp", "minorsByOpp", "majorsByOpp")
 
@@ -54,7 +71,17 @@ def _score_breakdown(scores: dict) -> str:
     return ", ".join(parts)
 
 
-def process_team_data(data, season, region=None):
+def match_alliance_id(season, event_code, description, alliance) -> str:
+    return f"match|{season}|{event_code}|{description}|{alliance}"
+
+
+def match_refs(metadata) -> list:
+    """The `match_alliance` ids a chunk's metadata references, if any."""
+    refs = (metadata or {}).get("match_refs")
+    return refs.split(MATCH_REF_SEPARATOR) if refs else []
+
+
+def process_team_data(data, season, region=None, shared_matches=False):
     """
     Takes the raw FTCScout JSON for one team/season and converts it into
     parallel (documents, metadatas, ids) lists ready for ChromaDB.
@@ -62,122 +89,145 @@ def process_team_data(data, season, region=None):
     `season` is the season the caller requested this data for (used as the
     metadata/id season whenever a record doesn't carry its own). `region` is
     the region this fetch was scoped to (only meaningful for the `stats`
-    chunk, since quickStats/OPR are region-relative).
+    chunk, since quickStats/OPR are region-relative). `shared_matches`
+    selects the normalized match layout (see the module docstring).
+    `data` may also be an already-parsed `team_season.TeamSeason`.
     """
     if not data:
         return [], [], []
+    team = data if isinstance(data, TeamSeason) else TeamSeason.from_payload(data, season)
 
     region = region or "N/A"
+    version = schema_version(shared_matches)
 
     documents = []
     metadatas = []
     ids = []
 
-    team_num = data.get("number")
-    team_name = data.get("name", "Unknown Name")
-    team_id_string = f"Team {team_num} ({team_name})"
+    team_num = team.number
+    team_id_string = f"Team {team_num} ({team.name})"
 
     # identity, location, sponsors
-    loc = data.get("location") or {}
     identity_text = (
         f"FTC {team_id_string}. "
-        f"Based in {clean_value(loc.get('city'))}, {clean_value(loc.get('state'))}, {clean_value(loc.get('country'))}. "
-        f"Rookie Year: {clean_value(data.get('rookieYear'))}. School: {data.get('schoolName') or 'Unknown'}."
+        f"Based in {clean_value(team.city)}, {clean_value(team.state)}, {clean_value(team.country)}. "
+        f"Rookie Year: {clean_value(team.rookie_year)}. School: {team.school or 'Unknown'}."
     )
     documents.append(identity_text)
-    metadatas.append(_meta(team_num, season, region, "identity"))
+    metadatas.append(_meta(team_num, season, region, "identity", version))
     ids.append(f"{team_num}|{season}|identity")
 
     # season summary (region-scoped OPR/rank)
-    qs = data.get("quickStats")
-    if qs:
-        tot = qs.get("tot") or {}
-        auto = qs.get("auto") or {}
-        dc = qs.get("dc") or {}
-        eg = qs.get("eg") or {}
+    qs = team.quick_stats
+    if qs is not None:
         stats_text = (
-            f"Season summary for {team_id_string}: Total OPR {fmt(tot.get('value'))} "
-            f"(Rank #{clean_value(tot.get('rank'))}). "
-            f"Auto OPR: {fmt(auto.get('value'))}, DC OPR: {fmt(dc.get('value'))}, EG OPR: {fmt(eg.get('value'))}."
+            f"Season summary for {team_id_string}: Total OPR {fmt(qs.tot)} "
+            f"(Rank #{clean_value(qs.tot_rank)}). "
+            f"Auto OPR: {fmt(qs.auto)}, DC OPR: {fmt(qs.dc)}, EG OPR: {fmt(qs.eg)}."
         )
         documents.append(stats_text)
-        metadatas.append(_meta(team_num, season, region, "stats"))
+        metadatas.append(_meta(team_num, season, region, "stats", version))
         ids.append(f"{team_num}|{season}|{region}|stats")
 
     # awards
-    for award in data.get("awards", []):
-        award_season = award.get("season") or season
-        award_event_code = award.get("eventCode") or "unknown"
-        award_type = award.get("type") or "unknown"
-        placement = award.get("placement")
+    for award in team.awards:
+        award_season = award.season or season
+        award_event_code = award.event_code or "unknown"
+        award_type = award.type or "unknown"
         award_text = (
-            f"{team_id_string} won the {award.get('type')} award (Placement: {clean_value(placement)}) "
-            f"at the {(award.get('event') or {}).get('name')} in the {award_season} season."
+            f"{team_id_string} won the {award.type} award (Placement: {clean_value(award.placement)}) "
+            f"at the {award.event_name} in the {award_season} season."
         )
         documents.append(award_text)
-        metadatas.append(_meta(team_num, award_season, region, "award", event=award_event_code))
-        ids.append(f"{team_num}|{award_season}|award|{award_event_code}|{award_type}|{clean_value(placement)}")
+        metadatas.append(_meta(team_num, award_season, region, "award", version, event=award_event_code))
+        ids.append(f"{team_num}|{award_season}|award|{award_event_code}|{award_type}|{clean_value(award.placement)}")
 
     # event performance and aggregated totals
-    for event_entry in data.get("events", []):
-        evt = event_entry.get("event") or {}
-        stats = event_entry.get("stats")
-        if not stats:
+    for event in team.events:
+        if not event.has_stats:
             continue
-        event_season = event_entry.get("season") or season
-        opr = stats.get("opr") or {}
+        event_season = event.season or season
         event_text = (
-            f"At {evt.get('name')} ({evt.get('code')}), {team_id_string} ranked #{clean_value(stats.get('rank'))} "
-            f"with a record of {clean_value(stats.get('wins'))}-{clean_value(stats.get('losses'))}-{clean_value(stats.get('ties'))}. "
-            f"Event OPR: {fmt(opr.get('totalPoints'))}."
+            f"At {event.name} ({event.code}), {team_id_string} ranked #{clean_value(event.rank)} "
+            f"with a record of {clean_value(event.wins)}-{clean_value(event.losses)}-{clean_value(event.ties)}. "
+            f"Event OPR: {fmt(event.opr_total)}."
         )
         documents.append(event_text)
-        metadatas.append(_meta(team_num, event_season, region, "event_performance", event=evt.get("code")))
-        ids.append(f"{team_num}|{event_season}|event|{evt.get('code')}")
+        metadatas.append(_meta(team_num, event_season, region, "event_performance", version, event=event.code))
+        ids.append(f"{team_num}|{event_season}|event|{event.code}")
 
     # granular match scores and metadata
-    for entry in data.get("matches", []):
-        if not entry.get("onField"):
-            continue
-        match_info = entry.get("match") or {}
-        if not match_info.get("hasBeenPlayed"):
-            continue
-
-        alliance = (entry.get("alliance") or "").lower()
-        scores = _match_scores(match_info, alliance)
+    schedules = {}  # (season, event) -> [(line, ref)], shared layout only
+    shared_ids = set()  # match_alliance ids already emitted
+    for match in team.matches:
+        scores = match.scores
         if not scores:
             continue
 
-        match_season = entry.get("season") or season
+        match_season = match.season or season
         breakdown = _score_breakdown(scores)
+        alliance = match.alliance
         alliance_label = alliance.capitalize() if alliance else "N/A"
-        station = clean_value(entry.get("station"))
-        role = clean_value(entry.get("allianceRole"))
+        station = clean_value(match.station)
+        role = clean_value(match.role)
+        event_code = match.event_code
+        description = match.description
+
+        # Remote-season scores are one team's own, so there's nothing to share.
+        if shared_matches and match.split:
+            ref = match_alliance_id(match_season, event_code, description, alliance)
+            if ref not in shared_ids:
+                shared_ids.add(ref)
+                documents.append(
+                    f"Match {description} at {event_code} ({match_season} season), {alliance_label} alliance: "
+                    f"Total Points: {scores.get('totalPoints')}. Scoring Breakdown: {breakdown}."
+                )
+                metadatas.append({
+                    "type": "match_alliance", "season": match_season, "schema_version": version,
+                    "event": clean_value(event_code), "match": clean_value(description), "alliance": alliance_label,
+                })
+                ids.append(ref)
+            schedules.setdefault((match_season, event_code), []).append(
+                (f"{description} ({alliance_label} alliance, Station: {station}, Role: {role})", ref)
+            )
+            continue
 
         match_text = (
-            f"Match {match_info.get('description')} details for {team_id_string} "
+            f"Match {description} details for {team_id_string} "
             f"(Alliance: {alliance_label}, Station: {station}, Role: {role}): "
             f"Total Points: {scores.get('totalPoints')}. Scoring Breakdown: {breakdown}."
         )
         documents.append(match_text)
         metadatas.append(_meta(
-            team_num, match_season, region, "match_granular",
-            match=match_info.get("description"), event=entry.get("eventCode"),
+            team_num, match_season, region, "match_granular", version,
+            match=description, event=event_code,
         ))
-        ids.append(f"{team_num}|{match_season}|match|{entry.get('eventCode')}|{match_info.get('description')}")
+        ids.append(f"{team_num}|{match_season}|match|{event_code}|{description}")
+
+    for (schedule_season, event_code), played in schedules.items():
+        documents.append(
+            f"Matches {team_id_string} played at {event_code}: " + "; ".join(line for line, _ in played) + "."
+        )
+        metadatas.append(_meta(
+            team_num, schedule_season, region, "match_schedule", version, event=event_code,
+            match_refs=MATCH_REF_SEPARATOR.join(dict.fromkeys(ref for _, ref in played)),
+        ))
+        ids.append(f"{team_num}|{schedule_season}|schedule|{event_code}")
 
     # deterministic aggregate facts (bypasses LLM arithmetic over context chunks)
-    facts = compute_team_season_facts(data, season, region)
+    # The facts dict itself rides along as JSON metadata, so head-to-head
+    # (nodes/stats_node.py) can compare teams without refetching them.
+    facts = compute_team_season_facts(team, season, region)
     documents.append(render_facts_block(facts))
-    metadatas.append(_meta(team_num, season, region, "season_facts"))
+    metadatas.append(_meta(
+        team_num, season, region, "season_facts", version, facts_json=json.dumps(facts, separators=(",", ":")),
+    ))
     ids.append(f"{team_num}|{season}|facts")
 
     return documents, metadatas, ids
 
 
 if __name__ == "__main__":
-    import json
-
     with open("../tests/fixtures/ftcscout/team_14469_2022.json") as f:
         raw_data = json.load(f)
     docs, metas, ids = process_team_data(raw_data, season=2022, region="All")
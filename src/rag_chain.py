@@ -22,16 +22,19 @@ baseline against the same code path).
 pipeline in chain.py): whenever no external source has anything to add to a
 question, `chain.answer` calls this function completely unchanged, so the
 prompt sent to Gemini is byte-for-byte what it always was -- see
-tests/unit/test_prompt_compat.py.
+tests/unit/test_prompt_compat.py. `stream_ask_bot` is the same call with
+the answer yielded piece by piece (`chain.stream_answer`'s fallback).
+Both accept the facts block and retrieved documents `chain.answer` has
+already computed, so the fallback doesn't repeat retrieval.
 """
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_classic.chains import create_retrieval_chain
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
 
-import config
 from clients import get_llm, get_vector_store
 from extraction import extract_info, extract_team_numbers  # noqa: F401  (re-exported)
 from nodes.chroma_node import build_where as _build_where  # noqa: F401  (re-exported; see nodes/chroma_node.py)
+from nodes.chroma_node import get_retriever as _get_retriever
 from nodes.stats_node import facts_block as _facts_block  # noqa: F401  (re-exported; see nodes/stats_node.py)
 from seasons import season_name
 
@@ -63,26 +66,13 @@ SYSTEM_PROMPT = (
 )
 
 
-def ask_bot(question: str, team_nums=None, season=None, region=None, k=None) -> str:
-    """Answer a scouting question.
-
-    `team_nums`/`season` scope retrieval to the asked team(s)/season via a
-    Chroma metadata filter. Passing `team_nums=None` disables filtering
-    entirely (the original, unfiltered behavior) -- callers should always
-    pass real values; the unfiltered path exists for the before/after eval.
-    """
+def _answer_chain(team_nums, season, region, facts=None):
+    """The prompt + LLM half of `ask_bot`: takes `{input, context}`, where
+    `context` is the retrieved Documents. `facts` is the VERIFIED FACTS
+    text, fetched here when not given."""
     llm = get_llm()
-    vector_store = get_vector_store()
-
-    where = _build_where(team_nums, season)
-    # Scale k with team count so a multi-team question doesn't starve later
-    # teams of retrieval budget -- each team's own facts block is always
-    # force-included regardless, but broader context still benefits from it.
-    default_k = config.RETRIEVAL_K * max(1, len(team_nums or []))
-    search_kwargs = {"k": k or min(120, default_k)}
-    if where:
-        search_kwargs["filter"] = where
-    retriever = vector_store.as_retriever(search_kwargs=search_kwargs)
+    if facts is None:
+        facts = _facts_block(get_vector_store(), team_nums, season)
 
     prompt = ChatPromptTemplate.from_messages([
         ("system", SYSTEM_PROMPT),
@@ -92,16 +82,52 @@ def ask_bot(question: str, team_nums=None, season=None, region=None, k=None) ->
         season=season if season is not None else "Unknown",
         season_name=season_name(season) if season is not None else "Unknown",
         region=region or "Unknown",
-        facts=_facts_block(vector_store, team_nums, season),
+        facts=facts,
     )
 
-    question_answer_chain = create_stuff_documents_chain(llm, prompt)
-    rag_chain = create_retrieval_chain(retriever, question_answer_chain)
+    return create_stuff_documents_chain(llm, prompt)
+
+
+def _retrieval_chain(team_nums, season, region, k, facts=None):
+    # k scales with team count (see chroma_node.get_retriever) -- each
+    # team's own facts block is always force-included regardless, but
+    # broader context still benefits from it.
+    retriever = _get_retriever(team_nums, season, k)
+    return create_retrieval_chain(retriever, _answer_chain(team_nums, season, region, facts))
+
 
-    response = rag_chain.invoke({"input": question})
+def ask_bot(question: str, team_nums=None, season=None, region=None, k=None, facts=None, docs=None) -> str:
+    """Answer a scouting question.
+
+    `team_nums`/`season` scope retrieval to the asked team(s)/season via a
+    Chroma metadata filter. Passing `team_nums=None` disables filtering
+    entirely (the original, unfiltered behavior) -- callers should always
+    pass real values; the unfiltered path exists for the before/after eval.
+
+    `facts` (the VERIFIED FACTS text) and `docs` (the retrieved Documents),
+    when given, are what this call would have fetched itself for the same
+    arguments -- `chain.answer` passes its speculatively-run stats and
+    chroma nodes' output. They fill the same prompt slots, so the prompt
+    is byte-identical either way.
+    """
+    if docs is not None:
+        return _answer_chain(team_nums, season, region, facts).invoke({"input": question, "context": list(docs)})
+    response = _retrieval_chain(team_nums, season, region, k, facts).invoke({"input": question})
     return response["answer"]
 
 
+def stream_ask_bot(question: str, team_nums=None, season=None, region=None, k=None, facts=None, docs=None):
+    """`ask_bot`, same prompt and retrieval, yielding the answer's text in
+    pieces as Gemini generates it."""
+    if docs is not None:
+        for piece in _answer_chain(team_nums, season, region, facts).stream({"input": question, "context": list(docs)}):
+            if piece:
+                yield piece
+        return
+    for part in _retrieval_chain(team_nums, season, region, k, facts).stream({"input": question}):
+        if part.get("answer"):
+            yield part["answer"]
+
 if __name__ == "__main__":
     from data_retrieval import fetch_teams_by_region
 
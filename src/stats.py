@@ -11,108 +11,77 @@ retrieved chunks at all.
 """
 import statistics
 
-from textutils import fmt
-
-
-def _match_score(entry):
-    """Return (points, event_code, description) for one on-field, played match, or None."""
-    if not entry.get("onField"):
-        return None
-    match_info = entry.get("match") or {}
-    if not match_info.get("hasBeenPlayed"):
-        return None
+import numpy as np
 
-    alliance = (entry.get("alliance") or "").lower()
-    scores_obj = match_info.get("scores") or {}
-    if "red" in scores_obj or "blue" in scores_obj:
-        # Traditional season: alliance-keyed score objects.
-        scores = scores_obj.get(alliance) or {}
-    else:
-        # Remote season (2020/2021 COVID format): score object is flat,
-        # with no red/blue split.
-        scores = scores_obj
-
-    points = scores.get("totalPoints")
-    if not isinstance(points, (int, float)):
-        return None
-    return (points, entry.get("eventCode"), match_info.get("description"))
+from team_season import UNKNOWN_NAME, TeamSeason
+from textutils import fmt
 
 
 def compute_team_season_facts(data, season, region=None) -> dict:
-    """Compute exact per-season aggregates from a raw FTCScout team payload."""
+    """Compute exact per-season aggregates from a raw FTCScout team payload
+    (or an already-parsed `team_season.TeamSeason`)."""
     if not data:
         return {}
+    team = data if isinstance(data, TeamSeason) else TeamSeason.from_payload(data, season)
 
-    event_name_by_code = {}
     event_records = []
     wins = losses = ties = 0
-    for event_entry in data.get("events", []):
-        evt = event_entry.get("event") or {}
-        if evt.get("code"):
-            event_name_by_code[evt["code"]] = evt.get("name")
-        stats = event_entry.get("stats")
-        if not stats:
+    for event in team.events:
+        if not event.has_stats:
             continue
-        wins += stats.get("wins") or 0
-        losses += stats.get("losses") or 0
-        ties += stats.get("ties") or 0
+        wins += event.wins or 0
+        losses += event.losses or 0
+        ties += event.ties or 0
         event_records.append({
-            "event_code": evt.get("code"),
-            "event_name": evt.get("name"),
-            "rank": stats.get("rank"),
-            "wins": stats.get("wins"),
-            "losses": stats.get("losses"),
-            "ties": stats.get("ties"),
-            "opr_total": (stats.get("opr") or {}).get("totalPoints"),
+            "event_code": event.code,
+            "event_name": event.name,
+            "rank": event.rank,
+            "wins": event.wins,
+            "losses": event.losses,
+            "ties": event.ties,
+            "opr_total": event.opr_total,
         })
 
-    match_points = [
-        m for m in (_match_score(e) for e in data.get("matches", [])) if m is not None
-    ]
-
-    awards = data.get("awards") or []
-    qs = data.get("quickStats") or {}
-
+    qs = team.quick_stats
     facts = {
-        "team": data.get("number"),
-        "name": data.get("name"),
+        "team": team.number,
+        "name": None if team.name == UNKNOWN_NAME else team.name,  # the payload had no name
         "season": season,
         "region": region,
-        "match_count": len(match_points),
+        "match_count": 0,
         "wins": wins,
         "losses": losses,
         "ties": ties,
-        "award_count": len(awards),
-        "awards": [
-            {
-                "type": a.get("type"),
-                "placement": a.get("placement"),
-                "event": (a.get("event") or {}).get("name"),
-            }
-            for a in awards
-        ],
+        "award_count": len(team.awards),
+        "awards": [{"type": a.type, "placement": a.placement, "event": a.event_name} for a in team.awards],
         "events": event_records,
-        "season_opr": (qs.get("tot") or {}).get("value"),
-        "season_opr_rank": (qs.get("tot") or {}).get("rank"),
-        "auto_opr": (qs.get("auto") or {}).get("value"),
-        "dc_opr": (qs.get("dc") or {}).get("value"),
-        "eg_opr": (qs.get("eg") or {}).get("value"),
+        "season_opr": qs.tot if qs else None,
+        "season_opr_rank": qs.tot_rank if qs else None,
+        "auto_opr": qs.auto if qs else None,
+        "dc_opr": qs.dc if qs else None,
+        "eg_opr": qs.eg if qs else None,
     }
 
-    if match_points:
-        high = max(match_points, key=lambda m: m[0])
-        low = min(match_points, key=lambda m: m[0])
-        pts = [m[0] for m in match_points]
-        facts["high_score"] = {
-            "points": high[0], "event_code": high[1],
-            "event_name": event_name_by_code.get(high[1]), "match": high[2],
-        }
-        facts["low_score"] = {
-            "points": low[0], "event_code": low[1],
-            "event_name": event_name_by_code.get(low[1]), "match": low[2],
-        }
-        facts["mean_points"] = round(sum(pts) / len(pts), 1)
-        facts["median_points"] = statistics.median(pts)
+    # Matches with a numeric total, in payload order; argmax/argmin return
+    # the first of equal scores, as max()/min() over the list did.
+    scored = np.flatnonzero(~np.isnan(team.totals))
+    facts["match_count"] = len(scored)
+    if len(scored):
+        totals = team.totals[scored]
+        event_names = team.event_names()
+
+        def _score(i):
+            match = team.matches[scored[i]]
+            return {
+                "points": match.total, "event_code": match.event_code,
+                "event_name": event_names.get(match.event_code), "match": match.description,
+            }
+
+        facts["high_score"] = _score(int(np.argmax(totals)))
+        facts["low_score"] = _score(int(np.argmin(totals)))
+        facts["mean_points"] = round(float(totals.mean()), 1)
+        # statistics.median keeps ints as ints, which is how they render.
+        facts["median_points"] = statistics.median(team.matches[i].total for i in scored)
     else:
         facts["high_score"] = None
         facts["low_score"] = None
@@ -0,0 +1,228 @@
+"""Typed view of one team's FTCScout season payload, parsed once.
+
+`processor.process_team_data`, `stats.compute_team_season_facts` and the
+head-to-head in `nodes.stats_node` each used to walk the raw payload dict
+on their own: the same `.get(...) or {}` chains, and the same red/blue
+versus remote-season score resolution over the same match list, once per
+consumer. `TeamSeason.from_payload` does that walk once. Awards, events
+and on-field played matches become `__slots__` records (match scores
+already resolved to the team's alliance), and per-match totals and
+auto/DC/endgame components become NumPy arrays aligned with `matches`
+(NaN where a match doesn't report one) for the aggregates in stats.py.
+
+Field values are kept exactly as FTCScout sent them (None included), so
+every consumer renders byte-for-byte what it rendered from the raw dict.
+The one default is `name`: a payload with no `name` key gets
+`UNKNOWN_NAME`, which is what processor.py always rendered for it (an
+explicit null stays None).
+
+`to_bytes`/`from_bytes` serialize it as zstd-compressed JSON in a compact
+positional layout: score keys are interned into one table, and only
+what the consumers read is kept, which is a small fraction of the raw
+payload.
+"""
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import zstandard
+
+_FORMAT_VERSION = 2
+_ZSTD_LEVEL = 10
+
+UNKNOWN_NAME = "Unknown Name"
+
+# (array attribute, score key) for the per-match component arrays.
+_COMPONENTS = (("auto", "autoPoints"), ("dc", "dcPoints"), ("eg", "egPoints"))
+
+
+@dataclass(frozen=True, slots=True)
+class QuickStats:
+    tot: float
+    tot_rank: int
+    auto: float
+    dc: float
+    eg: float
+
+
+@dataclass(frozen=True, slots=True)
+class Award:
+    type: str
+    placement: int
+    season: int  # the award's own season, None if the payload didn't say
+    event_code: str
+    event_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class EventRecord:
+    code: str
+    name: str
+    season: int  # the entry's own season, None if the payload didn't say
+    has_stats: bool
+    rank: int
+    wins: int
+    losses: int
+    ties: int
+    opr_total: float
+
+
+@dataclass(frozen=True, slots=True)
+class MatchRecord:
+    """One on-field, played match, from this team's side."""
+    event_code: str
+    description: str
+    season: int  # the entry's own season, None if the payload didn't say
+    alliance: str  # lower-case, "" if unknown
+    station: str
+    role: str
+    split: bool  # alliance-keyed scores (traditional season) vs one flat remote score
+    scores: dict  # this team's alliance's score breakdown ({} if none)
+
+    @property
+    def total(self):
+        points = self.scores.get("totalPoints")
+        return points if isinstance(points, (int, float)) else None
+
+
+def _alliance_scores(match_info, alliance):
+    """Return `(split, scores)`: the score dict for this alliance, handling
+    remote-season payloads.
+
+    Traditional seasons key scores by alliance color (`{"red": {...}, "blue": {...}}`).
+    Remote seasons (2020/2021 COVID format) return a single flat score object
+    with no red/blue split at all.
+    """
+    scores_obj = match_info.get("scores") or {}
+    if "red" in scores_obj or "blue" in scores_obj:
+        return True, scores_obj.get(alliance) or {}
+    return False, scores_obj
+
+
+def _column(matches, key) -> np.ndarray:
+    values = [m.scores.get(key) for m in matches]
+    return np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float64)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TeamSeason:
+    number: int
+    name: str
+    season: int  # the season the payload was requested for
+    city: str
+    state: str
+    country: str
+    rookie_year: int
+    school: str
+    quick_stats: QuickStats  # None if the payload had none
+    awards: tuple
+    events: tuple
+    matches: tuple
+    # Aligned with `matches`; NaN where the match has no numeric value.
+    totals: np.ndarray
+    auto: np.ndarray
+    dc: np.ndarray
+    eg: np.ndarray
+
+    @classmethod
+    def _build(cls, matches, **fields) -> "TeamSeason":
+        matches = tuple(matches)
+        arrays = {attr: _column(matches, key) for attr, key in _COMPONENTS}
+        return cls(matches=matches, totals=_column(matches, "totalPoints"), **arrays, **fields)
+
+    @classmethod
+    def from_payload(cls, data: dict, season: int) -> "TeamSeason":
+        """Parse a raw FTCScout team payload (`data_retrieval.fetch_team_data`)."""
+        loc = data.get("location") or {}
+        qs = data.get("quickStats")
+        quick_stats = None
+        if qs:
+            tot = qs.get("tot") or {}
+            quick_stats = QuickStats(
+                tot=tot.get("value"), tot_rank=tot.get("rank"), auto=(qs.get("auto") or {}).get("value"),
+                dc=(qs.get("dc") or {}).get("value"), eg=(qs.get("eg") or {}).get("value"),
+            )
+
+        awards = tuple(
+            Award(
+                type=a.get("type"), placement=a.get("placement"), season=a.get("season"),
+                event_code=a.get("eventCode"), event_name=(a.get("event") or {}).get("name"),
+            )
+            for a in data.get("awards") or []
+        )
+
+        events = []
+        for entry in data.get("events") or []:
+            evt = entry.get("event") or {}
+            stats = entry.get("stats") or {}
+            events.append(EventRecord(
+                code=evt.get("code"), name=evt.get("name"), season=entry.get("season"), has_stats=bool(stats),
+                rank=stats.get("rank"), wins=stats.get("wins"), losses=stats.get("losses"), ties=stats.get("ties"),
+                opr_total=(stats.get("opr") or {}).get("totalPoints"),
+            ))
+
+        matches = []
+        for entry in data.get("matches") or []:
+            if not entry.get("onField"):
+                continue
+            match_info = entry.get("match") or {}
+            if not match_info.get("hasBeenPlayed"):
+                continue
+            alliance = (entry.get("alliance") or "").lower()
+            split, scores = _alliance_scores(match_info, alliance)
+            matches.append(MatchRecord(
+                event_code=entry.get("eventCode"), description=match_info.get("description"),
+                season=entry.get("season"), alliance=alliance, station=entry.get("station"),
+                role=entry.get("allianceRole"), split=split, scores=scores,
+            ))
+
+        return cls._build(
+            matches, number=data.get("number"), name=data.get("name", UNKNOWN_NAME), season=season,
+            city=loc.get("city"), state=loc.get("state"), country=loc.get("country"),
+            rookie_year=data.get("rookieYear"), school=data.get("schoolName"),
+            quick_stats=quick_stats, awards=awards, events=tuple(events),
+        )
+
+    def event_names(self) -> dict:
+        """`{event_code: event_name}` for every event in the payload."""
+        return {e.code: e.name for e in self.events if e.code}
+
+    def to_bytes(self) -> bytes:
+        keys = {}
+        matches = []
+        for m in self.matches:
+            scores = []
+            for key, value in m.scores.items():
+                scores.extend((keys.setdefault(key, len(keys)), value))
+            matches.append([m.event_code, m.description, m.season, m.alliance, m.station, m.role, m.split, scores])
+        data = {
+            "v": _FORMAT_VERSION,
+            "team": [self.number, self.name, self.season, self.city, self.state, self.country, self.rookie_year,
+                     self.school],
+            "qs": None if self.quick_stats is None else [getattr(self.quick_stats, f) for f in QuickStats.__slots__],
+            "awards": [[getattr(a, f) for f in Award.__slots__] for a in self.awards],
+            "events": [[getattr(e, f) for f in EventRecord.__slots__] for e in self.events],
+            "keys": list(keys),
+            "matches": matches,
+        }
+        raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "TeamSeason":
+        data = json.loads(zstandard.ZstdDecompressor().decompress(blob))
+        if data.get("v") != _FORMAT_VERSION:
+            raise ValueError(f"unsupported TeamSeason format {data.get('v')!r}")
+        keys = data["keys"]
+        matches = [
+            MatchRecord(*fields, scores={keys[k]: v for k, v in zip(scores[::2], scores[1::2])})
+            for *fields, scores in data["matches"]
+        ]
+        number, name, season, city, state, country, rookie_year, school = data["team"]
+        return cls._build(
+            matches, number=number, name=name, season=season, city=city, state=state, country=country,
+            rookie_year=rookie_year, school=school,
+            quick_stats=None if data["qs"] is None else QuickStats(*data["qs"]),
+            awards=tuple(Award(*a) for a in data["awards"]),
+            events=tuple(EventRecord(*e) for e in data["events"]),
+        )
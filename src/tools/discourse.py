@@ -22,21 +22,7 @@ def _permalink(topic: dict, post_number: int) -> str:
     return f"https://www.chiefdelphi.com/t/{slug}/{topic['id']}/{post_number}"
 
 
-def search(term: str, *, limit: int = 5, timeout: float = None) -> list[dict]:
-    """Returns `[{title, blurb, url, username, created_at}]`, truncated to
-    `limit`. Chief Delphi is FRC-leaning, so an empty list is the common,
-    expected result for most FTC teams -- callers should treat that as a
-    normal outcome, not a failure.
-
-    Can raise (`requests` errors, malformed JSON) -- this is a pure I/O
-    adapter; `nodes.chief_delphi_node` is what converts failures into a
-    `NodeResult(status="error")` instead of propagating.
-    """
-    timeout = timeout if timeout is not None else max(1.0, config.NODE_TIMEOUT_SECONDS - 1)
-    response = http.get(SEARCH_URL, params={"term": term}, timeout=timeout)
-    response.raise_for_status()
-    data = response.json()
-
+def _parse(data: dict, limit: int) -> list[dict]:
     posts = data.get("posts") or []
     topics_by_id = {t["id"]: t for t in (data.get("topics") or [])}
 
@@ -55,3 +41,30 @@ def search(term: str, *, limit: int = 5, timeout: float = None) -> list[dict]:
         if len(results) >= limit:
             break
     return results
+
+
+def _timeout(timeout):
+    return timeout if timeout is not None else max(1.0, config.NODE_TIMEOUT_SECONDS - 1)
+
+
+def search(term: str, *, limit: int = 5, timeout: float = None) -> list[dict]:
+    """Returns `[{title, blurb, url, username, created_at}]`, truncated to
+    `limit`. Chief Delphi is FRC-leaning, so an empty list is the common,
+    expected result for most FTC teams -- callers should treat that as a
+    normal outcome, not a failure.
+
+    Can raise (`requests` errors, malformed JSON) -- this is a pure I/O
+    adapter; `nodes.chief_delphi_node` is what converts failures into a
+    `NodeResult(status="error")` instead of propagating.
+    """
+    response = http.get(SEARCH_URL, params={"term": term}, timeout=_timeout(timeout))
+    response.raise_for_status()
+    return _parse(response.json(), limit)
+
+
+async def asearch(term: str, *, limit: int = 5, timeout: float = None) -> list[dict]:
+    """`search` over `http.aget` -- what `nodes.chief_delphi_node` calls.
+    Raises `httpx` errors where `search` raises `requests` ones."""
+    response = await http.aget(SEARCH_URL, params={"term": term}, timeout=_timeout(timeout))
+    response.raise_for_status()
+    return _parse(response.json(), limit)
@@ -1,19 +1,30 @@
-"""Shared HTTP client for the community-source tools (discourse/reddit/youtube).
+"""Shared HTTP clients for the community-source tools (discourse/reddit/youtube).
 
 A single `requests.Session` per process (connection pooling, one place to
 set a real User-Agent) plus a small bounded retry for transient failures --
 deliberately hand-rolled rather than `urllib3.Retry` to avoid a new
 dependency for three call sites.
 
+`aget`/`apost` are the same over a pooled `httpx.AsyncClient` (one per
+event loop, like `ftcscout.get_client`; in practice the node loop, see
+`nodes.base`), capped at `config.EXTERNAL_MAX_CONNECTIONS`. They back the
+async Chief Delphi and Reddit nodes: cancelling the node cancels the
+request, and its connection goes back to the pool or is closed right then.
+
 Every call here must pass an explicit `timeout` <= `config.NODE_TIMEOUT_SECONDS`
 so a hung external host can never block past a node's own budget (see
 `nodes.base.run_nodes`).
 """
+import asyncio
 import time
+import weakref
 from functools import lru_cache
 
+import httpx
 import requests
 
+import config
+
 USER_AGENT = "ftc-scouting-bot/0.1 (+https://github.com/; research/scouting use)"
 
 
@@ -37,3 +48,44 @@ def get(url: str, *, params: dict = None, timeout: float, max_retries: int = 1,
             if attempt < max_retries:
                 time.sleep(0.5 * (attempt + 1))
     raise last_exc
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """The pooled async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,  # as requests does
+            limits=httpx.Limits(
+                max_connections=config.EXTERNAL_MAX_CONNECTIONS,
+                max_keepalive_connections=config.EXTERNAL_MAX_CONNECTIONS,
+            ),
+        )
+    return client
+
+
+async def _arequest(method: str, url: str, *, timeout: float, max_retries: int, **kwargs) -> httpx.Response:
+    client = get_async_client()
+    last_exc = None
+    for attempt in range(max_retries + 1):
+        try:
+            return await client.request(method, url, timeout=timeout, **kwargs)
+        except httpx.TransportError as exc:  # timeouts and connection errors
+            last_exc = exc
+            if attempt < max_retries:
+                await asyncio.sleep(0.5 * (attempt + 1))
+    raise last_exc
+
+
+async def aget(url: str, *, params: dict = None, timeout: float, max_retries: int = 1, **kwargs) -> httpx.Response:
+    """`get`, async: the same bounded retry on connection/timeout errors."""
+    return await _arequest("GET", url, params=params, timeout=timeout, max_retries=max_retries, **kwargs)
+
+
+async def apost(url: str, *, timeout: float, max_retries: int = 1, **kwargs) -> httpx.Response:
+    return await _arequest("POST", url, timeout=timeout, max_retries=max_retries, **kwargs)
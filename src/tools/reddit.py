@@ -3,14 +3,27 @@
 No username/password needed -- `client_id` + `client_secret` + `user_agent`
 alone puts PRAW in Reddit's "application-only" (client credentials) flow,
 which is read-only by default and exactly what a search-only node needs.
+
+PRAW is sync-only, so `asearch_ftc` (what `nodes.reddit_node` calls) does
+the same two requests itself over `tools.http`'s async client: a client
+credentials token from `TOKEN_URL` (cached until shortly before it
+expires), then the subreddit search on `oauth.reddit.com`. No new
+dependency, and a cancelled node cancels the request.
 """
+import time
 from functools import lru_cache
 
 import praw
 
 import config
+from tools import http
 
 SUBREDDIT = "FTC"
+TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+SEARCH_URL = f"https://oauth.reddit.com/r/{SUBREDDIT}/search"
+
+_TOKEN_REFRESH_MARGIN_SECONDS = 60
+_token = {"value": None, "expires_at": 0.0}
 
 
 @lru_cache(maxsize=1)
@@ -32,19 +45,63 @@ def search_ftc(query: str, *, limit: int = 5, client=None) -> list[dict]:
     `vectordb.get_or_load_team`'s `fetch_function` parameter.
 
     Can raise (prawcore auth/network errors) -- this is a pure I/O adapter;
-    `nodes.reddit_node` converts failures into `NodeResult(status="error")`
-    instead of propagating.
+    `nodes.reddit_node` (which calls `asearch_ftc`) converts failures into
+    `NodeResult(status="error")` instead of propagating.
     """
     client = client or get_client()
     subreddit = client.subreddit(SUBREDDIT)
-    results = []
-    for submission in subreddit.search(query, sort="relevance", time_filter="year", limit=limit):
-        results.append({
-            "title": submission.title,
-            "selftext_excerpt": (submission.selftext or "")[:500],
-            "url": f"https://reddit.com{submission.permalink}",
-            "score": submission.score,
-            "num_comments": submission.num_comments,
-            "created_utc": submission.created_utc,
-        })
-    return results
+    return [
+        _result(s.title, s.selftext, s.permalink, s.score, s.num_comments, s.created_utc)
+        for s in subreddit.search(query, sort="relevance", time_filter="year", limit=limit)
+    ]
+
+
+def _result(title, selftext, permalink, score, num_comments, created_utc) -> dict:
+    return {
+        "title": title,
+        "selftext_excerpt": (selftext or "")[:500],
+        "url": f"https://reddit.com{permalink}",
+        "score": score,
+        "num_comments": num_comments,
+        "created_utc": created_utc,
+    }
+
+
+def _timeout(timeout):
+    return timeout if timeout is not None else max(1.0, config.NODE_TIMEOUT_SECONDS - 1)
+
+
+async def _access_token(timeout: float) -> str:
+    if _token["value"] and time.monotonic() < _token["expires_at"]:
+        return _token["value"]
+    response = await http.apost(
+        TOKEN_URL, data={"grant_type": "client_credentials"},
+        auth=(config.REDDIT_CLIENT_ID, config.REDDIT_CLIENT_SECRET),
+        headers={"User-Agent": config.REDDIT_USER_AGENT}, timeout=timeout,
+    )
+    response.raise_for_status()
+    body = response.json()
+    _token["value"] = body["access_token"]
+    _token["expires_at"] = time.monotonic() + float(body.get("expires_in", 3600)) - _TOKEN_REFRESH_MARGIN_SECONDS
+    return _token["value"]
+
+
+async def asearch_ftc(query: str, *, limit: int = 5, timeout: float = None) -> list[dict]:
+    """`search_ftc`'s results and ranking, over Reddit's OAuth API directly.
+    Can raise (`httpx` errors, an auth failure, malformed JSON), like
+    `search_ftc`."""
+    timeout = _timeout(timeout)
+    token = await _access_token(timeout)
+    response = await http.aget(
+        SEARCH_URL,
+        params={"q": query, "restrict_sr": "on", "sort": "relevance", "t": "year", "limit": limit, "raw_json": 1},
+        headers={"Authorization": f"bearer {token}", "User-Agent": config.REDDIT_USER_AGENT},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    children = ((response.json().get("data") or {}).get("children")) or []
+    return [
+        _result(d.get("title"), d.get("selftext"), d.get("permalink"), d.get("score"), d.get("num_comments"),
+                d.get("created_utc"))
+        for d in (child.get("data") or {} for child in children[:limit])
+    ]
@@ -0,0 +1,372 @@
+"""Exact in-memory vector search over one (team, season) at a time.
+
+Every `/ask` retrieval is filtered to a handful of teams and one season
+(`nodes.chroma_node.build_where`), so there are at most a few hundred
+candidate chunks. Chroma still answers it with a search over the whole
+collection's HNSW graph plus a metadata post-filter, which gets slower as
+more of the league is cached and is approximate besides.
+
+`VectorIndex` keeps each (team, season)'s chunks as one contiguous,
+row-normalized float32 matrix, loaded from the collection on first use and
+evicted least-recently-used past `config.VECTOR_INDEX_MAX_SLICES`. A
+filtered query is then one matmul per team and an exact cosine top-k,
+independent of how much else is in the collection. `IndexRetriever` puts
+it behind LangChain's retriever interface, so `rag_chain.ask_bot` and
+`chroma_node` use it unchanged when `config.RETRIEVAL_BACKEND == "memory"`.
+
+Chroma's collection uses L2 distance; on the normalized vectors
+`all-MiniLM-L6-v2` produces, that ranks chunks exactly as cosine does.
+
+Slices are invalidated by `vectordb._ChromaWriter` after every write that
+touches their (team, season), so the index never serves chunks older than
+the collection's. A write from another process (which the single-writer
+rule for the Chroma directory already forbids while the bot is running)
+would go unnoticed until the slice is evicted.
+
+Whichever backend is ranking, `SliceRetriever` sits in front of it: when
+`k` is at least the slice's (cached) chunk count, ranking would return
+everything anyway, so it returns the slice directly without embedding the
+query. `SliceCounts` keeps those counts for the Chroma backend;
+`VectorIndex` answers from its loaded slices.
+
+Under `MATCH_LAYOUT=shared`, a team's match scores live in team-less
+`match_alliance` chunks its `match_schedule` chunks reference
+(processor.py). A slice includes every chunk its team references,
+labelled with the team, so both the unranked slice and `VectorIndex`'s
+ranking see them as the team's own. The Chroma backend can only rank
+chunks its `where` filter matches, so `SliceCounts.expand` appends the
+matches each retrieved schedule chunk references. A write that corrects
+a shared match's score only invalidates the writing team's slice; other
+teams' cached slices pick it up when they're next written or evicted.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+import clients
+import config
+from logging_setup import get_logger
+from processor import CHUNK_TYPES, match_refs
+
+logger = get_logger(__name__)
+
+# Counts are a few bytes each; this comfortably covers every team in a
+# season, so in practice `SliceCounts` never evicts.
+_MAX_COUNTED_SLICES = 20_000
+
+
+@dataclass(frozen=True)
+class _Slice:
+    ids: list
+    documents: list
+    metadatas: list
+    matrix: np.ndarray  # (len(ids), dim), rows L2-normalized
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _normalized(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _slice_where(team, season) -> dict:
+    return {"$and": [{"team": int(team)}, {"season": int(season)}]}
+
+
+def _referenced(team, metadata, document) -> tuple:
+    """A referenced shared chunk as it appears in `team`'s slice."""
+    return f"[Team {int(team)}] {document}", {**(metadata or {}), "team": int(team)}
+
+
+def _slice_rows(collection, key, include) -> dict:
+    """`collection.get` for the `(team, season)` slice `key`, plus the
+    shared chunks its chunks reference (see `_referenced`)."""
+    result = collection.get(where=_slice_where(*key), include=include)
+    rows = {field: list(result[field] if result[field] is not None else []) for field in ["ids", *include]}
+    own = set(rows["ids"])
+    refs = [r for m in rows["metadatas"] for r in match_refs(m) if r not in own]
+    if refs:
+        shared = collection.get(ids=list(dict.fromkeys(refs)), include=include)
+        for i, chunk_id in enumerate(shared["ids"]):
+            document, metadata = _referenced(key[0], shared["metadatas"][i], shared["documents"][i])
+            rows["ids"].append(chunk_id)
+            rows["documents"].append(document)
+            rows["metadatas"].append(metadata)
+            if "embeddings" in include:
+                rows["embeddings"].append(shared["embeddings"][i])
+    return rows
+
+
+def _chunk_order(metadata, chunk_id):
+    """Sort key for returning a whole slice unranked: by chunk type in the
+    order processor.py writes them, then by id."""
+    chunk_type = (metadata or {}).get("type")
+    rank = CHUNK_TYPES.index(chunk_type) if chunk_type in CHUNK_TYPES else len(CHUNK_TYPES)
+    return rank, chunk_id
+
+
+def _unranked(team_nums, rows) -> list:
+    """`rows` of `(team, id, document, metadata)` as `Document`s, team by
+    team in `team_nums` order and by `_chunk_order` within each team."""
+    position = {int(t): i for i, t in enumerate(team_nums)}
+    rows = sorted(rows, key=lambda r: (position.get(r[0], len(position)), *_chunk_order(r[3], r[1])))
+    return [Document(page_content=doc, metadata=dict(meta or {}), id=chunk_id) for _, chunk_id, doc, meta in rows]
+
+
+class _LRUCache:
+    """`(team, season)`-keyed values loaded on first use and evicted
+    least-recently-used past `max_entries`.
+
+    `invalidate` bumps a per-key generation, so a load that raced a write
+    can tell its result is already stale and doesn't cache it."""
+
+    def __init__(self, load, max_entries: int):
+        self._load = load
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            generation = self._generations.get(key, 0)
+
+        loaded = self._load(key)
+        with self._lock:
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = loaded
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return loaded
+
+    def invalidate(self, keys) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def keys(self) -> set:
+        with self._lock:
+            return set(self._entries)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class VectorIndex:
+    def __init__(self, collection, max_slices: int):
+        self._collection = collection
+        self._slices = _LRUCache(self._load, max_slices)
+
+    @property
+    def max_slices(self) -> int:
+        return self._slices.max_entries
+
+    def _load(self, key) -> _Slice:
+        result = _slice_rows(self._collection, key, ["embeddings", "documents", "metadatas"])
+        embeddings = result["embeddings"]
+        if not len(embeddings):
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        else:
+            matrix = _normalized(np.asarray(embeddings, dtype=np.float32))
+        return _Slice(ids=list(result["ids"]), documents=list(result["documents"]),
+                      metadatas=list(result["metadatas"]), matrix=matrix)
+
+    def _slices_for(self, team_nums, season) -> list:
+        return [self._slices.get((int(t), int(season))) for t in team_nums]
+
+    def invalidate(self, keys) -> None:
+        """Drop the cached slices for these `(team, season)` keys."""
+        self._slices.invalidate(keys)
+
+    def __len__(self):
+        return len(self._slices)
+
+    def count(self, team_nums, season: int) -> int:
+        """How many chunks `team_nums` have in `season` altogether."""
+        return sum(len(s) for s in self._slices_for(team_nums, season))
+
+    def documents(self, team_nums, season: int) -> list:
+        """Every chunk of `team_nums` in `season`, unranked (see `_unranked`)."""
+        return _unranked(team_nums, [
+            (int(team), *row)
+            for team, s in zip(team_nums, self._slices_for(team_nums, season))
+            for row in zip(s.ids, s.documents, s.metadatas)
+        ])
+
+    def expand(self, docs) -> list:
+        """Slices already hold the chunks their team references."""
+        return docs
+
+    def search(self, query_embedding, team_nums, season: int, k: int) -> list:
+        """The `k` chunks of `team_nums` in `season` most cosine-similar to
+        `query_embedding`, best first, as LangChain `Document`s."""
+        slices = [s for s in self._slices_for(team_nums, season) if len(s)]
+        if not slices or k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        scores = np.concatenate([s.matrix @ query for s in slices])
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        offsets = np.cumsum([len(s) for s in slices])
+        docs = []
+        for i in top:
+            which = int(np.searchsorted(offsets, i, side="right"))
+            row = int(i - (offsets[which - 1] if which else 0))
+            s = slices[which]
+            docs.append(Document(page_content=s.documents[row], metadata=dict(s.metadatas[row] or {}), id=s.ids[row]))
+        return docs
+
+
+class SliceCounts:
+    """Chunk counts per `(team, season)`, cached, for the Chroma backend.
+
+    The counterpart of `VectorIndex.count`/`documents` that reads straight
+    from the collection and holds no embeddings, so it's cheap to keep a
+    count for every team/season the bot has been asked about."""
+
+    def __init__(self, collection, max_entries: int = _MAX_COUNTED_SLICES):
+        self._collection = collection
+        self._counts = _LRUCache(self._load, max_entries)
+
+    def _load(self, key) -> int:
+        result = self._collection.get(where=_slice_where(*key), include=["metadatas"])
+        refs = {r for m in result["metadatas"] for r in match_refs(m)}
+        return len(result["ids"]) + len(refs - set(result["ids"]))
+
+    def invalidate(self, keys) -> None:
+        self._counts.invalidate(keys)
+
+    def count(self, team_nums, season: int) -> int:
+        return sum(self._counts.get((int(t), int(season))) for t in team_nums)
+
+    def documents(self, team_nums, season: int) -> list:
+        rows = []
+        for team in team_nums:
+            result = _slice_rows(self._collection, (int(team), int(season)), ["documents", "metadatas"])
+            rows.extend((int(team), *row) for row in zip(result["ids"], result["documents"], result["metadatas"]))
+        return _unranked(team_nums, rows)
+
+    def expand(self, docs) -> list:
+        """`docs` followed by the shared chunks they reference that aren't
+        already among them, each labelled with the referencing team."""
+        seen = {d.id for d in docs}
+        wanted = {}
+        for doc in docs:
+            for ref in match_refs(doc.metadata):
+                if ref not in seen:
+                    wanted.setdefault(ref, doc.metadata.get("team"))
+                    seen.add(ref)
+        if not wanted:
+            return docs
+        shared = self._collection.get(ids=list(wanted), include=["documents", "metadatas"])
+        found = {chunk_id: row for chunk_id, *row in zip(shared["ids"], shared["documents"], shared["metadatas"])}
+        extra = []
+        for chunk_id, team in wanted.items():
+            if chunk_id in found:
+                document, metadata = _referenced(team, found[chunk_id][1], found[chunk_id][0])
+                extra.append(Document(page_content=document, metadata=metadata, id=chunk_id))
+        return list(docs) + extra
+
+
+class IndexRetriever(BaseRetriever):
+    """LangChain retriever over a `VectorIndex`, scoped to fixed teams and season."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: Any
+    embeddings: Any
+    team_nums: tuple
+    season: int
+    k: int
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> list:
+        return self.index.search(self.embeddings.embed_query(query), self.team_nums, self.season, self.k)
+
+
+class SliceRetriever(BaseRetriever):
+    """Scoped retriever that skips ranking when it can't prune anything.
+
+    `RETRIEVAL_K` per team is often more than a team has chunks in a
+    season. When `k` covers every chunk of `team_nums` in `season` (per
+    `slices.count`, cached), all of them are returned as-is, ordered by
+    chunk type, with no query embedding and no similarity search. Only
+    otherwise does `ranked` run, and its results go through
+    `slices.expand` for any shared chunks they reference."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    slices: Any  # VectorIndex or SliceCounts
+    ranked: Any
+    team_nums: tuple
+    season: int
+    k: int
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> list:
+        if self.slices.count(self.team_nums, self.season) <= self.k:
+            return self.slices.documents(self.team_nums, self.season)
+        docs = self.ranked.invoke(query, config={"callbacks": run_manager.get_child()} if run_manager else None)
+        return self.slices.expand(docs)
+
+
+def _collection():
+    return clients.get_chroma_client().get_collection(
+        name=config.CHROMA_COLLECTION, embedding_function=clients.get_embedding_function(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_index() -> VectorIndex:
+    """The process-wide index over the bot's collection."""
+    return VectorIndex(_collection(), config.VECTOR_INDEX_MAX_SLICES)
+
+
+@lru_cache(maxsize=1)
+def get_slice_counts() -> SliceCounts:
+    """The process-wide chunk counts over the bot's collection."""
+    return SliceCounts(_collection())
+
+
+def invalidate(keys) -> None:
+    """Drop `keys` from the process-wide index and counts, where built."""
+    keys = list(keys)
+    if get_index.cache_info().currsize:
+        get_index().invalidate(keys)
+    if get_slice_counts.cache_info().currsize:
+        get_slice_counts().invalidate(keys)
+
+
+def get_retriever(team_nums, season, k) -> IndexRetriever:
+    return IndexRetriever(
+        index=get_index(), embeddings=clients.get_embeddings(),
+        team_nums=tuple(int(t) for t in team_nums), season=int(season), k=k,
+    )
+
+
+def get_slice_retriever(team_nums, season, k, ranked) -> SliceRetriever:
+    """Wraps `ranked` (a retriever already scoped to `team_nums`/`season`)
+    so it's skipped whenever `k` covers the whole slice."""
+    slices = get_index() if config.RETRIEVAL_BACKEND == "memory" else get_slice_counts()
+    return SliceRetriever(
+        slices=slices, ranked=ranked,
+        team_nums=tuple(int(t) for t in team_nums), season=int(season), k=k,
+    )
@@ -7,24 +7,64 @@ Two things changed from the original implementation, both load-bearing:
    re-fetched and re-embedded every mentioned team regardless of whether it
    was already cached. It now checks team+season only (region doesn't
    affect what data was fetched for a team/season, only the OPR ranking
-   context, which is itself stored per-chunk), plus a TTL for the
-   still-changing current season.
+   context, which is itself stored per-chunk), plus a freshness check
+   for the still-changing current season (see freshness.py).
 2. Chunk ids used to be `team_{n}_chunk_{i}` -- a plain enumeration index
    with no season component. Re-upserting a smaller payload for a
    different season silently overwrote the first N chunks and stranded the
    rest under indices the new payload didn't reach. `upsert_team_data` now
-   deletes every existing chunk for that team+season before adding the new
-   ones, so a shrinking payload can never leave orphans behind.
+   deletes every stored chunk for that team+season whose id the new
+   payload no longer produces, so a shrinking payload can never leave
+   orphans behind.
+
+Upserts are diffed: every chunk's metadata carries a `content_hash` of its
+text, and only new or changed chunks are re-embedded and rewritten.
+Unchanged chunks get a metadata-only update (`fetched_at`, event dates).
+
+Loads are single-flight per (team, season): concurrent callers that all
+miss the cache for the same team share one fetch+upsert instead of each
+refetching and re-embedding it in turn (see `_InFlightLoads`). Fetching,
+chunking and embedding all run on the caller's thread, concurrently across
+teams; only the final Chroma write goes through one writer thread
+(`_ChromaWriter`), which folds whatever is queued into a single batch and
+then drops the written teams from the in-memory index (vector_index.py)
+and their cached answers (answer_cache.py).
+
+`is_team_in_db` reads the freshness manifest (manifest.py) instead of
+querying Chroma; the writer re-reads the written teams into it after each
+write.
+
+Under `config.MATCH_LAYOUT == "shared"` a team's payload also produces
+team-less `match_alliance` chunks (processor.py) that other teams'
+payloads produce too. They're diffed by id like any other chunk, so the
+second team to write a match finds it stored and neither embeds nor
+rewrites it. A team's write never deletes one outright, since another
+team may still reference it; instead the writer drops the ones the write
+stopped referencing that no stored `match_schedule` chunk still names
+(`_ChromaWriter._collect_orphans`).
 """
+import asyncio
+import concurrent.futures
+import hashlib
+import queue
+import threading
 import time
+from dataclasses import dataclass, field
 
 import chromadb
-from chromadb.utils import embedding_functions
 
+import answer_cache
+import clients
 import config
+import freshness
+import manifest
 import seasons
+import vector_index
 from data_retrieval import DEFAULT_REGION
-from processor import SCHEMA_VERSION, process_team_data
+from logging_setup import get_logger
+from processor import match_refs, process_team_data, schema_version
+
+logger = get_logger(__name__)
 
 
 class SchemaMismatchError(RuntimeError):
@@ -42,18 +82,249 @@ def build_where(**clauses):
     return {"$and": parts}
 
 
+class _InFlightLoads:
+    """Registry of (team, season) loads currently running.
+
+    The first caller to `claim` a key owns its load; anyone who claims the
+    same key before the owner calls `resolve` gets the owner's future
+    instead and waits on that. Futures are `concurrent.futures.Future` so
+    one registry serves worker threads (`.result()`) and the event loop
+    (`asyncio.wrap_future`) alike. Keys are independent: waiting on one
+    team never blocks a load of another.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures = {}
+
+    def claim(self, keys):
+        """Returns `(owned, joined)`, both `{key: Future}`. The caller must
+        `resolve` every owned future, success or not."""
+        owned, joined = {}, {}
+        with self._lock:
+            for key in keys:
+                future = self._futures.get(key)
+                if future is None:
+                    future = self._futures[key] = concurrent.futures.Future()
+                    owned[key] = future
+                else:
+                    joined[key] = future
+        return owned, joined
+
+    def resolve(self, owned, results=None, exc=None) -> None:
+        with self._lock:
+            for key in owned:
+                del self._futures[key]
+        for key, future in owned.items():
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(results.get(key, False))
+
+
+@dataclass
+class _TeamWrite:
+    """One team/season's changes, as worked out by `upsert_team_data`."""
+    key: tuple
+    delete_ids: list
+    ids: list  # new or changed chunks, with fresh embeddings
+    documents: list
+    metadatas: list
+    embeddings: list
+    refresh_ids: list  # unchanged chunks: metadata (fetched_at etc.) only
+    refresh_metadatas: list
+    # Shared match layout only: the `match_alliance` chunks this write
+    # references but found already stored (so didn't embed), and
+    # `{ref: (season, event)}` for those the team's stored schedules
+    # referenced that its new ones don't.
+    shared_ids: list = field(default_factory=list)
+    shared_documents: list = field(default_factory=list)
+    shared_metadatas: list = field(default_factory=list)
+    released_refs: dict = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.delete_ids) + len(self.ids) + len(self.refresh_ids)
+
+    @property
+    def chunk_count(self) -> int:
+        """Chunks this team/season has once the write lands."""
+        return len(self.ids) + len(self.refresh_ids)
+
+
+class _ChromaWriter:
+    """The only thread that writes to the collection.
+
+    Chroma's PersistentClient is not safe for concurrent writers, but
+    everything before the write -- fetch, chunking, diffing, embedding --
+    is. So callers prepare a `_TeamWrite` themselves and `submit` it here;
+    the writer takes whatever has queued up since its last write and
+    applies all of it as one `delete`, one `upsert` and one metadata-only
+    `update` -- each split into calls of at most the client's max batch
+    size -- then brings `manifest` up to date for the teams it wrote.
+
+    It also garbage-collects shared `match_alliance` chunks (see
+    `_collect_orphans`), remembering what it dropped in `_collected` so a
+    write prepared before the drop gets its chunk back.
+    """
+
+    def __init__(self, collection, max_batch_size: int, manifest=None):
+        self._collection = collection
+        self._manifest = manifest
+        self._max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._collected = set()  # match_alliance ids this writer deleted as orphans
+
+    def submit(self, write: _TeamWrite) -> None:
+        """Queue one team/season's changes and block until written."""
+        self.submit_many([write])
+
+    def submit_many(self, writes) -> None:
+        """Queue several team/seasons' changes at once and block until all
+        are written. Raises the first failure, after every write settles."""
+        futures = []
+        self._ensure_started()
+        for write in writes:
+            future = concurrent.futures.Future()
+            self._queue.put((write, future))
+            futures.append(future)
+        concurrent.futures.wait(futures)
+        for future in futures:
+            future.result()
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chroma-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        held = None  # taken off the queue, but would have overfilled the last batch
+        while True:
+            batch = [held if held is not None else self._queue.get()]
+            held = None
+            size = len(batch[0][0])
+            while size < self._max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if size + len(item[0]) > self._max_batch_size:
+                    held = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._write(batch)
+
+    def _restore_collected(self, writes) -> None:
+        """Re-add shared chunks a write found stored when it was prepared
+        but that this writer has since collected. Rare (it needs a partner
+        to drop a match between another team's diff and its write), so the
+        collection's own embedding function embeds them here."""
+        self._collected.difference_update(i for w in writes for i in w.ids)
+        ids, documents, metadatas = [], [], []
+        for w in writes:
+            for chunk_id, doc, meta in zip(w.shared_ids, w.shared_documents, w.shared_metadatas):
+                if chunk_id in self._collected:
+                    self._collected.discard(chunk_id)
+                    ids.append(chunk_id)
+                    documents.append(doc)
+                    metadatas.append(meta)
+        for s in self._slices(len(ids)):
+            self._collection.upsert(ids=ids[s], documents=documents[s], metadatas=metadatas[s])
+
+    def _collect_orphans(self, writes) -> None:
+        """Delete the `match_alliance` chunks `writes` released that no
+        stored `match_schedule` chunk references any more. Runs after the
+        batch lands, on this thread, so no other write can interleave."""
+        live = {i for w in writes for i in (*w.ids, *w.shared_ids)}
+        released = {r: where for w in writes for r, where in w.released_refs.items() if r not in live}
+        if not released:
+            return
+        events_by_season = {}
+        for season, event in released.values():
+            events_by_season.setdefault(season, set()).add(event)
+        referenced = set()
+        for season, events in events_by_season.items():
+            result = self._collection.get(
+                where=build_where(type="match_schedule", season=season, event={"$in": sorted(events)}),
+                include=["metadatas"],
+            )
+            referenced.update(r for m in result["metadatas"] for r in match_refs(m))
+        orphans = sorted(set(released) - referenced)
+        for s in self._slices(len(orphans)):
+            self._collection.delete(ids=orphans[s])
+        self._collected.update(orphans)
+
+    def _slices(self, n: int):
+        return (slice(i, i + self._max_batch_size) for i in range(0, n, self._max_batch_size))
+
+    def _write(self, batch) -> None:
+        # Later submissions for the same team/season supersede earlier ones.
+        writes = {write.key: write for write, _ in batch}.values()
+        try:
+            delete_ids = [i for w in writes for i in w.delete_ids]
+            for s in self._slices(len(delete_ids)):
+                self._collection.delete(ids=delete_ids[s])
+            ids = [i for w in writes for i in w.ids]
+            documents = [d for w in writes for d in w.documents]
+            metadatas = [m for w in writes for m in w.metadatas]
+            embeddings = [e for w in writes for e in w.embeddings]
+            for s in self._slices(len(ids)):
+                self._collection.upsert(
+                    ids=ids[s], documents=documents[s], metadatas=metadatas[s], embeddings=embeddings[s],
+                )
+            refresh_ids = [i for w in writes for i in w.refresh_ids]
+            refresh_metadatas = [m for w in writes for m in w.refresh_metadatas]
+            for s in self._slices(len(refresh_ids)):
+                self._collection.update(ids=refresh_ids[s], metadatas=refresh_metadatas[s])
+            self._restore_collected(writes)
+            self._collect_orphans(writes)
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+        else:
+            vector_index.invalidate([w.key for w in writes])
+            answer_cache.invalidate([w.key for w in writes])
+            if self._manifest is not None:
+                try:
+                    self._manifest.refresh_teams(w.key[0] for w in writes)
+                except Exception:
+                    # The write itself succeeded; a stale manifest entry only
+                    # costs a refetch, so don't fail the callers over it.
+                    logger.warning("could not refresh the freshness manifest", exc_info=True)
+            for _, future in batch:
+                future.set_result(None)
+
+
+def _content_hash(document: str) -> str:
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
 class VectorDBManager:
-    def __init__(self, db_path=None, embedding_function=None, client=None):
+    def __init__(self, db_path=None, embedding_function=None, client=None, freshness_policy=None,
+                 manifest_path=None, shared_matches=None):
+        # Defaults are the process-wide singletons the query side
+        # (clients.get_vector_store) also uses: one Chroma client per
+        # path, one loaded embedding model.
         if client is not None:
             self.client = client
+        elif db_path is not None:
+            self.client = chromadb.PersistentClient(path=str(db_path))
         else:
-            path = str(db_path or config.CHROMA_PATH)
-            self.client = chromadb.PersistentClient(path=path)
+            self.client = clients.get_chroma_client()
 
-        self.ef = embedding_function or embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=config.EMBEDDING_MODEL
-        )
+        self.ef = embedding_function or clients.get_embedding_function()
+        self.shared_matches = config.MATCH_LAYOUT == "shared" if shared_matches is None else shared_matches
+        self.schema_version = schema_version(self.shared_matches)
         self.collection = self._get_or_create_collection()
+        # None: resolve `freshness.default_policy()` on every check, so
+        # config changes apply without rebuilding the manager.
+        self.freshness_policy = freshness_policy
+        self.manifest = manifest.FreshnessManifest(self.collection, manifest_path or config.FRESHNESS_MANIFEST_PATH)
+        self._writer = _ChromaWriter(self.collection, self.client.get_max_batch_size(), self.manifest)
+        self._inflight = _InFlightLoads()
 
     def _get_or_create_collection(self):
         name = config.CHROMA_COLLECTION
@@ -61,68 +332,247 @@ class VectorDBManager:
         if name in existing:
             collection = self.client.get_collection(name=name, embedding_function=self.ef)
             stored_version = (collection.metadata or {}).get("schema_version")
-            if stored_version != SCHEMA_VERSION:
+            if stored_version != self.schema_version:
                 raise SchemaMismatchError(
                     f"Collection '{name}' was written with schema_version={stored_version!r}, "
-                    f"but processor.py is at {SCHEMA_VERSION}. "
+                    f"but processor.py is at {self.schema_version} (MATCH_LAYOUT={config.MATCH_LAYOUT}). "
                     "Run `python scripts/reindex.py --wipe` to rebuild it."
                 )
             return collection
         return self.client.create_collection(
-            name=name, embedding_function=self.ef, metadata={"schema_version": SCHEMA_VERSION},
+            name=name, embedding_function=self.ef, metadata={"schema_version": self.schema_version},
         )
 
     def is_team_in_db(self, team_num: int, season: int) -> bool:
-        """Checks if a team/season already has data in ChromaDB."""
-        results = self.collection.get(
-            where=build_where(team=team_num, season=season), limit=1, include=["metadatas"],
-        )
-        if not results["ids"]:
-            return False
+        """Checks if a team/season already has fresh data in ChromaDB,
+        from the manifest -- no Chroma query."""
+        policy = self.freshness_policy or freshness.default_policy()
+        return self.manifest.is_fresh(team_num, season, policy)
 
-        if season == seasons.CURRENT_SEASON:
-            fetched_at = (results["metadatas"][0] or {}).get("fetched_at")
-            if fetched_at is None:
-                return False
-            age_hours = (time.time() - fetched_at) / 3600
-            if age_hours > config.CACHE_TTL_HOURS:
-                return False
+    def data_version(self, team_nums, season) -> tuple:
+        """`(team, fetched_at, content_hash)` per team, sorted, from the
+        manifest (None for a team with nothing stored) -- what
+        `answer_cache` keys an answer's underlying data on."""
+        version = []
+        for team in sorted({int(t) for t in team_nums}):
+            entry = self.manifest.get(team, season)
+            version.append((team, entry.fetched_at, entry.content_hash) if entry else (team, None, None))
+        return tuple(version)
+
+    def upsert_team_data(self, raw_data, season, region=None) -> bool:
+        """Processes raw JSON and brings this team/season's chunks in the
+        database up to date with it.
 
+        Only chunks whose text is new or changed are embedded and written;
+        unchanged ones just get their metadata (fetched_at, event dates)
+        refreshed, and chunks the new payload no longer produces are
+        deleted. A refresh after one new event therefore costs a few dozen
+        embeddings rather than the whole payload."""
+        write = self._prepare_write(raw_data, season, region)
+        if write is None:
+            print(f"No documents generated for Team {raw_data.get('number')}.")
+            return False
+
+        # Embed here, on the caller's thread, so only the write itself is
+        # serialized behind other teams.
+        self._embed([write])
+        self._writer.submit(write)
         return True
 
-    def upsert_team_data(self, raw_data, season, region=None) -> bool:
-        """Processes raw JSON and replaces this team/season's chunks in the database."""
-        team_num = raw_data.get("number")
-        docs, metas, ids = process_team_data(raw_data, season=season, region=region)
+    def upsert_many(self, items, embed_batch_size: int = 256) -> dict:
+        """`upsert_team_data` for many `(raw_data, season, region)` at once,
+        for bulk ingestion (ingest.py). Changed chunks are embedded across
+        teams in batches of `embed_batch_size`, and every write is queued
+        before waiting on any, so the writer folds them into as few Chroma
+        calls as its batch size allows. Returns `{(team, season): chunks}`,
+        0 for payloads that produced none."""
+        chunks, writes = {}, []
+        for raw_data, season, region in items:
+            key = (raw_data.get("number"), season)
+            write = self._prepare_write(raw_data, season, region)
+            chunks[key] = 0 if write is None else write.chunk_count
+            if write is not None:
+                writes.append(write)
+        self._embed(writes, embed_batch_size)
+        self._writer.submit_many(writes)
+        return chunks
 
+    def _prepare_write(self, raw_data, season, region):
+        """Chunk `raw_data` and diff it against what's stored: a
+        `_TeamWrite` whose new/changed chunks still need embedding, or
+        None if the payload produces no chunks."""
+        team_num = raw_data.get("number")
+        docs, metas, ids = process_team_data(
+            raw_data, season=season, region=region, shared_matches=self.shared_matches,
+        )
         if not docs:
-            print(f"No documents generated for Team {team_num}.")
-            return False
+            return None
 
+        # Every team chunk carries the fetch time and the team's event
+        # dates, so freshness can be judged from any one of them.
         fetched_at = time.time()
-        for meta in metas:
+        calendar = freshness.event_calendar(raw_data, fetched_at)
+        for doc, meta in zip(docs, metas):
             meta["fetched_at"] = fetched_at
+            meta["content_hash"] = _content_hash(doc)
+            if "team" in meta:
+                meta.update(calendar)
 
-        # Delete-before-add: guarantees a shrinking payload (e.g. fewer
-        # matches than last time) doesn't leave stranded chunks behind.
-        self.collection.delete(where=build_where(team=team_num, season=season))
-        self.collection.add(documents=docs, metadatas=metas, ids=ids)
-        return True
+        stored = self._stored_metadatas(team_num, season, ids)
+        kept_refs = {r for meta in metas for r in match_refs(meta)}
+        write = _TeamWrite(
+            key=(team_num, season),
+            # Deleting ids that no longer exist replaces the old
+            # delete-before-add: a shrinking payload (e.g. fewer matches
+            # than last time) still can't leave stranded chunks.
+            delete_ids=sorted(set(stored) - set(ids)),
+            ids=[], documents=[], metadatas=[], embeddings=[], refresh_ids=[], refresh_metadatas=[],
+            released_refs={
+                r: (meta.get("season"), meta.get("event"))
+                for meta in stored.values() for r in match_refs(meta) if r not in kept_refs
+            },
+        )
+        for doc, meta, chunk_id in zip(docs, metas, ids):
+            if stored.get(chunk_id, {}).get("content_hash") == meta["content_hash"]:
+                if "team" not in meta:
+                    # a shared match chunk some team already wrote
+                    write.shared_ids.append(chunk_id)
+                    write.shared_documents.append(doc)
+                    write.shared_metadatas.append(meta)
+                    continue
+                write.refresh_ids.append(chunk_id)
+                write.refresh_metadatas.append(meta)
+            else:
+                write.ids.append(chunk_id)
+                write.documents.append(doc)
+                write.metadatas.append(meta)
+        return write
+
+    def _embed(self, writes, batch_size: int = None) -> None:
+        """Fill in every write's `embeddings`, `batch_size` documents per
+        model call across writes (all in one call if None)."""
+        documents = [d for w in writes for d in w.documents]
+        if not documents:
+            return
+        batch_size = batch_size or len(documents)
+        embeddings = []
+        for start in range(0, len(documents), batch_size):
+            embeddings.extend(self.ef(documents[start:start + batch_size]))
+        offset = 0
+        for write in writes:
+            write.embeddings = list(embeddings[offset:offset + len(write.documents)])
+            offset += len(write.documents)
+
+    def _stored_metadatas(self, team_num, season, ids) -> dict:
+        """`{chunk_id: metadata}` for every stored chunk of this
+        team/season, plus any of `ids` stored under another season (award
+        chunks carry their own). Chunks written before content hashes
+        existed have no `content_hash`, so they're re-embedded once."""
+        stored = {}
+        for result in (
+            self.collection.get(where=build_where(team=team_num, season=season), include=["metadatas"]),
+            self.collection.get(ids=list(ids), include=["metadatas"]),
+        ):
+            for chunk_id, meta in zip(result["ids"], result["metadatas"]):
+                stored[chunk_id] = meta or {}
+        return stored
 
     def get_or_load_team(self, team_num, fetch_function, season=None, region=None) -> bool:
-        """Fetches from DB if cached and fresh, otherwise hits the API."""
-        if season is None:
-            season = seasons.CURRENT_SEASON
-        if region is None:
-            region = DEFAULT_REGION
-
-        if self.is_team_in_db(team_num, season):
-            return True
-
-        raw_data = fetch_function(team_number=team_num, season=season, region=region)
-        if raw_data:
-            return self.upsert_team_data(raw_data, season=season, region=region)
-        return False
+        """Fetches from DB if cached and fresh, otherwise hits the API.
+        Concurrent calls for the same team+season share one fetch."""
+        return self.get_or_load_teams(
+            [team_num],
+            lambda team_numbers, season, region: {team_num: fetch_function(
+                team_number=team_num, season=season, region=region,
+            )},
+            season=season, region=region,
+        )[team_num]
+
+    def _partition_cached(self, team_nums, season):
+        """Split `team_nums` into (already cached and fresh, needs fetching)."""
+        cached, misses = [], []
+        for team_num in team_nums:
+            (cached if self.is_team_in_db(team_num, season) else misses).append(team_num)
+        return cached, misses
+
+    def _upsert_fetched(self, raw_by_team, misses, season, region) -> dict:
+        return {
+            team_num: bool(raw_by_team.get(team_num))
+            and self.upsert_team_data(raw_by_team[team_num], season=season, region=region)
+            for team_num in misses
+        }
+
+    def get_or_load_teams(self, team_nums, batch_fetch_function, season=None, region=None) -> dict:
+        """Bulk `get_or_load_team`: only the teams that aren't already
+        cached and fresh are fetched, in one `batch_fetch_function` call
+        (normally `data_retrieval.load_teams_data`) rather than one
+        round trip each. A miss that another caller is already loading is
+        waited on rather than fetched again. Returns `{team_num: loaded}`."""
+        season = season if season is not None else seasons.CURRENT_SEASON
+        region = region or DEFAULT_REGION
+
+        cached, misses = self._partition_cached(team_nums, season)
+        loaded = dict.fromkeys(cached, True)
+        if misses:
+            owned, joined = self._inflight.claim([(team_num, season) for team_num in misses])
+            try:
+                # Re-check what we now own: a load that finished between
+                # our cache check and our claim has already written it.
+                results = self._load_owned(owned, season, region, batch_fetch_function) if owned else {}
+            except BaseException as exc:
+                self._inflight.resolve(owned, exc=exc)
+                raise
+            self._inflight.resolve(owned, results)
+            loaded.update({team_num: results[(team_num, season)] for team_num, _ in owned})
+            loaded.update({team_num: future.result() for (team_num, _), future in joined.items()})
+        return {team_num: loaded[team_num] for team_num in team_nums}
+
+    def _load_owned(self, owned, season, region, batch_fetch_function) -> dict:
+        cached, misses = self._partition_cached([team_num for team_num, _ in owned], season)
+        results = dict.fromkeys(cached, True)
+        if misses:
+            raw_by_team = batch_fetch_function(team_numbers=misses, season=season, region=region)
+            results.update(self._upsert_fetched(raw_by_team, misses, season, region))
+        return {(team_num, season): ok for team_num, ok in results.items()}
+
+    async def aget_or_load_teams(self, team_nums, batch_fetch_coro, season=None, region=None) -> dict:
+        """`get_or_load_teams` for the bot's event loop: the FTCScout fetch
+        is awaited directly (`data_retrieval.aload_teams_data`), so it
+        never occupies a worker thread; only the blocking Chroma reads and
+        the embed-and-write go through `asyncio.to_thread`. Shares the
+        same in-flight registry as the sync path."""
+        season = season if season is not None else seasons.CURRENT_SEASON
+        region = region or DEFAULT_REGION
+
+        cached, misses = await asyncio.to_thread(self._partition_cached, team_nums, season)
+        loaded = dict.fromkeys(cached, True)
+        if misses:
+            owned, joined = self._inflight.claim([(team_num, season) for team_num in misses])
+            if owned:
+                # Shielded: the owner's /ask being cancelled mustn't abort a
+                # load other callers are waiting on.
+                load = asyncio.ensure_future(self._aload_owned(owned, season, region, batch_fetch_coro))
+                load.add_done_callback(lambda task: self._resolve_from_task(owned, task))
+                await asyncio.shield(load)
+            for (team_num, _), future in {**owned, **joined}.items():
+                loaded[team_num] = await asyncio.wrap_future(future)
+        return {team_num: loaded[team_num] for team_num in team_nums}
+
+    async def _aload_owned(self, owned, season, region, batch_fetch_coro) -> dict:
+        cached, misses = await asyncio.to_thread(self._partition_cached, [team_num for team_num, _ in owned], season)
+        results = dict.fromkeys(cached, True)
+        if misses:
+            raw_by_team = await batch_fetch_coro(team_numbers=misses, season=season, region=region)
+            results.update(await asyncio.to_thread(self._upsert_fetched, raw_by_team, misses, season, region))
+        return {(team_num, season): ok for team_num, ok in results.items()}
+
+    def _resolve_from_task(self, owned, task) -> None:
+        if task.cancelled():
+            self._inflight.resolve(owned, exc=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._inflight.resolve(owned, exc=task.exception())
+        else:
+            self._inflight.resolve(owned, task.result())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+"""Competition-day warm-up: preload every team at an event or in a region.
+
+On event morning everyone asks about the same few dozen teams, and the
+first `/ask` about each one pays the whole cold fetch-and-embed. `warm_up`
+resolves the event's team list (FTCScout `eventByCode`) or the region's
+team index, drops the teams that are already cached and fresh, and loads
+the rest through the bulk ingestion pipeline (ingest.py): batched
+concurrent fetches, cross-team embedding, one batching writer. Each load
+also writes the raw payload through to the payload store, which is what
+head-to-head facts read, so both caches end up warm.
+
+Driven by the bot's admin-only `/warmup` command and by
+`scripts/warmup.py`.
+
+An event warm-up goes through `ingest.ingest_event`: the roster and every
+team's season data arrive together, with each shared match score fetched
+once, so it costs a couple of requests per event rather than one per team.
+"""
+import asyncio
+from dataclasses import dataclass
+
+import data_retrieval
+from data_retrieval import DEFAULT_REGION
+from ingest import IngestStats, ingest, ingest_event
+from logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+class WarmupError(RuntimeError):
+    """Raised when the event or region's team list can't be resolved."""
+
+
+@dataclass
+class WarmupResult:
+    source: str  # "event ABC" / "region USIL"
+    teams: list
+    already_fresh: int
+    stats: IngestStats
+
+    def summary(self) -> str:
+        return (
+            f"Warmed {self.source}: {len(self.teams)} teams, {self.already_fresh} already fresh, "
+            f"{self.stats.teams} loaded ({self.stats.chunks} chunks, {self.stats.fetched} fetched, "
+            f"{len(self.stats.missing)} missing) in {self.stats.elapsed:.1f}s"
+        )
+
+
+async def resolve_teams(*, season: int, event_code: str = None, region: str = None, client=None) -> list:
+    """Team numbers at `event_code` in `season`, or in `region`'s index."""
+    if event_code:
+        teams = await data_retrieval.afetch_event_teams(event_code, season, client=client)
+        if teams is None:
+            raise WarmupError(f"Could not resolve the team list for event '{event_code}' ({season}).")
+        return teams
+    index = await asyncio.to_thread(data_retrieval.get_cached_teams_by_region, region)
+    if index is None:
+        raise WarmupError(f"Could not load the team index for region '{region}'.")
+    return sorted({int(n) for n in index.values()})
+
+
+async def warm_up(manager, *, season: int, event_code: str = None, region: str = None, client=None,
+                  report=None, **ingest_options) -> WarmupResult:
+    """Load every not-yet-fresh team at `event_code` (or in `region`) for
+    `season` into `manager`. Teams are loaded under `region` (default
+    `DEFAULT_REGION`, what `/ask` uses unless told otherwise), which only
+    affects the region-relative OPR ranks in their stats chunk."""
+    if not event_code and not region:
+        raise ValueError("warm_up needs an event code or a region")
+    region = region or DEFAULT_REGION
+    source = f"event {event_code}" if event_code else f"region {region}"
+
+    report = report or (lambda line: logger.info("warm-up %s: %s", source, line))
+
+    if event_code:
+        return await _warm_up_event(manager, event_code, season, region, client, report, source, **ingest_options)
+
+    teams = await resolve_teams(season=season, region=region, client=client)
+    # A manifest lookup per team (see manifest.py), so no need to leave the loop.
+    misses = [team for team in teams if not manager.is_team_in_db(team, season)]
+    logger.info("warm-up of %s (%d): %d teams, %d to load", source, season, len(teams), len(misses))
+
+    stats = await ingest(
+        [(team, season, region) for team in misses], manager, client=client, fresh_only=True,
+        report=report, **ingest_options,
+    )
+    return WarmupResult(source=source, teams=teams, already_fresh=len(teams) - len(misses), stats=stats)
+
+
+async def _warm_up_event(manager, event_code, season, region, client, report, source, **ingest_options):
+    """The whole roster arrives in one event fetch, so once any team needs
+    loading, every team's data is in hand; all of it is written (unchanged
+    chunks only get their metadata refreshed), not just the stale ones.
+    That fetch doubles as the roster check, and is handed on to the load."""
+    roster = await data_retrieval.afetch_event_roster(event_code, season, region, client=client)
+    if roster is None:
+        raise WarmupError(f"Could not resolve the team list for event '{event_code}' ({season}).")
+    teams = sorted(roster)
+    misses = [team for team in teams if not manager.is_team_in_db(team, season)]
+    logger.info("warm-up of %s (%d): %d teams, %d to load", source, season, len(teams), len(misses))
+    if not misses:
+        return WarmupResult(source=source, teams=teams, already_fresh=len(teams), stats=IngestStats(total=0))
+    try:
+        stats = await ingest_event(
+            event_code, season, region, manager, client=client, teams=teams, roster=roster, report=report,
+            embed_batch_size=ingest_options.get("embed_batch_size", 256),
+        )
+    except LookupError as e:
+        raise WarmupError(str(e)) from e
+    return WarmupResult(source=source, teams=teams, already_fresh=len(teams) - len(misses), stats=stats)
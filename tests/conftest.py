@@ -1,12 +1,41 @@
 import copy
+import functools
 import json
 from pathlib import Path
 
+import httpx
 import pytest
 
+# Captured before the root conftest's `_block_network` patches it out, so
+# `ftcscout_stub` can put it back for clients wired to a MockTransport.
+_REAL_ASYNC_SEND = httpx.AsyncClient.send
+
 FIXTURES = Path(__file__).parent / "fixtures"
 
 
+@pytest.fixture(autouse=True)
+def _isolated_disk_caches(tmp_path, monkeypatch):
+    """Every fetch writes through to the raw-payload store, the default
+    embedders write through to the embedding cache, every write
+    invalidates the answer cache, and the default Chroma client opens
+    `CHROMA_PATH`; keep all four out of the real `src/payloads`,
+    `src/embedding_cache`, `src/answer_cache` and `src/chroma_db`."""
+    import config
+    monkeypatch.setattr(config, "CHROMA_PATH", tmp_path / "chroma_db")
+    monkeypatch.setattr(config, "PAYLOAD_STORE_DIR", tmp_path / "payloads")
+    monkeypatch.setattr(config, "EMBEDDING_CACHE_DIR", tmp_path / "embedding_cache")
+    monkeypatch.setattr(config, "ANSWER_CACHE_PATH", tmp_path / "answer_cache" / "answers.sqlite3")
+
+
+@pytest.fixture(autouse=True)
+def _no_intent_classifier(monkeypatch):
+    """`nodes.router.route` would otherwise train the intent classifier on
+    the real sentence-transformer at first use. Tests that exercise the
+    classifier build one over hash embeddings (tests/unit/test_router.py)."""
+    import config
+    monkeypatch.setattr(config, "ENABLE_INTENT_CLASSIFIER", False)
+
+
 def _load(rel_path: str):
     with open(FIXTURES / rel_path, encoding="utf-8") as f:
         return json.load(f)
@@ -56,3 +85,22 @@ def region_index_usil():
 def hash_ef():
     from tests.support.embeddings import DeterministicHashEmbeddingFunction
     return DeterministicHashEmbeddingFunction()
+
+
+@pytest.fixture
+def ftcscout_stub(monkeypatch):
+    """Every `FTCScoutClient` built during the test (including the node
+    loop's, which `ftcscout.run_sync` uses) talks to an in-process
+    `FTCScoutStub`, never the network. See tests/support/ftcscout.py."""
+    import ftcscout
+    from tests.support.ftcscout import FTCScoutStub
+
+    stub = FTCScoutStub()
+    monkeypatch.setattr(httpx.AsyncClient, "send", _REAL_ASYNC_SEND)
+    monkeypatch.setattr(
+        ftcscout, "FTCScoutClient",
+        functools.partial(ftcscout.FTCScoutClient, transport=httpx.MockTransport(stub)),
+    )
+    monkeypatch.setattr(ftcscout, "_clients", ftcscout.weakref.WeakKeyDictionary())
+    monkeypatch.setattr(ftcscout, "_backoff_seconds", lambda attempt, retry_after=None: 0)
+    return stub
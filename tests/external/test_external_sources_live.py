@@ -4,6 +4,8 @@ marker, no GOOGLE_API_KEY is required: Chief Delphi and the YouTube search
 need no auth at all (Reddit does -- its live test self-skips without
 REDDIT_CLIENT_ID/SECRET, same as the node does at runtime).
 """
+import asyncio
+
 import pytest
 
 import config
@@ -28,6 +30,11 @@ def test_chief_delphi_search_handles_no_hits_gracefully():
     assert isinstance(results, list)
 
 
+def test_chief_delphi_async_search_matches_the_sync_one():
+    term = "FTC DECODE strategy"
+    assert asyncio.run(discourse.asearch(term, limit=5)) == discourse.search(term, limit=5)
+
+
 def test_youtube_find_video_ids_returns_real_ids():
     ids = youtube.find_video_ids("FTC DECODE robot reveal", max_results=2)
 
@@ -53,3 +60,14 @@ def test_reddit_search_returns_real_results():
     assert isinstance(results, list)
     for entry in results:
         assert entry["url"].startswith("https://reddit.com/r/FTC/")
+
+
+@pytest.mark.skipif(not config.ENABLE_REDDIT, reason="REDDIT_CLIENT_ID/SECRET not configured")
+def test_reddit_async_search_returns_real_results():
+    from tools import reddit
+
+    results = asyncio.run(reddit.asearch_ftc("robot reveal", limit=5))
+
+    assert isinstance(results, list)
+    for entry in results:
+        assert entry["url"].startswith("https://reddit.com/r/FTC/")
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import Mock
+
+import chromadb
+import pytest
+
+import ftcscout
+import payload_store
+from data_retrieval import PAYLOAD_SCHEMA_VERSION
+from ingest import Checkpoint, ingest
+from vectordb import VectorDBManager, build_where
+
+
+@pytest.fixture
+def manager(tmp_path, hash_ef):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    return VectorDBManager(client=client, embedding_function=hash_ef)
+
+
+def _run(targets, manager, **kwargs):
+    async def runner():
+        async with ftcscout.FTCScoutClient() as client:
+            return await ingest(targets, manager, client=client, report=lambda line: None, **kwargs)
+    return asyncio.run(runner())
+
+
+def _count(manager, team, season):
+    return len(manager.collection.get(where=build_where(team=team, season=season))["ids"])
+
+
+def test_fetches_misses_in_batches_and_writes_every_team(ftcscout_stub, manager, payload_14469_2022,
+                                                         payload_112_2022):
+    ftcscout_stub.respond({"t0": payload_14469_2022, "t1": payload_112_2022})
+
+    stats = _run([(14469, 2022, "All"), (112, 2022, "All")], manager, fetch_batch_size=10)
+
+    assert len(ftcscout_stub.calls) == 1
+    assert stats.teams == 2 and stats.fetched == 2 and stats.missing == []
+    assert stats.chunks == _count(manager, 14469, 2022) + _count(manager, 112, 2022) > 0
+
+
+def test_stored_payloads_skip_the_network(ftcscout_stub, manager, payload_14469_2022):
+    payload_store.get_store().put(14469, 2022, "All", PAYLOAD_SCHEMA_VERSION, payload_14469_2022)
+
+    stats = _run([(14469, 2022, "All")], manager)
+
+    assert ftcscout_stub.calls == []
+    assert stats.fetched == 0 and _count(manager, 14469, 2022) > 0
+
+
+def test_embeds_across_teams_in_configured_batches(ftcscout_stub, manager, payload_14469_2022, payload_112_2022,
+                                                   monkeypatch):
+    ftcscout_stub.respond({"t0": payload_14469_2022, "t1": payload_112_2022})
+    batch_sizes = []
+    real_ef = manager.ef
+    monkeypatch.setattr(manager, "ef", lambda input: batch_sizes.append(len(input)) or real_ef(input))
+
+    _run([(14469, 2022, "All"), (112, 2022, "All")], manager, embed_batch_size=16)
+
+    assert batch_sizes and max(batch_sizes) <= 16
+    assert sum(batch_sizes) == manager.collection.count()
+
+
+def test_checkpoint_resumes_and_skips_finished_targets(tmp_path, ftcscout_stub, manager, payload_14469_2022,
+                                                       payload_112_2022):
+    checkpoint = Checkpoint(tmp_path / "reindex.checkpoint")
+    ftcscout_stub.respond({"t0": payload_14469_2022})
+    _run([(14469, 2022, "All")], manager, checkpoint=checkpoint)
+
+    ftcscout_stub.calls.clear()
+    ftcscout_stub.respond({"t0": payload_112_2022})
+    stats = _run([(14469, 2022, "All"), (112, 2022, "All")], manager,
+                 checkpoint=Checkpoint(tmp_path / "reindex.checkpoint"), refetch=True)
+
+    assert stats.skipped == 1 and stats.teams == 1
+    assert [call["variables"]["n0"] for call in ftcscout_stub.calls] == [112]
+    assert Checkpoint(tmp_path / "reindex.checkpoint").done == {(14469, 2022, "All"), (112, 2022, "All")}
+
+
+def test_missing_payloads_are_reported_and_not_checkpointed(tmp_path, ftcscout_stub, manager):
+    ftcscout_stub.respond({"t0": None})
+    checkpoint = Checkpoint(tmp_path / "reindex.checkpoint")
+
+    stats = _run([(99999, 2022, "All")], manager, checkpoint=checkpoint)
+
+    assert stats.missing == [(99999, 2022, "All")]
+    assert checkpoint.done == set()
+
+
+def test_checkpoint_from_another_run_is_ignored_and_replaced(tmp_path):
+    path = tmp_path / "reindex.checkpoint"
+    Checkpoint(path, run="first").mark([(14469, 2022, "All")])
+
+    assert Checkpoint(path, run="first").done == {(14469, 2022, "All")}
+    other = Checkpoint(path, run="second")
+    assert other.done == set()
+    other.mark([(112, 2022, "All")])
+    assert Checkpoint(path, run="second").done == {(112, 2022, "All")}
+    assert Checkpoint(path, run="first").done == set()
+
+
+def test_write_failure_stops_the_run(ftcscout_stub, manager, payload_14469_2022, monkeypatch):
+    ftcscout_stub.respond({"t0": payload_14469_2022})
+    monkeypatch.setattr(manager.collection, "upsert", Mock(side_effect=ValueError("bad batch")))
+
+    with pytest.raises(ValueError, match="bad batch"):
+        _run([(14469, 2022, "All")], manager)
@@ -0,0 +1,110 @@
+import copy
+import json
+from unittest.mock import Mock
+
+import chromadb
+import pytest
+
+import config
+import freshness
+import seasons
+from manifest import FreshnessManifest
+from vectordb import VectorDBManager, build_where
+
+
+@pytest.fixture
+def client(tmp_path):
+    return chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+
+
+@pytest.fixture
+def manager(client, hash_ef):
+    return VectorDBManager(client=client, embedding_function=hash_ef)
+
+
+def _stored_count(manager, team, season):
+    return len(manager.collection.get(where=build_where(team=team, season=season))["ids"])
+
+
+def test_upsert_records_chunk_count_and_fetch_time(manager, payload_14469_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+
+    entry = manager.manifest.get(14469, 2022)
+    assert entry.chunk_count == _stored_count(manager, 14469, 2022)
+    stored = manager.collection.get(where=build_where(team=14469, season=2022), limit=1, include=["metadatas"])
+    assert entry.fetched_at == stored["metadatas"][0]["fetched_at"]
+
+
+def test_is_team_in_db_does_not_query_chroma(manager, payload_14469_2022, monkeypatch):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    monkeypatch.setattr(manager.collection, "get", Mock(side_effect=AssertionError("queried Chroma")))
+
+    assert manager.is_team_in_db(14469, 2022) is True
+    assert manager.is_team_in_db(14469, 2025) is False
+    assert manager.manifest.stats()["hits"] == 1 and manager.manifest.stats()["misses"] == 1
+
+
+def test_shrinking_payload_updates_count_and_hash(manager, payload_14469_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    before = manager.manifest.get(14469, 2022)
+
+    shrunk = copy.deepcopy(payload_14469_2022)
+    shrunk["matches"] = shrunk["matches"][:5]
+    manager.upsert_team_data(shrunk, season=2022, region="All")
+
+    after = manager.manifest.get(14469, 2022)
+    assert after.chunk_count == _stored_count(manager, 14469, 2022) < before.chunk_count
+    assert after.content_hash != before.content_hash
+
+
+def test_unchanged_reupsert_keeps_content_hash(manager, payload_14469_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    before = manager.manifest.get(14469, 2022).content_hash
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    assert manager.manifest.get(14469, 2022).content_hash == before
+
+
+def test_manifest_is_rebuilt_from_an_existing_collection(client, hash_ef, manager, payload_14469_2022, payload_112_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    manager.upsert_team_data(payload_112_2022, season=2022, region="All")
+
+    reopened = VectorDBManager(client=client, embedding_function=hash_ef)
+    assert reopened.is_team_in_db(14469, 2022) and reopened.is_team_in_db(112, 2022)
+    assert reopened.manifest.get(112, 2022) == manager.manifest.get(112, 2022)
+
+
+def test_sidecar_is_written_and_reused(tmp_path, client, hash_ef, payload_14469_2022):
+    path = tmp_path / "manifest.json"
+    VectorDBManager(client=client, embedding_function=hash_ef, manifest_path=path).upsert_team_data(
+        payload_14469_2022, season=2022, region="All",
+    )
+    saved = json.loads(path.read_text())
+    assert {(e["team"], e["season"]) for e in saved["entries"]} >= {(14469, 2022)}
+
+    collection = client.get_collection(config.CHROMA_COLLECTION, embedding_function=hash_ef)
+    reloaded = FreshnessManifest(Mock(wraps=collection), path)
+    reloaded._collection.get.assert_not_called()
+    assert reloaded.get(14469, 2022).chunk_count == len(collection.get(where=build_where(team=14469, season=2022))["ids"])
+
+
+def test_out_of_date_sidecar_is_rebuilt(tmp_path, client, hash_ef, payload_14469_2022):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"version": 1, "entries": []}))
+
+    manager = VectorDBManager(client=client, embedding_function=hash_ef, manifest_path=path)
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    # Simulate a sidecar left behind by an older run.
+    path.write_text(json.dumps({"version": 1, "entries": []}))
+
+    reopened = VectorDBManager(client=client, embedding_function=hash_ef, manifest_path=path)
+    assert reopened.is_team_in_db(14469, 2022)
+
+
+def test_stale_keys_lists_expired_current_season_slices(manager, payload_14469_2025, payload_14469_2022):
+    manager.upsert_team_data(payload_14469_2025, season=seasons.CURRENT_SEASON, region="All")
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    policy = freshness.FlatTTLPolicy(ttl_hours=1)
+    fetched_at = manager.manifest.get(14469, seasons.CURRENT_SEASON).fetched_at
+
+    assert manager.manifest.stale_keys(policy, now=fetched_at + 60) == []
+    assert manager.manifest.stale_keys(policy, now=fetched_at + 2 * 3600) == [(14469, seasons.CURRENT_SEASON)]
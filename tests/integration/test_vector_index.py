@@ -0,0 +1,215 @@
+import chromadb
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+import config
+from processor import CHUNK_TYPES
+import vector_index
+from nodes import chroma_node
+from vectordb import VectorDBManager, build_where
+
+
+@pytest.fixture
+def manager(tmp_path, hash_ef):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    return VectorDBManager(client=client, embedding_function=hash_ef)
+
+
+@pytest.fixture
+def loaded(manager, payload_14469_2022, payload_112_2022, payload_14469_2025):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    manager.upsert_team_data(payload_112_2022, season=2022, region="All")
+    manager.upsert_team_data(payload_14469_2025, season=2025, region="All")
+    return manager
+
+
+def _brute_force_scores(collection, ids, query):
+    stored = collection.get(ids=ids, include=["embeddings"])
+    by_id = dict(zip(stored["ids"], np.asarray(stored["embeddings"], dtype=np.float32)))
+    return [float(by_id[i] @ query / np.linalg.norm(by_id[i])) for i in ids]
+
+
+def test_search_is_scoped_to_requested_teams_and_season(loaded, hash_ef):
+    index = vector_index.VectorIndex(loaded.collection, max_slices=8)
+    docs = index.search(hash_ef.embed_query("highest score"), [14469, 112], 2022, k=1000)
+
+    expected = loaded.collection.get(where={"$and": [{"team": {"$in": [14469, 112]}}, {"season": 2022}]})
+    assert sorted(d.id for d in docs) == sorted(expected["ids"])
+    assert {(d.metadata["team"], d.metadata["season"]) for d in docs} == {(14469, 2022), (112, 2022)}
+
+
+def test_search_is_exact_top_k_by_cosine(loaded, hash_ef):
+    index = vector_index.VectorIndex(loaded.collection, max_slices=8)
+    query = np.asarray(hash_ef.embed_query("qualification match red alliance score"), dtype=np.float32)
+
+    top = index.search(query, [14469], 2022, k=5)
+    everything = index.search(query, [14469], 2022, k=1000)
+
+    scores = _brute_force_scores(loaded.collection, [d.id for d in everything], query)
+    assert scores == sorted(scores, reverse=True)
+    assert [d.id for d in top] == [d.id for d in everything[:5]]
+
+
+def test_search_matches_chroma_filtered_query(loaded, hash_ef):
+    index = vector_index.VectorIndex(loaded.collection, max_slices=8)
+    question = "What awards did the team win?"
+    query = hash_ef.embed_query(question)
+
+    ours = index.search(query, [14469], 2022, k=10)
+    theirs = loaded.collection.query(
+        query_embeddings=[query], n_results=10, where=build_where(team=14469, season=2022),
+    )
+    # Ties in the hash embeddings can order equal-distance chunks either way.
+    assert _brute_force_scores(loaded.collection, [d.id for d in ours], np.asarray(query)) == pytest.approx(
+        _brute_force_scores(loaded.collection, theirs["ids"][0], np.asarray(query)), abs=1e-5,
+    )
+
+
+def test_unknown_team_or_zero_k_returns_nothing(loaded, hash_ef):
+    index = vector_index.VectorIndex(loaded.collection, max_slices=8)
+    assert index.search(hash_ef.embed_query("x"), [99999], 2022, k=5) == []
+    assert index.search(hash_ef.embed_query("x"), [14469], 2022, k=0) == []
+
+
+def test_slices_are_evicted_least_recently_used(loaded, hash_ef):
+    index = vector_index.VectorIndex(loaded.collection, max_slices=2)
+    query = hash_ef.embed_query("score")
+    index.search(query, [14469], 2022, k=1)
+    index.search(query, [112], 2022, k=1)
+    index.search(query, [14469], 2022, k=1)  # 14469/2022 is now most recent
+    index.search(query, [14469], 2025, k=1)
+
+    assert len(index) == 2
+    assert index._slices.keys() == {(14469, 2022), (14469, 2025)}
+
+
+def test_writes_invalidate_the_written_slice(monkeypatch, manager, hash_ef, payload_14469_2022):
+    index = vector_index.VectorIndex(manager.collection, max_slices=8)
+    monkeypatch.setattr(vector_index, "invalidate", index.invalidate)
+    query = hash_ef.embed_query("score")
+
+    assert index.search(query, [14469], 2022, k=5) == []  # empty slice cached
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+
+    assert len(index.search(query, [14469], 2022, k=5)) == 5
+
+
+def test_load_racing_a_write_is_not_cached(manager, hash_ef):
+    index = vector_index.VectorIndex(manager.collection, max_slices=8)
+    real_load = index._slices._load
+
+    def load_then_write(key):
+        result = real_load(key)
+        index.invalidate([key])  # a write lands while we were reading
+        return result
+
+    index._slices._load = load_then_write
+    index.search(hash_ef.embed_query("score"), [14469], 2022, k=5)
+    assert len(index) == 0
+
+
+def test_memory_backend_serves_scoped_retrieval(monkeypatch, loaded, hash_ef):
+    index = vector_index.VectorIndex(loaded.collection, max_slices=8)
+    monkeypatch.setattr(config, "RETRIEVAL_BACKEND", "memory")
+    monkeypatch.setattr(vector_index, "get_index", lambda: index)
+    monkeypatch.setattr(vector_index.clients, "get_embeddings", lambda: hash_ef)
+
+    retriever = chroma_node.get_retriever([14469], 2022, k=7)
+    docs = retriever.invoke("highest score")
+
+    assert isinstance(retriever.ranked, vector_index.IndexRetriever)
+    assert len(docs) == 7
+    assert all(d.metadata["team"] == 14469 and d.metadata["season"] == 2022 for d in docs)
+
+
+def test_memory_backend_leaves_unscoped_retrieval_on_chroma(monkeypatch):
+    monkeypatch.setattr(config, "RETRIEVAL_BACKEND", "memory")
+    sentinel = object()
+
+    class _FakeStore:
+        def as_retriever(self, search_kwargs):
+            assert search_kwargs == {"k": config.RETRIEVAL_K}
+            return sentinel
+
+    monkeypatch.setattr(chroma_node, "get_vector_store", lambda: _FakeStore())
+    assert chroma_node.get_retriever(None, None) is sentinel
+
+
+class _MustNotRank:
+    def invoke(self, query, config=None):
+        raise AssertionError("ranked search ran although k covered the whole slice")
+
+
+def test_k_covering_the_slice_skips_ranking(loaded):
+    counts = vector_index.SliceCounts(loaded.collection)
+    total = counts.count((14469, 112), 2022)
+    retriever = vector_index.SliceRetriever(
+        slices=counts, ranked=_MustNotRank(), team_nums=(14469, 112), season=2022, k=total,
+    )
+    docs = retriever.invoke("highest score")
+
+    expected = loaded.collection.get(where={"$and": [{"team": {"$in": [14469, 112]}}, {"season": 2022}]})
+    assert sorted(d.id for d in docs) == sorted(expected["ids"])
+    # Team by team in the order asked, then by chunk type.
+    keys = [((14469, 112).index(d.metadata["team"]), CHUNK_TYPES.index(d.metadata["type"])) for d in docs]
+    assert keys == sorted(keys)
+
+
+def test_both_backends_return_the_same_unranked_slice(loaded):
+    counts = vector_index.SliceCounts(loaded.collection)
+    index = vector_index.VectorIndex(loaded.collection, max_slices=8)
+    assert counts.count([14469], 2022) == index.count([14469], 2022)
+    assert [d.id for d in counts.documents([14469], 2022)] == [d.id for d in index.documents([14469], 2022)]
+
+
+def test_k_below_the_slice_still_ranks(loaded, hash_ef):
+    counts = vector_index.SliceCounts(loaded.collection)
+    index = vector_index.VectorIndex(loaded.collection, max_slices=8)
+    ranked = vector_index.IndexRetriever(index=index, embeddings=hash_ef, team_nums=(14469,), season=2022, k=3)
+    retriever = vector_index.SliceRetriever(slices=counts, ranked=ranked, team_nums=(14469,), season=2022, k=3)
+
+    assert [d.id for d in retriever.invoke("highest score")] == [d.id for d in ranked.invoke("highest score")]
+
+
+def test_writes_invalidate_slice_counts(monkeypatch, manager, payload_14469_2022):
+    counts = vector_index.SliceCounts(manager.collection)
+    monkeypatch.setattr(vector_index, "invalidate", counts.invalidate)
+
+    assert counts.count([14469], 2022) == 0
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    assert counts.count([14469], 2022) == len(manager.collection.get(where=build_where(team=14469, season=2022))["ids"])
+
+
+# --- shared match layout: slices expand match references ---
+
+@pytest.fixture
+def shared(tmp_path, hash_ef, payload_14469_2022):
+    client = chromadb.PersistentClient(path=str(tmp_path / "shared"))
+    manager = VectorDBManager(client=client, embedding_function=hash_ef, shared_matches=True)
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    return manager
+
+
+def test_slices_include_the_matches_a_team_references(shared):
+    counts = vector_index.SliceCounts(shared.collection)
+    index = vector_index.VectorIndex(shared.collection, max_slices=8)
+
+    assert counts.count([14469], 2022) == index.count([14469], 2022) == shared.collection.count()
+    docs = counts.documents([14469], 2022)
+    assert [d.id for d in docs] == [d.id for d in index.documents([14469], 2022)]
+    match_docs = [d for d in docs if d.metadata["type"] == "match_alliance"]
+    assert len(match_docs) == 29
+    assert all(d.metadata["team"] == 14469 and d.page_content.startswith("[Team 14469] ") for d in match_docs)
+
+
+def test_chroma_ranked_results_are_expanded_with_referenced_matches(shared):
+    counts = vector_index.SliceCounts(shared.collection)
+    schedule = shared.collection.get(ids=["14469|2022|schedule|USILCMP"], include=["documents", "metadatas"])
+    doc = Document(page_content=schedule["documents"][0], metadata=schedule["metadatas"][0], id=schedule["ids"][0])
+
+    expanded = counts.expand([doc])
+
+    assert expanded[0] is doc
+    assert [d.metadata["match"] for d in expanded[1:]] == ["Q-7", "Q-13", "Q-27", "Q-35", "Q-41", "SF1-1", "F-1"]
+
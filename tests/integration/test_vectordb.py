@@ -1,10 +1,16 @@
-from unittest.mock import Mock
+import asyncio
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock
 
 import chromadb
 import pytest
 
+import answer_cache
 import seasons
-from vectordb import VectorDBManager, SchemaMismatchError, build_where
+from vectordb import VectorDBManager, SchemaMismatchError, build_where, _ChromaWriter, _TeamWrite
 
 
 @pytest.fixture
@@ -89,6 +95,46 @@ def test_reupsert_smaller_payload_removes_stale_chunks(manager, payload_14469_20
     assert manager.collection.count() < full_count
 
 
+def _count_embeddings(manager, monkeypatch):
+    embedded = []
+    real_ef = manager.ef
+
+    def counting_ef(input):
+        embedded.extend(input)
+        return real_ef(input)
+
+    monkeypatch.setattr(manager, "ef", counting_ef)
+    return embedded
+
+
+def test_reupsert_unchanged_payload_embeds_nothing_but_refreshes_metadata(manager, payload_14469_2022, monkeypatch):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    first_fetch = manager.collection.get(limit=1, include=["metadatas"])["metadatas"][0]["fetched_at"]
+    embedded = _count_embeddings(manager, monkeypatch)
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 60)
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+
+    assert embedded == []
+    metas = manager.collection.get(include=["metadatas"])["metadatas"]
+    assert all(m["fetched_at"] > first_fetch for m in metas)
+
+
+def test_reupsert_after_new_match_embeds_only_changed_chunks(manager, payload_14469_2022, monkeypatch):
+    import copy
+    earlier = copy.deepcopy(payload_14469_2022)
+    earlier["matches"] = earlier["matches"][:-3]
+    manager.upsert_team_data(earlier, season=2022, region="All")
+    embedded = _count_embeddings(manager, monkeypatch)
+
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+
+    # Just the newly played matches' chunks, not the whole 40-chunk payload.
+    assert 1 <= len(embedded) <= 5
+    assert manager.collection.count() == 40
+
+
 def test_get_or_load_team_fetches_once_then_caches(manager, payload_14469_2022):
     fetch_fn = Mock(return_value=payload_14469_2022)
     manager.get_or_load_team(14469, fetch_fn, season=2022, region="All")
@@ -101,10 +147,162 @@ def test_get_or_load_team_returns_false_when_fetch_returns_none(manager):
     assert manager.get_or_load_team(14469, fetch_fn, season=2022, region="All") is False
 
 
+def test_get_or_load_teams_batches_only_cache_misses(manager, payload_14469_2022, payload_112_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    batch_fn = Mock(return_value={112: payload_112_2022, 99999: None})
+
+    loaded = manager.get_or_load_teams([14469, 112, 99999], batch_fn, season=2022, region="All")
+
+    batch_fn.assert_called_once_with(team_numbers=[112, 99999], season=2022, region="All")
+    assert loaded == {14469: True, 112: True, 99999: False}
+    assert manager.is_team_in_db(112, 2022) is True
+
+
+def test_get_or_load_teams_all_cached_skips_fetch(manager, payload_14469_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    batch_fn = Mock()
+    assert manager.get_or_load_teams([14469], batch_fn, season=2022, region="All") == {14469: True}
+    batch_fn.assert_not_called()
+
+
+def test_aget_or_load_teams_awaits_batch_fetch_for_misses(manager, payload_14469_2022, payload_112_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    batch_fn = AsyncMock(return_value={112: payload_112_2022})
+
+    loaded = asyncio.run(manager.aget_or_load_teams([112, 14469], batch_fn, season=2022, region="All"))
+
+    batch_fn.assert_awaited_once_with(team_numbers=[112], season=2022, region="All")
+    assert loaded == {112: True, 14469: True}
+
+
+def test_concurrent_loads_of_same_team_share_one_fetch(manager, payload_14469_2022):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_fetch(team_number, season, region):
+        calls.append(team_number)
+        started.set()
+        release.wait(5)
+        return payload_14469_2022
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(manager.get_or_load_team, 14469, slow_fetch, 2022, "All") for _ in range(4)]
+        started.wait(5)
+        release.set()
+        assert [f.result() for f in futures] == [True] * 4
+
+    assert calls == [14469]
+
+
+def test_in_flight_load_does_not_block_other_teams(manager, payload_14469_2022, payload_112_2022):
+    release = threading.Event()
+
+    def blocked_fetch(team_number, season, region):
+        release.wait(5)
+        return payload_14469_2022
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        blocked = pool.submit(manager.get_or_load_team, 14469, blocked_fetch, 2022, "All")
+        other = manager.get_or_load_team(112, Mock(return_value=payload_112_2022), season=2022, region="All")
+        assert other is True and not blocked.done()
+        release.set()
+        assert blocked.result() is True
+
+
+def test_aget_or_load_teams_coalesces_concurrent_callers(manager, payload_14469_2022, payload_112_2022):
+    fetched = []
+
+    async def batch_fn(team_numbers, season, region):
+        fetched.append(list(team_numbers))
+        await asyncio.sleep(0.05)
+        return {14469: payload_14469_2022, 112: payload_112_2022}
+
+    async def main():
+        return await asyncio.gather(
+            manager.aget_or_load_teams([14469], batch_fn, season=2022, region="All"),
+            manager.aget_or_load_teams([14469, 112], batch_fn, season=2022, region="All"),
+            manager.aget_or_load_teams([14469], batch_fn, season=2022, region="All"),
+        )
+
+    results = asyncio.run(main())
+
+    assert results == [{14469: True}, {14469: True, 112: True}, {14469: True}]
+    assert sorted(n for call in fetched for n in call) == [112, 14469]
+
+
+def test_failed_load_propagates_to_waiters_and_clears_registry(manager, payload_14469_2022):
+    with pytest.raises(RuntimeError):
+        manager.get_or_load_team(14469, Mock(side_effect=RuntimeError("boom")), season=2022, region="All")
+    # The failed flight is gone, so the next caller loads afresh.
+    assert manager.get_or_load_team(14469, Mock(return_value=payload_14469_2022), season=2022, region="All")
+
+
+def test_writer_batches_queued_teams_into_one_upsert(manager, payload_14469_2022, payload_112_2022, monkeypatch):
+    real_upsert = manager.collection.upsert
+    upserts = []
+    first_write_entered, release_first_write = threading.Event(), threading.Event()
+
+    def recording_upsert(**kwargs):
+        upserts.append(sorted({m["team"] for m in kwargs["metadatas"]}))
+        first_write_entered.set()
+        release_first_write.wait(5)
+        return real_upsert(**kwargs)
+
+    monkeypatch.setattr(manager.collection, "upsert", recording_upsert)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        first = pool.submit(manager.upsert_team_data, payload_14469_2022, 2022, "All")
+        first_write_entered.wait(5)
+        # The writer is busy with the first write; these two queue up behind it.
+        queued = [pool.submit(manager.upsert_team_data, payload, 2023, "All")
+                  for payload in (payload_14469_2022, payload_112_2022)]
+        deadline = time.monotonic() + 5
+        while manager._writer._queue.qsize() < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release_first_write.set()
+        assert first.result() and all(f.result() for f in queued)
+
+    assert upserts == [[14469], [112, 14469]]
+    assert manager.is_team_in_db(112, 2023) and manager.is_team_in_db(14469, 2023)
+
+
+def test_writer_keeps_every_collection_call_within_max_batch_size():
+    calls = []
+    collection = Mock()
+    collection.delete.side_effect = lambda ids: calls.append(("delete", len(ids)))
+    collection.upsert.side_effect = lambda ids, documents, metadatas, embeddings: calls.append(
+        ("upsert", len(ids), len(documents), len(metadatas), len(embeddings)))
+    collection.update.side_effect = lambda ids, metadatas: calls.append(("update", len(ids), len(metadatas)))
+
+    def team_write(team, deleted, changed, unchanged):
+        return _TeamWrite(
+            key=(team, 2022),
+            delete_ids=[f"{team}-old-{i}" for i in range(deleted)],
+            ids=[f"{team}-{i}" for i in range(changed)],
+            documents=["doc"] * changed, metadatas=[{"team": team}] * changed, embeddings=[[0.0]] * changed,
+            refresh_ids=[f"{team}-same-{i}" for i in range(unchanged)],
+            refresh_metadatas=[{"team": team}] * unchanged,
+        )
+
+    writes = [team_write(1, 1, 2, 1), team_write(2, 2, 3, 1), team_write(3, 3, 12, 5), team_write(4, 0, 1, 0)]
+    _ChromaWriter(collection, max_batch_size=5).submit_many(writes)
+
+    assert calls and all(n <= 5 for call in calls for n in call[1:])
+    totals = {op: sum(call[1] for call in calls if call[0] == op) for op in ("delete", "upsert", "update")}
+    assert totals == {"delete": 6, "upsert": 18, "update": 7}
+
+
+def test_upsert_surfaces_writer_errors(manager, payload_14469_2022, monkeypatch):
+    monkeypatch.setattr(manager.collection, "upsert", Mock(side_effect=ValueError("bad batch")))
+    with pytest.raises(ValueError, match="bad batch"):
+        manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+
+
 def test_current_season_cache_expires_after_ttl(manager, payload_14469_2025, monkeypatch):
     import config
     import time
 
+    monkeypatch.setattr(config, "FRESHNESS_POLICY", "flat")
     monkeypatch.setattr(config, "CACHE_TTL_HOURS", 1)
     manager.upsert_team_data(payload_14469_2025, season=seasons.CURRENT_SEASON, region="All")
     assert manager.is_team_in_db(14469, seasons.CURRENT_SEASON) is True
@@ -114,6 +312,24 @@ def test_current_season_cache_expires_after_ttl(manager, payload_14469_2025, mon
     assert manager.is_team_in_db(14469, seasons.CURRENT_SEASON) is False
 
 
+def test_upsert_stamps_event_calendar_and_uses_injected_policy(tmp_path, hash_ef, payload_9295_2025):
+    class NeverFresh:
+        def is_fresh(self, record, season, now=None):
+            self.record = record
+            return False
+
+    policy = NeverFresh()
+    manager = VectorDBManager(
+        client=chromadb.PersistentClient(path=str(tmp_path / "chroma")), embedding_function=hash_ef,
+        freshness_policy=policy,
+    )
+    manager.upsert_team_data(payload_9295_2025, season=seasons.CURRENT_SEASON, region="All")
+
+    assert manager.is_team_in_db(9295, seasons.CURRENT_SEASON) is False
+    assert policy.record["last_event_end"] == "2026-01-18"
+    assert "fetched_at" in policy.record
+
+
 def test_all_metadata_values_are_chroma_scalars(manager, payload_14469_2022):
     manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
     results = manager.collection.get(include=["metadatas"])
@@ -128,3 +344,102 @@ def test_schema_mismatch_raises(tmp_path, hash_ef):
     client.create_collection(name="ftc_team_data", embedding_function=hash_ef, metadata={"schema_version": 1})
     with pytest.raises(SchemaMismatchError):
         VectorDBManager(client=client, embedding_function=hash_ef)
+
+
+def test_match_layout_is_part_of_the_schema(tmp_path, hash_ef):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    VectorDBManager(client=client, embedding_function=hash_ef)
+    with pytest.raises(SchemaMismatchError):
+        VectorDBManager(client=client, embedding_function=hash_ef, shared_matches=True)
+
+
+def test_shared_matches_are_embedded_once_across_partners(tmp_path, hash_ef, payload_14469_2022):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    manager = VectorDBManager(client=client, embedding_function=hash_ef, shared_matches=True)
+    partner = {**copy.deepcopy(payload_14469_2022), "number": 21333}
+    embedded = []
+    manager.ef = lambda input: embedded.extend(input) or hash_ef(input)
+
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    first = len(embedded)
+    manager.upsert_team_data(partner, season=2022, region="All")
+
+    shared = len(manager.collection.get(where={"type": "match_alliance"})["ids"])
+    assert shared == 29
+    assert len(embedded) - first == first - shared  # the partner embeds only its own chunks
+    assert manager.collection.count() == 2 * first - shared
+    assert manager.is_team_in_db(21333, 2022)
+
+
+def _alliance_ids(manager):
+    return set(manager.collection.get(where={"type": "match_alliance"})["ids"])
+
+
+def test_shared_matches_are_collected_once_no_team_references_them(tmp_path, hash_ef, payload_14469_2022):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    manager = VectorDBManager(client=client, embedding_function=hash_ef, shared_matches=True)
+    partner = {**copy.deepcopy(payload_14469_2022), "number": 21333}
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    manager.upsert_team_data(partner, season=2022, region="All")
+    before = _alliance_ids(manager)
+
+    dropped_event = payload_14469_2022["matches"][0]["eventCode"]
+    fewer = [m for m in payload_14469_2022["matches"] if m["eventCode"] != dropped_event]
+    manager.upsert_team_data({**payload_14469_2022, "matches": fewer}, season=2022, region="All")
+    assert _alliance_ids(manager) == before  # the partner still plays them
+
+    manager.upsert_team_data({**partner, "matches": fewer}, season=2022, region="All")
+    after = _alliance_ids(manager)
+    assert after and after < before
+    assert all(f"|{dropped_event}|" in ref for ref in before - after)
+
+
+def test_a_write_prepared_before_a_collection_gets_its_shared_match_back(tmp_path, hash_ef, payload_14469_2022):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    manager = VectorDBManager(client=client, embedding_function=hash_ef, shared_matches=True)
+    partner = {**copy.deepcopy(payload_14469_2022), "number": 21333}
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    before = _alliance_ids(manager)
+
+    # The partner diffs against the stored chunks first, so it skips them...
+    pending = manager._prepare_write(partner, 2022, "All")
+    manager._embed([pending])
+    assert set(pending.shared_ids) == before
+    # ...then the only team referencing them drops its matches.
+    manager.upsert_team_data({**payload_14469_2022, "matches": []}, season=2022, region="All")
+    assert not _alliance_ids(manager)
+
+    manager._writer.submit(pending)
+    assert _alliance_ids(manager) == before
+
+
+def test_cached_embedding_function_works_as_collection_ef(tmp_path, hash_ef, payload_14469_2022):
+    from embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+
+    ef = CachedEmbeddingFunction(hash_ef, EmbeddingCache(tmp_path / "emb", "hash", max_bytes=1024 * 1024))
+    path = str(tmp_path / "chroma")
+    VectorDBManager(client=chromadb.PersistentClient(path=path), embedding_function=ef).upsert_team_data(
+        payload_14469_2022, season=2022, region="All",
+    )
+
+    reopened = VectorDBManager(client=chromadb.PersistentClient(path=path), embedding_function=ef)
+    assert len(ef.cache) == reopened.collection.count() == 40
+    assert reopened.collection.query(query_texts=["auto points"], n_results=1)["ids"][0]
+
+
+def test_data_version_follows_the_manifest(manager, payload_14469_2022):
+    assert manager.data_version([14469], 2022) == ((14469, None, None),)
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    entry = manager.manifest.get(14469, 2022)
+    assert manager.data_version([14469, 14469], 2022) == ((14469, entry.fetched_at, entry.content_hash),)
+
+
+def test_upsert_invalidates_cached_answers_for_the_team(manager, payload_14469_2022):
+    cache = answer_cache.get_cache()
+    cache.put("about-14469", "answer", [(14469, 2022)])
+    cache.put("about-112", "answer", [(112, 2022)])
+
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+
+    assert cache.get("about-14469") is None
+    assert cache.get("about-112") == "answer"
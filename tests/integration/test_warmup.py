@@ -0,0 +1,98 @@
+import asyncio
+
+import chromadb
+import pytest
+
+import ftcscout
+import warmup
+from data_retrieval import fetch_event_teams
+from tests.support.ftcscout import event_handler
+from vectordb import VectorDBManager
+
+
+@pytest.fixture
+def manager(tmp_path, hash_ef):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    return VectorDBManager(client=client, embedding_function=hash_ef)
+
+
+def _warm(manager, **kwargs):
+    async def runner():
+        async with ftcscout.FTCScoutClient() as client:
+            return await warmup.warm_up(manager, client=client, report=lambda line: None, **kwargs)
+    return asyncio.run(runner())
+
+
+def test_fetch_event_teams_sends_event_code(ftcscout_stub):
+    ftcscout_stub.handler = event_handler({}, roster=[21333, 14469, 14469])
+
+    assert fetch_event_teams("USILCMP", 2022) == [14469, 21333]
+    assert ftcscout_stub.calls[0]["variables"] == {"season": 2022, "code": "USILCMP"}
+
+
+def test_warm_up_loads_every_team_at_the_event(ftcscout_stub, manager, payload_14469_2022, payload_112_2022):
+    ftcscout_stub.handler = event_handler({14469: payload_14469_2022, 112: payload_112_2022})
+
+    result = _warm(manager, season=2022, event_code="USILCMP")
+
+    assert result.teams == [112, 14469]
+    assert result.stats.teams == 2 and result.already_fresh == 0
+    assert manager.is_team_in_db(14469, 2022) and manager.is_team_in_db(112, 2022)
+    # The event's team seasons (which is also the roster check), then its scores: no per-team requests.
+    assert [c["query"].split("(")[0].split()[-1] for c in ftcscout_stub.calls] == [
+        "GetEventTeamSeasons", "GetEventScores",
+    ]
+
+
+def test_event_warm_up_writes_the_same_chunks_as_per_team_loads(ftcscout_stub, tmp_path, hash_ef, manager,
+                                                                payload_14469_2022):
+    per_team = VectorDBManager(client=chromadb.PersistentClient(path=str(tmp_path / "per-team")),
+                               embedding_function=hash_ef)
+    per_team.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    ftcscout_stub.handler = event_handler({14469: payload_14469_2022})
+
+    _warm(manager, season=2022, event_code="USILCMP")
+
+    ours = manager.collection.get(include=["documents"])
+    theirs = per_team.collection.get(include=["documents"])
+    assert dict(zip(ours["ids"], ours["documents"])) == dict(zip(theirs["ids"], theirs["documents"]))
+
+
+def test_warm_up_skips_teams_already_cached(ftcscout_stub, manager, payload_14469_2022, payload_112_2022):
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="All")
+    manager.upsert_team_data(payload_112_2022, season=2022, region="All")
+    ftcscout_stub.handler = event_handler({14469: payload_14469_2022, 112: payload_112_2022})
+
+    result = _warm(manager, season=2022, event_code="USILCMP")
+
+    assert result.already_fresh == 2 and result.stats.teams == 0
+    assert len(ftcscout_stub.calls) == 1  # just the roster
+
+
+def test_region_warm_up_skips_teams_already_cached(ftcscout_stub, manager, monkeypatch, payload_14469_2022,
+                                                   payload_112_2022):
+    monkeypatch.setattr(warmup.data_retrieval, "get_cached_teams_by_region",
+                        lambda region: {"Technophobia": 14469, "Team 112": 112})
+    manager.upsert_team_data(payload_14469_2022, season=2022, region="USIL")
+    ftcscout_stub.handler = event_handler({112: payload_112_2022})
+
+    result = _warm(manager, season=2022, region="USIL")
+
+    assert result.already_fresh == 1 and result.stats.teams == 1
+    assert [c["variables"]["n0"] for c in ftcscout_stub.calls] == [112]
+
+
+def test_unknown_event_raises(ftcscout_stub, manager):
+    ftcscout_stub.handler = event_handler({}, roster=[])
+    with pytest.raises(warmup.WarmupError):
+        _warm(manager, season=2022, event_code="NOPE")
+
+
+def test_warm_up_by_region_uses_the_team_index(ftcscout_stub, manager, monkeypatch, payload_112_2022):
+    monkeypatch.setattr(warmup.data_retrieval, "get_cached_teams_by_region", lambda region: {"Team 112": 112})
+    ftcscout_stub.handler = event_handler({112: payload_112_2022})
+
+    result = _warm(manager, season=2022, region="USIL")
+
+    assert result.source == "region USIL" and result.teams == [112]
+    assert manager.is_team_in_db(112, 2022)
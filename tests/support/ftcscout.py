@@ -0,0 +1,77 @@
+"""An in-process stand-in for the FTCScout GraphQL endpoint.
+
+`ftcscout.FTCScoutClient` talks to FTCScout through `httpx.AsyncClient`,
+which the root conftest's `_block_network` guard refuses to let send.
+`FTCScoutStub` is an `httpx.MockTransport` handler instead: the
+`ftcscout_stub` fixture builds every `FTCScoutClient` on top of it, so the
+real client code -- pooling, semaphore, retry -- runs end to end without a
+socket ever being opened.
+
+Each request's decoded JSON body is appended to `calls`. `respond(data)`
+answers every request with `{"data": data}`; for anything else (status
+codes, per-call sequences, transport errors) set `handler` to a callable
+taking the decoded body and returning an `httpx.Response` or raising.
+"""
+import copy
+import json
+
+import httpx
+
+
+class FTCScoutStub:
+    def __init__(self):
+        self.calls = []
+        self.handler = lambda body: httpx.Response(200, json={"data": None})
+
+    def respond(self, data) -> None:
+        self.handler = lambda body: httpx.Response(200, json={"data": data})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.calls.append(body)
+        return self.handler(body)
+
+
+def _without_scores(payload):
+    payload = copy.deepcopy(payload)
+    for entry in payload.get("matches") or []:
+        (entry.get("match") or {}).pop("scores", None)
+    return payload
+
+
+def event_handler(payloads: dict, roster=None):
+    """A `handler` serving one event's queries from whole team payloads
+    (`{team_number: payload}`): the roster (`GetEventTeams`), each team's
+    season without match scores (`GetEventTeamSeasons`) and every event's
+    match scores (`GetEventScores`), the last derived from the payloads' own
+    match entries. `roster` defaults to every team in `payloads`; an empty
+    roster stands for an event FTCScout doesn't know.
+    Batched team queries (`GetTeamsBatch`) are answered from `payloads` too."""
+    roster = list(payloads) if roster is None else roster
+    scores = {}
+    for payload in payloads.values():
+        for entry in payload.get("matches") or []:
+            scores.setdefault(entry["eventCode"], {})[entry["matchId"]] = (entry.get("match") or {}).get("scores")
+
+    def handler(body):
+        query, variables = body["query"], body["variables"] or {}
+        if "GetEventTeamSeasons" in query or "GetEventTeams" in query:
+            if not roster:
+                return httpx.Response(200, json={"data": {"eventByCode": None}})
+            full = "GetEventTeamSeasons" in query
+            teams = [
+                {"teamNumber": n, **({"team": _without_scores(payloads[n]) if n in payloads else None} if full else {})}
+                for n in roster
+            ]
+            return httpx.Response(200, json={"data": {"eventByCode": {"teams": teams}}})
+        if "GetEventScores" in query:
+            data = {}
+            for key, code in variables.items():
+                if key.startswith("c"):
+                    matches = [{"id": i, "scores": s} for i, s in scores.get(code, {}).items()]
+                    data[f"e{key[1:]}"] = {"code": code, "matches": matches}
+            return httpx.Response(200, json={"data": data})
+        numbers = {key: n for key, n in variables.items() if key.startswith("n")}
+        return httpx.Response(200, json={"data": {f"t{key[1:]}": payloads.get(n) for key, n in numbers.items()}})
+
+    return handler
@@ -0,0 +1,139 @@
+from unittest.mock import Mock
+
+import pytest
+
+import answer_cache
+import chain
+import config
+import rag_chain
+from answer_cache import AnswerCache, answer_key, normalize_question
+from nodes.base import NodeResult
+
+_VERSION = ((14469, 1700000000.0, "abc"),)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnswerCache(tmp_path / "answers.sqlite3", max_entries=3, ttl_seconds=3600)
+
+
+def _key(question="How many matches did 14469 win?", teams=(14469,), sources=("stats", "chroma"),
+         version=_VERSION):
+    return answer_key(question, teams, 2022, "All", sources, version)
+
+
+def test_normalize_question_folds_case_whitespace_and_trailing_punctuation():
+    assert normalize_question("  How many   matches did 14469 WIN?? ") == "how many matches did 14469 win"
+
+
+def test_key_ignores_question_formatting_and_team_and_source_order():
+    assert _key("how many matches did 14469 win") == _key("How many matches did 14469  win?")
+    assert _key(teams=(112, 14469)) == _key(teams=(14469, 112))
+    assert _key(sources=("chroma", "stats")) == _key(sources=("stats", "chroma"))
+
+
+def test_key_changes_with_route_and_data_version():
+    assert _key(sources=("stats", "chroma", "reddit")) != _key()
+    assert _key(version=((14469, 1700000001.0, "abc"),)) != _key()
+    assert _key(version=((14469, 1700000000.0, "def"),)) != _key()
+
+
+def test_put_then_get(cache):
+    cache.put("k", "answer", [(14469, 2022)])
+    assert cache.get("k") == "answer"
+    assert cache.get("other") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_the_ttl(cache):
+    cache.put("k", "answer", [(14469, 2022)], now=1000.0)
+    assert cache.get("k", now=1000.0 + 3599) == "answer"
+    assert cache.get("k", now=1000.0 + 3601) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted_past_max_entries(cache):
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, key, [(14469, 2022)], now=1000.0 + i)
+    cache.get("a", now=1010.0)
+    cache.put("d", "d", [(14469, 2022)], now=1011.0)
+
+    assert cache.get("b", now=1012.0) is None
+    assert [cache.get(k, now=1012.0) for k in ("a", "c", "d")] == ["a", "c", "d"]
+
+
+def test_invalidate_drops_answers_built_from_the_slice(tmp_path):
+    cache = AnswerCache(tmp_path / "answers.sqlite3", max_entries=10, ttl_seconds=3600)
+    cache.put("one", "x", [(14469, 2022)])
+    cache.put("both", "y", [(14469, 2022), (112, 2022)])
+    cache.put("other", "z", [(112, 2022)])
+    cache.put("other-season", "w", [(14469, 2025)])
+
+    assert cache.invalidate([(14469, 2022)]) == 2
+
+    assert cache.get("one") is None and cache.get("both") is None
+    assert cache.get("other") == "z" and cache.get("other-season") == "w"
+
+
+def test_entries_survive_a_restart(tmp_path):
+    AnswerCache(tmp_path / "answers.sqlite3", 10, 3600).put("k", "answer", [(14469, 2022)])
+    assert AnswerCache(tmp_path / "answers.sqlite3", 10, 3600).get("k") == "answer"
+
+
+def test_chain_answer_serves_a_repeat_from_the_cache(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_LLM_ROUTER", False)
+    monkeypatch.setattr(config, "ENABLE_TEMPLATED_ANSWERS", False)
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    monkeypatch.setattr(chain, "stats_node", lambda state: NodeResult(source="stats", status="ok", text="Facts."))
+    monkeypatch.setattr(chain, "chroma_node", lambda state: NodeResult(source="chroma", status="empty"))
+    mock_ask_bot = Mock(return_value="41 wins")
+    monkeypatch.setattr(rag_chain, "ask_bot", mock_ask_bot)
+
+    def ask(question, version=_VERSION):
+        return chain.answer(question, team_nums=[14469], season=2022, region="All", data_version=version)
+
+    assert ask("How many matches did 14469 win?") == "41 wins"
+    assert ask("how many matches did 14469 win") == "41 wins"
+    assert mock_ask_bot.call_count == 1
+
+    ask("How many matches did 14469 win?", version=((14469, 1700000500.0, "new"),))
+    assert mock_ask_bot.call_count == 2
+
+
+def test_chain_answer_skips_the_cache_without_a_data_version(monkeypatch):
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    mock_ask_bot = Mock(return_value="41 wins")
+    monkeypatch.setattr(rag_chain, "ask_bot", mock_ask_bot)
+
+    for _ in range(2):
+        chain.answer("How many matches did 14469 win?", team_nums=[14469], season=2022, region="All", sources=())
+
+    assert mock_ask_bot.call_count == 2
+    assert len(answer_cache.get_cache()) == 0
+
+
+def test_a_streamed_answer_is_cached_whole(monkeypatch):
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    monkeypatch.setattr(rag_chain, "stream_ask_bot", Mock(return_value=iter(["41 ", "wins"])))
+    mock_ask_bot = Mock()
+    monkeypatch.setattr(rag_chain, "ask_bot", mock_ask_bot)
+
+    kwargs = {"team_nums": [14469], "season": 2022, "region": "All", "sources": (), "data_version": _VERSION}
+    assert list(chain.stream_answer("How many matches did 14469 win?", **kwargs)) == ["41 ", "wins"]
+
+    assert list(chain.stream_answer("How many matches did 14469 win?", **kwargs)) == ["41 wins"]
+    assert chain.answer("How many matches did 14469 win?", **kwargs) == "41 wins"
+    mock_ask_bot.assert_not_called()
+
+
+def test_a_cache_hit_skips_routing_and_retrieval(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_TEMPLATED_ANSWERS", False)
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    monkeypatch.setattr(rag_chain, "ask_bot", Mock(return_value="41 wins"))
+    kwargs = {"team_nums": [14469], "season": 2022, "region": "All", "data_version": _VERSION}
+    chain.answer("How many matches did 14469 win?", **kwargs)
+
+    monkeypatch.setattr(chain, "route", Mock(side_effect=AssertionError("routed")))
+    monkeypatch.setattr(chain._Pipeline, "start", Mock(side_effect=AssertionError("retrieval started")))
+    assert chain.answer("How many matches did 14469 win?", **kwargs) == "41 wins"
+    assert list(chain.stream_answer("how many matches did 14469 win", **kwargs)) == ["41 wins"]
@@ -1,4 +1,11 @@
-from bot import _NO_MENTIONS, _format_reply, _chunk_message
+import asyncio
+import threading
+import time
+
+import pytest
+
+import config
+from bot import _NO_MENTIONS, _StreamedReply, _chunk_message, _format_reply, _iterate_in_thread
 
 
 def test_format_reply_single_team():
@@ -45,3 +52,101 @@ def test_no_mentions_suppresses_everyone_and_roles_and_users():
     assert _NO_MENTIONS.everyone is False
     assert _NO_MENTIONS.users is False
     assert _NO_MENTIONS.roles is False
+
+
+class _FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+    async def edit(self, content, allowed_mentions):
+        self.content = content
+
+
+class _FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content, wait, allowed_mentions):
+        self.messages.append(_FakeMessage(content))
+        return self.messages[-1]
+
+
+class _FakeInteraction:
+    def __init__(self):
+        self.original = None
+        self.original_edits = 0
+        self.followup = _FakeFollowup()
+
+    async def edit_original_response(self, content, allowed_mentions):
+        self.original = content
+        self.original_edits += 1
+
+
+def test_streamed_reply_edits_the_original_response_then_rolls_over():
+    interaction = _FakeInteraction()
+
+    async def run():
+        reply = _StreamedReply(interaction, "Answer: ", interval=0)
+        for _ in range(60):
+            await reply.add("word " * 10)
+        await reply.flush()
+
+    asyncio.run(run())
+
+    shown = [interaction.original] + [m.content for m in interaction.followup.messages]
+    assert len(shown) > 1 and all(len(c) <= config.DISCORD_MESSAGE_LIMIT for c in shown)
+    assert " ".join(shown).split() == ("Answer: " + "word " * 600).split()
+
+
+def test_streamed_reply_shows_the_first_piece_then_waits_out_the_interval():
+    interaction = _FakeInteraction()
+
+    async def run():
+        reply = _StreamedReply(interaction, "Answer: ", interval=3600)
+        await reply.add("They ")
+        await reply.add("won 19.")
+        assert interaction.original == "Answer: They "
+        await reply.flush()
+
+    asyncio.run(run())
+
+    assert interaction.original == "Answer: They won 19." and interaction.original_edits == 2
+
+
+def test_iterate_in_thread_yields_items_and_reraises():
+    def gen(fail):
+        yield 1
+        yield 2
+        if fail:
+            raise ValueError("boom")
+
+    async def collect(fail):
+        return [item async for item in _iterate_in_thread(gen, fail)]
+
+    assert asyncio.run(collect(False)) == [1, 2]
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(collect(True))
+
+
+def test_iterate_in_thread_stops_the_worker_when_the_consumer_stops():
+    pulled, closed = [], threading.Event()
+
+    def gen():
+        try:
+            for i in range(1000):
+                pulled.append(i)
+                time.sleep(0.001)
+                yield i
+        finally:
+            closed.set()
+
+    async def first_two():
+        items = []
+        async for item in _iterate_in_thread(gen):
+            items.append(item)
+            if len(items) == 2:
+                raise RuntimeError("consumer failed")
+
+    with pytest.raises(RuntimeError, match="consumer failed"):
+        asyncio.run(first_two())
+    assert closed.wait(5) and len(pulled) < 1000
@@ -1,3 +1,5 @@
+import asyncio
+
 import config
 from nodes.base import PipelineState
 from nodes.chief_delphi_node import _cache, chief_delphi_node
@@ -10,18 +12,24 @@ def _clear_cache():
     _cache._store.clear()
 
 
+def _async(search):
+    async def asearch(*args, **kwargs):
+        return search(*args, **kwargs)
+    return asearch
+
+
 def test_disabled_returns_disabled_status(monkeypatch):
     monkeypatch.setattr(config, "ENABLE_CHIEF_DELPHI", False)
-    result = chief_delphi_node(STATE)
+    result = asyncio.run(chief_delphi_node(STATE))
     assert result.status == "disabled"
 
 
 def test_enabled_no_hits_returns_empty(monkeypatch):
     _clear_cache()
     monkeypatch.setattr(config, "ENABLE_CHIEF_DELPHI", True)
-    monkeypatch.setattr(discourse, "search",lambda term, **k: [])
+    monkeypatch.setattr(discourse, "asearch", _async(lambda term, **k: []))
 
-    result = chief_delphi_node(STATE)
+    result = asyncio.run(chief_delphi_node(STATE))
     assert result.status == "empty"
     assert result.text == ""
 
@@ -36,9 +44,9 @@ def test_enabled_with_hits_renders_text_and_citations(monkeypatch):
             "url": "https://www.chiefdelphi.com/t/x/1/1", "username": "Zakk_J", "created_at": "2025-09-08",
         }]
 
-    monkeypatch.setattr(discourse, "search",fake_search)
+    monkeypatch.setattr(discourse, "asearch", _async(fake_search))
 
-    result = chief_delphi_node(STATE)
+    result = asyncio.run(chief_delphi_node(STATE))
     assert result.status == "ok"
     assert "FTC Decode Base Strategy" in result.text
     assert "Zakk_J" in result.text
@@ -52,9 +60,9 @@ def test_discourse_exception_becomes_error_status_not_a_crash(monkeypatch):
     def broken_search(term, **kwargs):
         raise ConnectionError("simulated network failure")
 
-    monkeypatch.setattr(discourse, "search",broken_search)
+    monkeypatch.setattr(discourse, "asearch", _async(broken_search))
 
-    result = chief_delphi_node(STATE)  # must not raise
+    result = asyncio.run(chief_delphi_node(STATE))  # must not raise
     assert result.status == "error"
     assert "simulated network failure" in result.detail
 
@@ -67,12 +75,12 @@ def test_dedupes_across_multiple_search_terms(monkeypatch):
         "title": "Same Topic", "blurb": "text", "url": "https://www.chiefdelphi.com/t/x/1/1",
         "username": "u", "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(discourse, "search",lambda term, **k: [same_post])
+    monkeypatch.setattr(discourse, "asearch", _async(lambda term, **k: [same_post]))
 
     state = PipelineState(
         question="x", team_nums=(14469,), season=2022, region="All", team_names=("Owlbotics",),
     )
-    result = chief_delphi_node(state)
+    result = asyncio.run(chief_delphi_node(state))
     assert result.text.count("Same Topic") == 1
 
 
@@ -88,9 +96,9 @@ def test_second_call_uses_cache_not_a_second_search(monkeypatch):
             "username": "u", "created_at": "2025-01-01",
         }]
 
-    monkeypatch.setattr(discourse, "search",counting_search)
+    monkeypatch.setattr(discourse, "asearch", _async(counting_search))
 
-    chief_delphi_node(STATE)
-    chief_delphi_node(STATE)
+    asyncio.run(chief_delphi_node(STATE))
+    asyncio.run(chief_delphi_node(STATE))
 
     assert len(calls) == 1
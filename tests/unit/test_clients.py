@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
+import clients
+import config
+
+
+class _FakeModel:
+    """Stands in for the sentence-transformer: records calls, returns fixed-size vectors."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[float(len(t)), 1.0, 0.0] for t in texts], dtype=np.float32)
+
+    def parameters(self):
+        return []
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = _FakeModel()
+    monkeypatch.setattr(config, "ENABLE_EMBEDDING_CACHE", False)
+    monkeypatch.setattr(SentenceTransformerEmbeddingFunction, "models", {})
+    monkeypatch.setattr(clients, "get_embedding_model", lambda: model)
+    for factory in (clients.get_embeddings, clients.get_embedding_function):
+        factory.cache_clear()
+    yield model
+    for factory in (clients.get_embeddings, clients.get_embedding_function):
+        factory.cache_clear()
+
+
+def test_ingest_and_query_embedders_share_one_model(fake_model):
+    clients.get_embedding_function()(["doc one"])
+    clients.get_embeddings().embed_query("query")
+
+    assert fake_model.calls == [["doc one"], ["query"]]
+    assert SentenceTransformerEmbeddingFunction.models[config.EMBEDDING_MODEL] is fake_model
+
+
+def test_langchain_adapter_flattens_newlines_like_huggingface_embeddings(fake_model):
+    vector = clients.get_embeddings().embed_query("line one\nline two")
+    assert fake_model.calls == [["line one line two"]]
+    assert vector == [17.0, 1.0, 0.0]
+
+
+def test_cache_is_keyed_on_the_text_each_embedder_actually_encodes(fake_model, monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_EMBEDDING_CACHE", True)
+    ef, embeddings = clients.get_embedding_function(), clients.get_embeddings()
+
+    ef(["line one\nline two"])
+    embeddings.embed_documents(["line one\nline two"])  # encodes the flattened text: a different entry
+    ef(["line one line two"])  # ...which the chroma embedder now reads back
+
+    assert fake_model.calls == [["line one\nline two"], ["line one line two"]]
+
+
+def test_chroma_embedder_keeps_sentence_transformer_config(fake_model):
+    ef = clients.get_embedding_function()
+    assert ef.name() == "sentence_transformer"
+    assert ef.get_config()["model_name"] == config.EMBEDDING_MODEL
+
+
+def test_memory_report_shape():
+    report = clients.memory_report()
+    assert set(report) == {"rss_mb", "embedding_model_mb", "embedding_models_loaded"}
@@ -0,0 +1,232 @@
+import asyncio
+import copy
+import re
+import time
+
+import httpx
+import pytest
+
+import config
+import data_retrieval
+import ftcscout
+import payload_store
+from data_retrieval import build_event_scores_query, build_event_teams_query, build_team_query, build_teams_batch_query
+from processor import process_team_data
+from tests.support.ftcscout import event_handler
+
+_FRAGMENT_DEF_RE = re.compile(r"fragment (\w+) on \w+")
+_FRAGMENT_SPREAD_RE = re.compile(r"\.\.\.(\w+)")
+
+
+def _defined_fragments(query: str) -> set:
+    return set(_FRAGMENT_DEF_RE.findall(query))
+
+
+def _spread_fragments(query: str) -> set:
+    return set(_FRAGMENT_SPREAD_RE.findall(query))
+
+
+def _selected_score_fields(payload) -> set:
+    keys = set()
+    for entry in payload.get("matches", []):
+        scores = (entry.get("match") or {}).get("scores") or {}
+        for alliance in ("red", "blue"):
+            keys |= set((scores.get(alliance) or {}).keys())
+    for event_entry in payload.get("events", []):
+        keys |= set(((event_entry.get("stats") or {}).get("tot") or {}).keys())
+    return keys
+
+
+# --- build_team_query: per-season pruning ---
+
+def test_season_query_only_carries_that_seasons_fragments():
+    query = build_team_query(2022)
+    assert _defined_fragments(query) == {"TeamSeason", "Stats2022", "Score2022"}
+    assert "MatchScores2025" not in query
+    assert "TeamEventStats2019" not in query
+
+
+def test_remote_season_query_carries_trad_and_remote_variants():
+    query = build_team_query(2021)
+    assert _defined_fragments(query) == {"TeamSeason", "Stats2021", "Stats2021R", "Score2021", "Score2021R"}
+    # Remote scores are flat (no red/blue split) -- see team_season._alliance_scores.
+    assert "... on MatchScores2021Remote { ...Score2021R }" in query
+
+
+@pytest.mark.parametrize("season", [2019, 2020, 2021, 2022, 2023, 2024, 2025, 2018, None])
+def test_every_defined_fragment_is_spread_and_vice_versa(season):
+    # GraphQL rejects unused fragment definitions and unknown spreads alike.
+    for query in (build_team_query(season), build_teams_batch_query(season, 3)):
+        assert _defined_fragments(query) == _spread_fragments(query)
+
+
+def test_unknown_season_falls_back_to_full_query():
+    query = build_team_query(2018)
+    assert len(_defined_fragments(query)) == 19
+    assert len(query) > 3 * len(build_team_query(2025))
+
+
+def test_build_team_query_is_memoized_per_season():
+    assert build_team_query(2024) is build_team_query(2024)
+
+
+# --- fixture-backed: the pruned query still covers what processor.py consumes ---
+
+@pytest.mark.parametrize("fixture_name,season", [
+    ("payload_14469_2022", 2022),
+    ("payload_21333_2024", 2024),
+    ("payload_14469_2025", 2025),
+    ("payload_20266_2021_remote", 2021),
+])
+def test_pruned_query_selects_every_field_in_recorded_payload(request, fixture_name, season):
+    payload = request.getfixturevalue(fixture_name)
+    selected = set(re.findall(r"\w+", build_team_query(season)))
+    assert _selected_score_fields(payload) - selected == set()
+
+
+def test_fetch_team_data_sends_pruned_query_and_processes_identically(ftcscout_stub, payload_14469_2022):
+    ftcscout_stub.respond({"teamByNumber": payload_14469_2022})
+
+    raw = data_retrieval.fetch_team_data(14469, season=2022, region="All")
+
+    assert ftcscout_stub.calls[0]["query"] == build_team_query(2022)
+    assert ftcscout_stub.calls[0]["variables"]["season"] == 2022
+    assert process_team_data(raw, season=2022, region="All") == process_team_data(
+        payload_14469_2022, season=2022, region="All",
+    )
+
+
+# --- batched multi-team fetch ---
+
+def test_batch_query_aliases_one_team_by_number_per_team():
+    query = build_teams_batch_query(2025, 3)
+    for i in range(3):
+        assert f"t{i}: teamByNumber(number: $n{i})" in query
+    assert "$n3" not in query
+    assert _defined_fragments(query) == {"TeamSeason", "Stats2025", "Score2025"}
+
+
+def test_fetch_teams_data_one_request_for_all_teams(ftcscout_stub, payload_9295_2025, payload_9930_2025_sparse):
+    ftcscout_stub.respond({"t0": payload_9295_2025, "t1": None, "t2": payload_9930_2025_sparse})
+
+    results = data_retrieval.fetch_teams_data([9295, 99999, 9930], season=2025, region="All")
+
+    assert len(ftcscout_stub.calls) == 1
+    assert ftcscout_stub.calls[0]["variables"]["n0"] == 9295
+    assert ftcscout_stub.calls[0]["variables"]["n2"] == 9930
+    assert results[9295]["number"] == 9295
+    assert results[99999] is None
+    assert results[9930]["number"] == 9930
+
+
+def test_fetch_teams_data_dedupes_and_handles_empty(ftcscout_stub):
+    ftcscout_stub.respond({"t0": None})
+    assert data_retrieval.fetch_teams_data([], season=2025) == {}
+    assert data_retrieval.fetch_teams_data([1, 1], season=2025) == {1: None}
+
+
+def test_fetch_teams_data_connection_error_returns_none_for_every_team(ftcscout_stub):
+    def broken(body):
+        raise httpx.ConnectError("FTCScout is down")
+
+    ftcscout_stub.handler = broken
+    assert data_retrieval.fetch_teams_data([1, 2], season=2025) == {1: None, 2: None}
+
+
+def test_afetch_teams_data_on_shared_client(ftcscout_stub, payload_9295_2025):
+    ftcscout_stub.respond({"t0": payload_9295_2025})
+
+    async def main():
+        try:
+            return await data_retrieval.afetch_teams_data([9295], season=2025)
+        finally:
+            await ftcscout.close_client()
+
+    assert asyncio.run(main())[9295]["number"] == 9295
+
+
+
+# --- event fetch: roster + season data, then each match score once ---
+
+def _partner_of(payload, number):
+    """`payload` re-numbered: a second team that played the same matches."""
+    return {**copy.deepcopy(payload), "number": number}
+
+
+def test_event_queries_define_every_spread_fragment():
+    teams = build_event_teams_query(2022)
+    scores = build_event_scores_query(2022, 2)
+    assert _defined_fragments(teams) == _spread_fragments(teams)
+    assert _defined_fragments(scores) == _spread_fragments(scores)
+    assert not any(name.startswith("Score") for name in _defined_fragments(teams))
+    assert "e1: eventByCode(season: $season, code: $c1)" in scores
+
+
+def test_fetch_event_data_matches_per_team_payloads_in_two_requests(ftcscout_stub, payload_14469_2022):
+    partner = _partner_of(payload_14469_2022, 21333)
+    ftcscout_stub.handler = event_handler({14469: payload_14469_2022, 21333: partner})
+
+    results = data_retrieval.fetch_event_data("USILCMP", season=2022, region="All")
+
+    assert results == {14469: payload_14469_2022, 21333: partner}
+    assert len(ftcscout_stub.calls) == 2
+    # Both teams' entries for a match point at the same score object.
+    ours, theirs = results[14469]["matches"][0]["match"], results[21333]["matches"][0]["match"]
+    assert ours["scores"] is theirs["scores"]
+    assert data_retrieval.get_stored_team_data(21333, season=2022, region="All") == partner
+
+
+def test_fetch_event_data_unknown_event_returns_none(ftcscout_stub):
+    ftcscout_stub.handler = event_handler({}, roster=[])
+    assert data_retrieval.fetch_event_data("NOPE", season=2022) is None
+
+
+# --- raw-payload store: write-through on fetch, read-through on load ---
+
+def test_fetch_writes_through_to_payload_store(ftcscout_stub, payload_14469_2022):
+    ftcscout_stub.respond({"t0": payload_14469_2022})
+    data_retrieval.fetch_teams_data([14469], season=2022, region="All")
+
+    assert data_retrieval.get_stored_team_data(14469, season=2022, region="All") == payload_14469_2022
+
+
+def test_event_filtered_fetch_is_not_stored(ftcscout_stub, payload_14469_2022):
+    ftcscout_stub.respond({"teamByNumber": payload_14469_2022})
+    data_retrieval.fetch_team_data(14469, season=2022, region="All", event_code="USCAFFFAQ")
+
+    assert data_retrieval.get_stored_team_data(14469, season=2022, region="All") is None
+
+
+def test_load_teams_data_only_fetches_store_misses(ftcscout_stub, payload_14469_2022, payload_112_2022):
+    payload_store.get_store().put(14469, 2022, "All", data_retrieval.PAYLOAD_SCHEMA_VERSION, payload_14469_2022)
+    ftcscout_stub.respond({"t0": payload_112_2022})
+
+    results = data_retrieval.load_teams_data([14469, 112], season=2022, region="All")
+
+    assert results == {14469: payload_14469_2022, 112: payload_112_2022}
+    assert len(ftcscout_stub.calls) == 1
+    assert list(ftcscout_stub.calls[0]["variables"].items())[:1] == [("n0", 112)]
+
+
+def test_load_refetches_stale_current_season_payload(ftcscout_stub, monkeypatch, payload_14469_2025):
+    monkeypatch.setattr(config, "FRESHNESS_POLICY", "flat")
+    monkeypatch.setattr(config, "CACHE_TTL_HOURS", 1)
+    season = data_retrieval.CURRENT_FTC_SEASON
+    payload_store.get_store().put(
+        14469, season, "All", data_retrieval.PAYLOAD_SCHEMA_VERSION, payload_14469_2025,
+        fetched_at=time.time() - 2 * 3600,
+    )
+    ftcscout_stub.respond({"t0": payload_14469_2025})
+
+    assert data_retrieval.load_team_data(14469, season=season, region="All") == payload_14469_2025
+    assert len(ftcscout_stub.calls) == 1
+
+
+def test_aload_teams_data_served_from_store_without_network(payload_14469_2022):
+    payload_store.get_store().put(14469, 2022, "All", data_retrieval.PAYLOAD_SCHEMA_VERSION, payload_14469_2022)
+
+    async def main():
+        # No ftcscout_stub: any network call would trip the offline guard.
+        return await data_retrieval.aload_teams_data([14469], season=2022, region="All")
+
+    assert asyncio.run(main()) == {14469: payload_14469_2022}
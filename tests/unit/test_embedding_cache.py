@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from embedding_cache import CachedEmbeddingFunction, CachedEmbeddings, EmbeddingCache
+
+
+class _CountingEF:
+    """Wraps the deterministic test embedder and records what it was asked to embed."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.seen = []
+
+    def __call__(self, input):
+        self.seen.extend(input)
+        return self.inner(input)
+
+    def embed_documents(self, texts):
+        self.seen.extend(texts)
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, input):
+        return self.inner.embed_query(input)
+
+    def name(self):
+        return "counting"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(tmp_path, "test-model", max_bytes=1024 * 1024)
+
+
+def test_round_trip_and_persistence(tmp_path, cache):
+    cache.put_many(["a", "b"], [np.ones(4), np.arange(4)])
+
+    reopened = EmbeddingCache(tmp_path, "test-model", max_bytes=1024 * 1024)
+    a, missing, b = reopened.get_many(["a", "zzz", "b"])
+
+    assert missing is None
+    np.testing.assert_array_equal(a, np.ones(4, dtype=np.float32))
+    np.testing.assert_array_equal(b, np.arange(4, dtype=np.float32))
+
+
+def test_keyed_by_model(tmp_path, cache):
+    cache.put_many(["a"], [np.ones(4)])
+    assert EmbeddingCache(tmp_path, "other-model", max_bytes=1024 * 1024).get_many(["a"]) == [None]
+
+
+def test_lru_eviction_respects_disk_budget(tmp_path):
+    cache = EmbeddingCache(tmp_path, "m", max_bytes=2 * 4 * 4)  # room for two 4-dim float32 rows
+    cache.put_many(["a"], [np.zeros(4)])
+    cache.put_many(["b"], [np.ones(4)])
+    cache.get_many(["a"])  # "b" is now least recently used
+    cache.put_many(["c"], [np.full(4, 2.0)])
+
+    a, b, c = cache.get_many(["a", "b", "c"])
+    assert b is None and a is not None and c[0] == 2.0
+    assert len(cache) == 2
+    assert (cache.dir / "vectors.bin").stat().st_size <= 2 * 4 * 4
+
+
+def test_float16_storage(tmp_path):
+    cache = EmbeddingCache(tmp_path, "m", max_bytes=1024, dtype="float16")
+    cache.put_many(["a"], [np.array([0.1, 0.2, 0.3])])
+    (a,) = cache.get_many(["a"])
+    assert a.dtype == np.float32
+    np.testing.assert_allclose(a, [0.1, 0.2, 0.3], atol=1e-3)
+
+
+def test_chroma_wrapper_embeds_only_misses(cache, hash_ef):
+    inner = _CountingEF(hash_ef)
+    ef = CachedEmbeddingFunction(inner, cache)
+
+    first = ef(["team 14469 won", "team 112 lost"])
+    second = ef(["team 112 lost", "a new chunk"])
+
+    assert inner.seen == ["team 14469 won", "team 112 lost", "a new chunk"]
+    np.testing.assert_allclose(second[0], first[1])
+    assert ef.name() == "counting"  # delegated, so Chroma sees the wrapped function
+
+
+def test_langchain_wrapper_caches_documents_not_queries(cache, hash_ef):
+    inner = _CountingEF(hash_ef)
+    embeddings = CachedEmbeddings(inner, cache)
+
+    embeddings.embed_documents(["x y z"])
+    vectors = embeddings.embed_documents(["x y z"])
+    embeddings.embed_query("x y z")
+
+    assert inner.seen == ["x y z"]
+    assert vectors[0] == pytest.approx(hash_ef.embed_query("x y z"))
+
+
+def test_cache_errors_fall_back_to_model(cache, hash_ef, monkeypatch):
+    def broken(*args, **kwargs):
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(cache, "get_many", broken)
+    monkeypatch.setattr(cache, "put_many", broken)
+    assert len(CachedEmbeddingFunction(hash_ef, cache)(["a b"])) == 1
@@ -0,0 +1,91 @@
+import datetime
+
+import pytest
+
+import config
+import freshness
+import seasons
+from freshness import EventCalendarPolicy, FlatTTLPolicy, event_calendar
+
+HOUR = 3600
+CURRENT = seasons.CURRENT_SEASON
+
+
+def _ts(iso: str) -> float:
+    """UTC timestamp for an ISO date-time string."""
+    return datetime.datetime.fromisoformat(iso).replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+@pytest.fixture
+def policy():
+    return EventCalendarPolicy(event_ttl_minutes=30, post_event_ttl_hours=6, post_event_days=3, idle_ttl_hours=168)
+
+
+def _record(payload, fetched_iso):
+    fetched_at = _ts(fetched_iso)
+    return {"fetched_at": fetched_at, **event_calendar(payload, fetched_at)}
+
+
+# --- event_calendar: next/last event relative to fetch time ---
+
+def test_event_calendar_between_events(payload_14469_2025):
+    assert event_calendar(payload_14469_2025, _ts("2026-04-01T12:00")) == {
+        "next_event_start": "2026-06-18",
+        "next_event_end": "2026-06-21",
+        "last_event_end": "2026-03-07",
+    }
+
+
+def test_event_calendar_in_progress_event_counts_as_next(payload_14469_2025):
+    calendar = event_calendar(payload_14469_2025, _ts("2026-06-19T15:00"))
+    assert calendar["next_event_start"] == "2026-06-18"
+
+
+def test_event_calendar_omits_missing_sides(payload_9295_2025):
+    assert event_calendar(payload_9295_2025, _ts("2026-05-01T00:00")) == {"last_event_end": "2026-01-18"}
+    assert "last_event_end" not in event_calendar(payload_9295_2025, _ts("2025-12-01T00:00"))
+    assert event_calendar({"events": []}, _ts("2026-05-01T00:00")) == {}
+
+
+# --- EventCalendarPolicy decisions ---
+
+def test_idle_team_cached_for_days(policy, payload_14469_2025):
+    record = _record(payload_14469_2025, "2026-04-01T12:00")
+    assert policy.is_fresh(record, CURRENT, now=_ts("2026-04-05T12:00"))
+    assert not policy.is_fresh(record, CURRENT, now=_ts("2026-04-09T12:00"))
+
+
+def test_event_starting_since_fetch_forces_refresh(policy, payload_14469_2025):
+    record = _record(payload_14469_2025, "2026-06-10T12:00")
+    assert not policy.is_fresh(record, CURRENT, now=_ts("2026-06-17T00:30"))
+
+
+def test_short_ttl_during_event(policy, payload_14469_2025):
+    record = _record(payload_14469_2025, "2026-06-19T15:00")
+    assert policy.is_fresh(record, CURRENT, now=_ts("2026-06-19T15:20"))
+    assert not policy.is_fresh(record, CURRENT, now=_ts("2026-06-19T15:45"))
+
+
+def test_post_event_ttl_then_back_to_idle(policy, payload_9295_2025):
+    just_after = _record(payload_9295_2025, "2026-01-20T10:00")
+    assert policy.ttl_seconds(just_after, _ts("2026-01-20T12:00")) == 6 * HOUR
+    settled = _record(payload_9295_2025, "2026-02-01T10:00")
+    assert policy.ttl_seconds(settled, _ts("2026-02-01T12:00")) == 168 * HOUR
+
+
+def test_past_seasons_always_fresh_and_missing_fetched_at_stale(policy):
+    assert policy.is_fresh({}, CURRENT - 1)
+    assert not policy.is_fresh({}, CURRENT)
+
+
+def test_flat_policy_matches_old_behaviour():
+    policy = FlatTTLPolicy(ttl_hours=24)
+    assert policy.is_fresh({"fetched_at": 0}, CURRENT, now=23 * HOUR)
+    assert not policy.is_fresh({"fetched_at": 0}, CURRENT, now=25 * HOUR)
+
+
+def test_default_policy_follows_config(monkeypatch):
+    monkeypatch.setattr(config, "FRESHNESS_POLICY", "flat")
+    assert isinstance(freshness.default_policy(), FlatTTLPolicy)
+    monkeypatch.setattr(config, "FRESHNESS_POLICY", "calendar")
+    assert isinstance(freshness.default_policy(), EventCalendarPolicy)
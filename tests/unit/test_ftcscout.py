@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+
+import ftcscout
+from ftcscout import FTCScoutClient  # the real class; `ftcscout_stub` patches the module attribute
+
+
+def _run(coro_fn):
+    async def main():
+        async with ftcscout.FTCScoutClient(max_retries=2) as client:
+            return await coro_fn(client)
+    return asyncio.run(main())
+
+
+def _sequence(*responses):
+    """A handler that answers successive requests from `responses`; an
+    exception instance is raised instead of returned."""
+    remaining = list(responses)
+
+    def handler(body):
+        item = remaining.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+    return handler
+
+
+def test_query_returns_decoded_body(ftcscout_stub):
+    ftcscout_stub.respond({"teamByNumber": {"number": 1}})
+    body = _run(lambda c: c.query("query { x }", {"number": 1}))
+    assert body == {"data": {"teamByNumber": {"number": 1}}}
+    assert ftcscout_stub.calls == [{"query": "query { x }", "variables": {"number": 1}}]
+
+
+@pytest.mark.parametrize("transient", [
+    httpx.Response(503),
+    httpx.Response(429, headers={"Retry-After": "1"}),
+    httpx.ReadTimeout("slow"),
+    httpx.ConnectError("refused"),
+])
+def test_transient_failures_are_retried(ftcscout_stub, transient):
+    ftcscout_stub.handler = _sequence(transient, httpx.Response(200, json={"data": {"ok": True}}))
+    assert _run(lambda c: c.query("q")) == {"data": {"ok": True}}
+    assert len(ftcscout_stub.calls) == 2
+
+
+def test_client_errors_are_not_retried(ftcscout_stub):
+    ftcscout_stub.handler = _sequence(httpx.Response(400, text="bad query"))
+    with pytest.raises(ftcscout.FTCScoutError, match="400"):
+        _run(lambda c: c.query("q"))
+    assert len(ftcscout_stub.calls) == 1
+
+
+def test_gives_up_after_max_retries(ftcscout_stub):
+    ftcscout_stub.handler = lambda body: httpx.Response(502)
+    with pytest.raises(ftcscout.FTCScoutError, match="3 attempt"):
+        _run(lambda c: c.query("q"))
+    assert len(ftcscout_stub.calls) == 3
+
+
+def test_semaphore_bounds_in_flight_requests(ftcscout_stub):
+    in_flight = peak = 0
+
+    async def slow_handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"data": {}})
+
+    class _AsyncStub(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            return await slow_handler(request)
+
+    async def main():
+        client = FTCScoutClient(max_concurrency=2, transport=_AsyncStub())
+        async with client:
+            await asyncio.gather(*(client.query("q") for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+
+
+def test_backoff_honours_retry_after_and_caps():
+    assert ftcscout._backoff_seconds(0, retry_after=2.0) == 2.0
+    assert ftcscout._backoff_seconds(0, retry_after=600.0) == ftcscout._BACKOFF_CAP_SECONDS
+    assert all(0 <= ftcscout._backoff_seconds(10) <= ftcscout._BACKOFF_CAP_SECONDS for _ in range(50))
+
+
+def test_semaphore_is_released_during_backoff(ftcscout_stub, monkeypatch):
+    monkeypatch.setattr(ftcscout, "_backoff_seconds", lambda attempt, retry_after=None: 0.05)
+    failed = set()
+
+    def handler(body):
+        if body["query"] == "a" and "a" not in failed:
+            failed.add("a")
+            return httpx.Response(503)
+        return httpx.Response(200, json={"data": {}})
+    ftcscout_stub.handler = handler
+
+    async def main():
+        async with ftcscout.FTCScoutClient(max_concurrency=1) as client:
+            await asyncio.gather(client.query("a"), client.query("b"))
+
+    asyncio.run(main())
+    assert [call["query"] for call in ftcscout_stub.calls] == ["a", "b", "a"]
+
+
+def test_run_sync_reuses_one_client_on_the_node_loop(ftcscout_stub):
+    from nodes.base import node_loop
+
+    ftcscout_stub.respond({})
+    seen = []
+
+    async def fn(*, client):
+        seen.append((client, asyncio.get_running_loop()))
+        return await client.query("q")
+
+    assert ftcscout.run_sync(fn) == {"data": {}}
+    assert ftcscout.run_sync(fn) == {"data": {}}
+    assert seen[0][0] is seen[1][0] and not seen[0][0]._http.is_closed
+    assert seen[0][1] is node_loop()
@@ -0,0 +1,162 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+import chain
+import config
+import lookup
+import rag_chain
+from nodes.base import NodeResult
+from stats import compute_team_season_facts
+
+
+class _FakeVectorStore:
+    def __init__(self, metadatas):
+        self._metadatas = metadatas
+        self.calls = 0
+
+    def get(self, ids, include=None):
+        self.calls += 1
+        return {"ids": ids, "metadatas": self._metadatas}
+
+
+@pytest.fixture
+def facts(payload_14469_2022):
+    return compute_team_season_facts(payload_14469_2022, 2022, "All")
+
+
+@pytest.fixture
+def store(facts):
+    return _FakeVectorStore([{"type": "season_facts", "team": 14469, "facts_json": json.dumps(facts)}])
+
+
+@pytest.mark.parametrize("question, intents", [
+    ("How many matches did 14469 win?", ("wins",)),
+    ("what's 14469's win-loss record", ("record",)),
+    ("What was the highest score for team 14469?", ("high_score",)),
+    ("14469 lowest match score", ("low_score",)),
+    ("What is 14469's average score?", ("average",)),
+    ("What awards has 14469 won?", ("awards",)),
+    ("What is 14469's OPR?", ("opr",)),
+    ("What was 14469 ranked?", ("rank",)),
+    ("What's 14469's record and highest score?", ("record", "high_score")),
+    ("What was team 14469 overall record?", ("record",)),
+])
+def test_classify_recognizes_stats_lookups(question, intents):
+    assert lookup.classify(question) == intents
+
+
+@pytest.mark.parametrize("question", [
+    "Why did 14469 win so many matches?",
+    "What was 14469's highest score at the state championship?",
+    "What's 14469's strategy?",
+    "Is 14469 known for anything?",
+    "How many matches would 14469 win against 9295?",
+    "Tell me about 14469",
+    "What was 14469's highest score in auto?",
+    "What is 14469's average score in endgame?",
+    "How many wins did 14469 have in qualifiers?",
+    "What was 14469's record in eliminations?",
+    "What's the world record 14469 has been close to?",
+    "What was 14469's highest score without penalties?",
+    "Did 14469 ever set a record score?",
+])
+def test_classify_leaves_everything_else_to_the_llm(question):
+    assert lookup.classify(question) == ()
+
+
+@pytest.mark.parametrize("question, intents", [
+    # Team names and words that only contain a disqualifier.
+    ("What was the highest score for team 14469, Atlas?", ("high_score",)),
+    ("What was the highest score for team 14469, Worldwide Robotics?", ("high_score",)),
+    ("What is the average score of 14469 Automatons?", ("average",)),
+    ("How many awards has 14469 won this season?", ("awards",)),
+    ("Has 14469 won any awards at all?", ("awards",)),
+])
+def test_disqualifiers_only_reject_their_phrasings(question, intents):
+    assert lookup.classify(question) == intents
+
+
+@pytest.mark.parametrize("question, reason", [
+    ("What was 14469's highest score during week 2?", "one_event"),
+    ("What was 14469's average score in the last 5 matches?", "part_of_season"),
+    ("What was 14469's highest score in the finals?", "part_of_season"),
+    ("What was 14469's highest score in league meets?", "part_of_season"),
+    ("What's 14469's average score in driver-controlled?", "match_phase"),
+    ("What's 14469's highest score in tele-op?", "match_phase"),
+    ("What was 14469's highest score minus fouls?", "score_component"),
+    ("What is 14469's average score with their alliance?", "not_the_team"),
+    ("Will 14469's average score improve?", "reasoning"),
+])
+def test_disqualifiers_reject_narrower_scopes(question, reason):
+    assert lookup._DISQUALIFIERS[reason].search(question.lower())
+    assert lookup.classify(question) == ()
+
+
+def test_answer_renders_from_stored_facts_with_the_header(store):
+    text = lookup.answer("How many matches did 14469 win?", (14469,), 2022, "All", store)
+
+    assert text.splitlines()[0] == "[Season: Powerplay 2022, Region: All]"
+    assert "Team 14469 (HOW) won 17 matches" in text and "17-8-0" in text
+    assert store.calls == 1
+
+
+def test_answer_uses_exactly_the_facts_numbers(store):
+    text = lookup.answer("What were 14469's highest score and lowest score?", (14469,), 2022, "All", store)
+
+    assert "306 points, in F-1 at IL Peoria Western League Tournament" in text
+    assert "63 points, in Q-8 at IL Peoria Meet 1" in text
+
+
+def test_awards_and_opr_templates(store):
+    awards = lookup.answer("What awards did 14469 win?", (14469,), 2022, "All", store)
+    opr = lookup.answer("What's 14469's OPR rank?", (14469,), 2022, "All", store)
+
+    assert "won 3 awards" in awards and "- Motivate (Placement 2) at Illinois State Championship" in awards
+    assert "season OPR was 127.5 (rank #79)" in opr and "ranked" not in opr.lower().split("opr was")[0]
+
+
+def test_missing_facts_fall_through(facts):
+    no_matches = dict(facts, match_count=0, high_score=None)
+    store = _FakeVectorStore([{"team": 14469, "facts_json": json.dumps(no_matches)}])
+
+    assert lookup.answer("What was 14469's highest score?", (14469,), 2022, "All", store) is None
+    assert lookup.answer("How many matches did 14469 win?", (14469,), 2022, "All", _FakeVectorStore([])) is None
+    assert lookup.answer("How many matches did 14469 play?", (14469,), 2022, "All", store) is None
+
+
+def test_multi_team_and_seasonless_questions_fall_through(store):
+    assert lookup.answer("How many matches did 14469 win?", (14469, 9295), 2022, "All", store) is None
+    assert lookup.answer("How many matches did 14469 win?", (14469,), None, "All", store) is None
+    assert store.calls == 0
+
+
+def test_chain_answers_lookups_without_the_llm(monkeypatch, store):
+    monkeypatch.setattr(chain, "get_vector_store", lambda: store)
+    mock_ask_bot = Mock()
+    monkeypatch.setattr(rag_chain, "ask_bot", mock_ask_bot)
+    monkeypatch.setattr(chain, "route", Mock(side_effect=AssertionError("routed")))
+
+    text = chain.answer("How many matches did 14469 win?", team_nums=[14469], season=2022, region="All")
+    streamed = list(chain.stream_answer("How many matches did 14469 win?", team_nums=[14469], season=2022,
+                                        region="All"))
+
+    assert text.startswith("[Season: Powerplay 2022, Region: All]")
+    assert streamed == [text]
+    mock_ask_bot.assert_not_called()
+
+
+def test_chain_skips_templates_when_disabled_or_sources_are_explicit(monkeypatch, store):
+    monkeypatch.setattr(chain, "get_vector_store", lambda: store)
+    monkeypatch.setattr(rag_chain, "ask_bot", Mock(return_value="from the llm"))
+
+    assert chain.answer("How many matches did 14469 win?", team_nums=[14469], season=2022, region="All",
+                        sources=()) == "from the llm"
+    monkeypatch.setattr(config, "ENABLE_TEMPLATED_ANSWERS", False)
+    monkeypatch.setattr(config, "ENABLE_LLM_ROUTER", False)
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    monkeypatch.setattr(chain, "stats_node", lambda state: NodeResult(source="stats", status="error"))
+    monkeypatch.setattr(chain, "chroma_node", lambda state: NodeResult(source="chroma", status="error"))
+    assert chain.answer("How many matches did 14469 win?", team_nums=[14469], season=2022,
+                        region="All") == "from the llm"
@@ -1,6 +1,7 @@
+import asyncio
 import time
 
-from nodes.base import NodeResult, PipelineState, retrieval_node, run_nodes
+from nodes.base import NodeResult, PipelineState, collect_nodes, retrieval_node, run_nodes, submit_nodes
 
 STATE = PipelineState(question="how good is 14469", team_nums=(14469,), season=2022, region="All")
 
@@ -55,6 +56,16 @@ def test_retrieval_node_never_raises():
     node(STATE)
 
 
+def test_retrieval_node_converts_an_async_nodes_exception_to_error_status():
+    @retrieval_node("reddit")
+    async def node(state):
+        raise ConnectionError("boom")
+
+    result = asyncio.run(node(STATE))
+    assert result.status == "error"
+    assert "boom" in result.detail
+
+
 # --- run_nodes ---
 
 def test_run_nodes_empty_dict_returns_empty():
@@ -114,3 +125,75 @@ def test_run_nodes_isolates_one_nodes_exception_from_others():
 
     assert results["broken"].status == "error"
     assert results["fine"].status == "ok"
+
+
+# --- async nodes: cancelled, not abandoned ---
+
+def _slow_async_node(name, seconds, events):
+    @retrieval_node(name)
+    async def node(state):
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            events.append(f"{name} cancelled")
+            raise
+        return NodeResult(source=name, status="ok", text=f"{name}-done")
+    return node
+
+
+def test_run_nodes_mixes_sync_and_async_nodes():
+    events = []
+
+    def sync_node(state):
+        return NodeResult(source="stats", status="ok", text="stats-done")
+
+    results = run_nodes(
+        {"stats": sync_node, "reddit": _slow_async_node("reddit", 0.05, events)}, STATE,
+        node_timeout=1, total_budget=1,
+    )
+
+    assert results["stats"].text == "stats-done"
+    assert results["reddit"].text == "reddit-done"
+    assert events == []
+
+
+def test_run_nodes_cancels_an_async_node_past_its_timeout():
+    events = []
+
+    start = time.monotonic()
+    results = run_nodes(
+        {"slow": _slow_async_node("slow", 5, events), "quick": _slow_async_node("quick", 0, events)}, STATE,
+        node_timeout=0.2, total_budget=2,
+    )
+
+    assert time.monotonic() - start < 1.0
+    assert results["slow"].status == "timeout"
+    assert results["quick"].status == "ok"
+    # Cancelled inside the node -- not left running after the call returns.
+    assert events == ["slow cancelled"]
+
+
+def test_run_nodes_cancels_async_nodes_still_running_at_the_budget():
+    events = []
+
+    results = run_nodes({"slow": _slow_async_node("slow", 5, events)}, STATE, node_timeout=5, total_budget=0.2)
+
+    assert results["slow"].status == "timeout"
+    assert events == ["slow cancelled"]
+
+
+def test_collect_nodes_cancels_whatever_is_pending_at_the_deadline():
+    events = []
+    futures = submit_nodes(
+        {"slow": _slow_async_node("slow", 5, events), "quick": _slow_async_node("quick", 0, events)}, STATE,
+        node_timeout=5,
+    )
+
+    results = collect_nodes(futures, deadline=time.monotonic() + 0.2)
+
+    assert results["slow"].status == "timeout"
+    assert results["quick"].status == "ok"
+    deadline = time.monotonic() + 1
+    while not events and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert events == ["slow cancelled"]
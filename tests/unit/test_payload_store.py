@@ -0,0 +1,51 @@
+import json
+
+from payload_store import RawPayloadStore
+
+
+def test_round_trip_preserves_payload(tmp_path, payload_14469_2022):
+    store = RawPayloadStore(tmp_path)
+    store.put(14469, 2022, "All", 1, payload_14469_2022, fetched_at=123.0)
+
+    stored = store.get(14469, 2022, "All", 1)
+
+    assert stored.payload == payload_14469_2022
+    assert stored.fetched_at == 123.0
+
+
+def test_blobs_are_compressed_and_content_addressed(tmp_path, payload_14469_2022):
+    store = RawPayloadStore(tmp_path)
+    first = store.put(14469, 2022, "All", 1, payload_14469_2022)
+    again = store.put(14469, 2022, "All", 1, payload_14469_2022)
+
+    blobs = list((tmp_path / "blobs").glob("*/*.json.zst"))
+    assert first == again and len(blobs) == 1
+    assert blobs[0].stat().st_size < len(json.dumps(payload_14469_2022)) / 4
+
+
+def test_key_includes_region_and_schema(tmp_path, payload_14469_2022):
+    store = RawPayloadStore(tmp_path)
+    store.put(14469, 2022, "USCA", 1, payload_14469_2022)
+
+    assert store.get(14469, 2022, "All", 1) is None
+    assert store.get(14469, 2022, "USCA", 2) is None
+    assert store.get(14469, 2023, "USCA", 1) is None
+    assert store.keys(1) == [(14469, 2022, "USCA")]
+    assert store.keys(1, seasons={2025}) == []
+
+
+def test_corrupt_blob_reads_as_missing(tmp_path, payload_14469_2022):
+    store = RawPayloadStore(tmp_path)
+    sha = store.put(14469, 2022, "All", 1, payload_14469_2022)
+    store._blob_path(sha).write_bytes(b"not zstd")
+
+    assert store.get(14469, 2022, "All", 1) is None
+
+
+def test_prune_removes_only_superseded_blobs(tmp_path, payload_14469_2022, payload_112_2022):
+    store = RawPayloadStore(tmp_path)
+    store.put(14469, 2022, "All", 1, payload_112_2022)
+    store.put(14469, 2022, "All", 1, payload_14469_2022)  # refetch replaces the ref
+
+    assert store.prune() == 1
+    assert store.get(14469, 2022, "All", 1).payload == payload_14469_2022
@@ -1,4 +1,9 @@
-from processor import process_team_data
+import copy
+import json
+
+from processor import SHARED_MATCHES_SCHEMA_VERSION, match_refs, process_team_data
+from stats import compute_team_season_facts, render_facts_block
+from team_season import TeamSeason
 from textutils import clean_value, fmt
 
 
@@ -70,6 +75,25 @@ def test_identity_chunk_survives_null_location():
     assert "N/A, N/A, N/A" in docs[0]
 
 
+def test_team_name_renders_as_the_payload_reads(payload_14469_2022):
+    payload_14469_2022["name"] = None
+    docs, _, _ = process_team_data(payload_14469_2022, season=2022, region="All")
+    assert docs[0].startswith("FTC Team 14469 (None). ")
+    assert all("Unknown Name" not in doc for doc in docs)
+
+    assert compute_team_season_facts(payload_14469_2022, 2022)["name"] is None
+
+    del payload_14469_2022["name"]
+    docs, _, _ = process_team_data(payload_14469_2022, season=2022, region="All")
+    assert docs[0].startswith("FTC Team 14469 (Unknown Name). ")
+    assert process_team_data(TeamSeason.from_payload(payload_14469_2022, 2022), season=2022)[0][0] == (
+        process_team_data(payload_14469_2022, season=2022)[0][0]
+    )
+    facts = compute_team_season_facts(payload_14469_2022, 2022)
+    assert facts["name"] is None
+    assert render_facts_block(facts).startswith("Team 14469 (Unknown) - ")
+
+
 def test_stats_chunk(payload_14469_2022):
     docs, metas, ids = process_team_data(payload_14469_2022, season=2022, region="All")
     stats_doc = docs[1]
@@ -208,9 +232,52 @@ def test_every_chunk_carries_team_season_region_type(payload_14469_2022):
         assert isinstance(meta["type"], str)
 
 
+def test_season_facts_chunk_carries_the_facts_dict(payload_14469_2022):
+    _, metas, _ = process_team_data(payload_14469_2022, season=2022, region="All")
+    meta = next(m for m in metas if m["type"] == "season_facts")
+    assert json.loads(meta["facts_json"]) == compute_team_season_facts(payload_14469_2022, 2022, "All")
+
+
 def test_season_facts_chunk_is_present_and_accurate(payload_14469_2022):
     docs, metas, ids = process_team_data(payload_14469_2022, season=2022, region="All")
     facts_doc = next(d for d, m in zip(docs, metas) if m["type"] == "season_facts")
     assert "306 points in F-1" in facts_doc
     assert "Matches played: 29" in facts_doc
     assert ids[-1] == "14469|2022|facts"
+
+
+# --- shared match layout (MATCH_LAYOUT=shared) ---
+
+def test_shared_layout_replaces_per_team_match_chunks(payload_14469_2022):
+    docs, metas, ids = process_team_data(payload_14469_2022, season=2022, region="All", shared_matches=True)
+    types = [m["type"] for m in metas]
+    assert "match_granular" not in types
+    assert types.count("match_alliance") == 29
+    assert types.count("match_schedule") == 5
+    assert {m["schema_version"] for m in metas} == {SHARED_MATCHES_SCHEMA_VERSION}
+
+    shared = {i for i, m in zip(ids, metas) if m["type"] == "match_alliance"}
+    refs = [r for m in metas for r in match_refs(m)]
+    assert sorted(refs) == sorted(shared)
+    assert all("team" not in m for m in metas if m["type"] == "match_alliance")
+
+
+def test_shared_match_chunks_are_identical_across_alliance_partners(payload_14469_2022):
+    partner = {**copy.deepcopy(payload_14469_2022), "number": 21333, "name": "Partner"}
+    ours = process_team_data(payload_14469_2022, season=2022, region="All", shared_matches=True)
+    theirs = process_team_data(partner, season=2022, region="All", shared_matches=True)
+
+    def shared(chunks):
+        return {i: d for d, m, i in zip(*chunks) if m["type"] == "match_alliance"}
+
+    assert shared(ours) == shared(theirs)
+    schedule = next(d for d, m in zip(*theirs[:2]) if m["type"] == "match_schedule" and m["event"] == "USILCMP")
+    assert schedule.startswith("Matches Team 21333 (Partner) played at USILCMP: Q-7 (Red alliance")
+
+
+def test_shared_layout_keeps_remote_matches_per_team(payload_20266_2021_remote):
+    _, metas, _ = process_team_data(payload_20266_2021_remote, season=2021, region="All", shared_matches=True)
+    # CABCNVS3 was a remote event (flat scores); the others were played in person.
+    assert {m["event"] for m in metas if m["type"] == "match_granular"} == {"CABCNVS3"}
+    assert "CABCNVS3" not in {m["event"] for m in metas if m["type"] == "match_alliance"}
+
@@ -15,13 +15,19 @@ prompt text:
    `rag_chain.SYSTEM_PROMPT` verbatim, so rules 1-6 and the VERIFIED
    FACTS/CONTEXT slots are never altered, only appended to.
 """
+import threading
 from unittest.mock import Mock
 
 import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables import RunnableLambda
 
 import chain
 import config
 import rag_chain
+from nodes.base import NodeResult
 
 
 @pytest.fixture(autouse=True)
@@ -29,8 +35,25 @@ def _disable_llm_router(monkeypatch):
     """These tests exercise chain.answer's fallback logic, not routing
     itself (see tests/unit/test_router.py for that) -- disabling the LLM
     path keeps this module fast, deterministic, and (defense in depth on
-    top of conftest._block_network) unable to make a real Gemini call."""
+    top of conftest._block_network) unable to make a real Gemini call.
+    Templated lookups (tests/unit/test_lookup.py) are off for the same
+    reason: these questions must reach the LLM paths under test."""
     monkeypatch.setattr(config, "ENABLE_LLM_ROUTER", False)
+    monkeypatch.setattr(config, "ENABLE_TEMPLATED_ANSWERS", False)
+
+
+@pytest.fixture(autouse=True)
+def _local_nodes(monkeypatch):
+    """chain.answer starts the stats and chroma nodes before routing; keep
+    them off the real Chroma store. Tests below override these as needed."""
+    monkeypatch.setattr(chain, "stats_node", lambda state: NodeResult(source="stats", status="ok", text=FACTS))
+    monkeypatch.setattr(chain, "chroma_node", lambda state: NodeResult(
+        source="chroma", status="ok", text=DOCS[0].page_content, documents=DOCS,
+    ))
+
+
+FACTS = "Team 14469 facts."
+DOCS = (Document(page_content="Match Q-7 details..."),)
 
 
 # --- (1) no-external-sources delegates to the unmodified ask_bot ---
@@ -45,6 +68,7 @@ def test_no_active_external_sources_delegates_to_ask_bot_unchanged(monkeypatch):
     assert result == "the exact original answer"
     mock_ask_bot.assert_called_once_with(
         "How many matches did 14469 win?", team_nums=(14469,), season=2022, region="All", k=None,
+        facts=FACTS, docs=DOCS,
     )
 
 
@@ -54,7 +78,10 @@ def test_explicit_empty_sources_delegates_to_ask_bot_unchanged(monkeypatch):
 
     chain.answer("What was the highest score?", team_nums=[14469], season=2022, region="All", sources=())
 
-    mock_ask_bot.assert_called_once()
+    # Nothing to overlap with, so ask_bot does its own retrieval exactly as before.
+    mock_ask_bot.assert_called_once_with(
+        "What was the highest score?", team_nums=(14469,), season=2022, region="All", k=None,
+    )
 
 
 def test_no_team_nums_still_delegates_and_passes_none_through(monkeypatch):
@@ -66,6 +93,7 @@ def test_no_team_nums_still_delegates_and_passes_none_through(monkeypatch):
 
     mock_ask_bot.assert_called_once_with(
         "What is the meaning of life?", team_nums=None, season=None, region=None, k=None,
+        facts=FACTS, docs=DOCS,
     )
 
 
@@ -237,3 +265,150 @@ def test_fused_path_calls_llm_with_extended_prompt_and_appends_footer(monkeypatc
     assert "Team 14469 likely wins based on OPR." in result
     assert "Sources consulted" in result
     assert "Chief Delphi" in result
+
+
+# --- streaming goes through the same two paths ---
+
+def test_stream_answer_falls_back_to_stream_ask_bot_with_the_same_arguments(monkeypatch):
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    mock_stream = Mock(return_value=iter(["They won ", "19."]))
+    monkeypatch.setattr(rag_chain, "stream_ask_bot", mock_stream)
+
+    pieces = list(chain.stream_answer("How many matches did 14469 win?", team_nums=[14469], season=2022,
+                                      region="All"))
+
+    assert pieces == ["They won ", "19."]
+    mock_stream.assert_called_once_with(
+        "How many matches did 14469 win?", team_nums=(14469,), season=2022, region="All", k=None,
+        facts=FACTS, docs=DOCS,
+    )
+
+
+def test_stream_ask_bot_runs_the_same_chain_as_ask_bot(monkeypatch):
+    built = []
+
+    class FakeChain:
+        def invoke(self, inputs):
+            return {"answer": "whole answer"}
+
+        def stream(self, inputs):
+            yield {"input": inputs["input"]}
+            yield {"context": []}
+            yield {"answer": "whole "}
+            yield {"answer": "answer"}
+
+    def fake_retrieval_chain(*args):
+        built.append(args)
+        return FakeChain()
+
+    monkeypatch.setattr(rag_chain, "_retrieval_chain", fake_retrieval_chain)
+
+    assert rag_chain.ask_bot("q", team_nums=[14469], season=2022, region="All") == "whole answer"
+    assert list(rag_chain.stream_ask_bot("q", team_nums=[14469], season=2022, region="All")) == ["whole ", "answer"]
+    assert built[0] == built[1]
+
+
+def test_stream_answer_synthesized_yields_tokens_then_the_sources_footer(monkeypatch):
+    from nodes.base import NodeResult
+
+    def cd_node(state):
+        return NodeResult(source="chief_delphi", status="ok", text="They run a four-bar linkage.",
+                          citations=("https://www.chiefdelphi.com/t/example/1",))
+
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {"chief_delphi": cd_node})
+    monkeypatch.setattr(chain, "stats_node", lambda state: NodeResult(source="stats", status="ok", text="Facts."))
+    monkeypatch.setattr(chain, "chroma_node", lambda state: NodeResult(source="chroma", status="ok", text="Ctx."))
+
+    class FakeChunk:
+        def __init__(self, content):
+            self.content = content
+
+    class FakeLLM:
+        def stream(self, messages):
+            return iter([FakeChunk("Team 14469 "), FakeChunk(""), FakeChunk("likely wins.")])
+
+    monkeypatch.setattr(chain, "get_llm_with_context", lambda: FakeLLM())
+
+    pieces = list(chain.stream_answer("What's team 14469's strategy?", team_nums=[14469], season=2022,
+                                      region="All", sources=("chief_delphi",)))
+
+    assert pieces[:2] == ["Team 14469 ", "likely wins."]
+    assert len(pieces) == 3 and "Sources consulted" in pieces[2]
+
+
+# --- speculative local retrieval is reused, never changes the prompt ---
+
+class _FixedRetriever(BaseRetriever):
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return list(DOCS)
+
+
+def _capturing_llm(captured):
+    def respond(prompt_value):
+        captured.append(prompt_value.to_messages())
+        return AIMessage(content="answer")
+    return RunnableLambda(respond)
+
+
+def test_ask_bot_with_prefetched_facts_and_docs_sends_the_identical_prompt(monkeypatch):
+    captured = []
+    monkeypatch.setattr(rag_chain, "get_llm", lambda: _capturing_llm(captured))
+    monkeypatch.setattr(rag_chain, "get_vector_store", lambda: None)
+    monkeypatch.setattr(rag_chain, "_facts_block", lambda store, team_nums, season: FACTS)
+    monkeypatch.setattr(rag_chain, "_get_retriever", lambda team_nums, season, k: _FixedRetriever())
+    kwargs = {"team_nums": [14469], "season": 2022, "region": "All"}
+
+    assert rag_chain.ask_bot("How good is 14469?", **kwargs) == "answer"
+    assert rag_chain.ask_bot("How good is 14469?", **kwargs, facts=FACTS, docs=DOCS) == "answer"
+    assert "".join(rag_chain.stream_ask_bot("How good is 14469?", **kwargs, facts=FACTS, docs=DOCS)) == "answer"
+
+    assert len(captured) == 3
+    assert captured[0] == captured[1] == captured[2]
+    assert "Match Q-7 details..." in captured[0][0].content
+
+
+def test_routing_runs_alongside_local_retrieval(monkeypatch):
+    """route() can't finish until the chroma node has started: sequential
+    execution would time out here instead of answering."""
+    retrieval_started = threading.Event()
+
+    def chroma(state):
+        retrieval_started.set()
+        return NodeResult(source="chroma", status="ok", text=DOCS[0].page_content, documents=DOCS)
+
+    def slow_route(state):
+        assert retrieval_started.wait(timeout=2), "local retrieval did not start before routing finished"
+        return Mock(sources=frozenset({"stats", "chroma"}))
+
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    monkeypatch.setattr(chain, "chroma_node", chroma)
+    monkeypatch.setattr(chain, "route", slow_route)
+    mock_ask_bot = Mock(return_value="answer")
+    monkeypatch.setattr(rag_chain, "ask_bot", mock_ask_bot)
+
+    assert chain.answer("How good is 14469?", team_nums=[14469], season=2022, region="All") == "answer"
+    assert mock_ask_bot.call_args.kwargs["docs"] == DOCS
+
+
+def test_failed_local_retrieval_is_redone_by_ask_bot(monkeypatch):
+    monkeypatch.setattr(chain, "EXTERNAL_NODES", {})
+    monkeypatch.setattr(chain, "chroma_node", lambda state: NodeResult(source="chroma", status="error"))
+    mock_ask_bot = Mock(return_value="answer")
+    monkeypatch.setattr(rag_chain, "ask_bot", mock_ask_bot)
+
+    chain.answer("How good is 14469?", team_nums=[14469], season=2022, region="All")
+
+    assert mock_ask_bot.call_args.kwargs == {
+        "team_nums": (14469,), "season": 2022, "region": "All", "k": None, "facts": FACTS,
+    }
+
+
+def test_stats_text_with_a_head_to_head_table_is_not_reused_as_facts():
+    """ask_bot's prompt takes the plain facts block; with a table appended
+    it fetches its own, while an empty retrieval is still reused."""
+    from nodes.stats_node import HEAD_TO_HEAD_MARKER
+
+    assert chain._reusable({
+        "stats": NodeResult(source="stats", status="ok", text=f"{FACTS}\n\n{HEAD_TO_HEAD_MARKER}: ..."),
+        "chroma": NodeResult(source="chroma", status="empty"),
+    }) == {"docs": ()}
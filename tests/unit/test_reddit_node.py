@@ -1,3 +1,5 @@
+import asyncio
+
 import config
 from nodes.base import PipelineState
 from nodes.reddit_node import _cache, reddit_node
@@ -10,18 +12,24 @@ def _clear_cache():
     _cache._store.clear()
 
 
+def _async(search):
+    async def asearch(*args, **kwargs):
+        return search(*args, **kwargs)
+    return asearch
+
+
 def test_disabled_when_no_creds(monkeypatch):
     monkeypatch.setattr(config, "ENABLE_REDDIT", False)
-    result = reddit_node(STATE)
+    result = asyncio.run(reddit_node(STATE))
     assert result.status == "disabled"
 
 
 def test_enabled_no_hits_returns_empty(monkeypatch):
     _clear_cache()
     monkeypatch.setattr(config, "ENABLE_REDDIT", True)
-    monkeypatch.setattr(reddit, "search_ftc", lambda term, **k: [])
+    monkeypatch.setattr(reddit, "asearch_ftc", _async(lambda term, **k: []))
 
-    result = reddit_node(STATE)
+    result = asyncio.run(reddit_node(STATE))
     assert result.status == "empty"
 
 
@@ -36,9 +44,9 @@ def test_enabled_with_hits_renders_text_and_citations(monkeypatch):
             "created_utc": 1700000000.0,
         }]
 
-    monkeypatch.setattr(reddit, "search_ftc", fake_search)
+    monkeypatch.setattr(reddit, "asearch_ftc", _async(fake_search))
 
-    result = reddit_node(STATE)
+    result = asyncio.run(reddit_node(STATE))
     assert result.status == "ok"
     assert "14469 robot reveal" in result.text
     assert "42 upvotes" in result.text
@@ -52,9 +60,9 @@ def test_prawcore_exception_becomes_error_status_not_a_crash(monkeypatch):
     def broken_search(term, **kwargs):
         raise ConnectionError("simulated prawcore failure")
 
-    monkeypatch.setattr(reddit, "search_ftc", broken_search)
+    monkeypatch.setattr(reddit, "asearch_ftc", _async(broken_search))
 
-    result = reddit_node(STATE)  # must not raise
+    result = asyncio.run(reddit_node(STATE))  # must not raise
     assert result.status == "error"
     assert "simulated prawcore failure" in result.detail
 
@@ -67,12 +75,12 @@ def test_dedupes_across_multiple_search_terms(monkeypatch):
         "title": "Same post", "selftext_excerpt": "text", "url": "https://reddit.com/r/FTC/comments/x/y/",
         "score": 1, "num_comments": 0, "created_utc": 0,
     }
-    monkeypatch.setattr(reddit, "search_ftc", lambda term, **k: [same_post])
+    monkeypatch.setattr(reddit, "asearch_ftc", _async(lambda term, **k: [same_post]))
 
     state = PipelineState(
         question="x", team_nums=(14469,), season=2022, region="All", team_names=("HOW",),
     )
-    result = reddit_node(state)
+    result = asyncio.run(reddit_node(state))
     assert result.text.count("Same post") == 1
 
 
@@ -88,9 +96,9 @@ def test_second_call_uses_cache(monkeypatch):
             "score": 1, "num_comments": 0, "created_utc": 0,
         }]
 
-    monkeypatch.setattr(reddit, "search_ftc", counting_search)
+    monkeypatch.setattr(reddit, "asearch_ftc", _async(counting_search))
 
-    reddit_node(STATE)
-    reddit_node(STATE)
+    asyncio.run(reddit_node(STATE))
+    asyncio.run(reddit_node(STATE))
 
     assert len(calls) == 1
@@ -1,3 +1,5 @@
+from unittest.mock import Mock
+
 import yaml
 import pytest
 
@@ -87,3 +89,119 @@ def test_llm_router_failure_falls_back_gracefully(monkeypatch):
 def test_route_decision_is_frozen_and_hashable():
     decision = RouteDecision(intents=frozenset({"strategy"}), sources=frozenset({"stats", "chroma"}), method="rules")
     hash(decision)  # must not raise
+
+
+# --- local intent classifier (no rule matched) ---
+
+class _FakeClassifier:
+    def __init__(self, prediction=None, error=None):
+        self._prediction = prediction
+        self._error = error
+        self.questions = []
+
+    def predict(self, question):
+        self.questions.append(question)
+        if self._error:
+            raise self._error
+        return self._prediction
+
+
+def _use_classifier(monkeypatch, classifier):
+    from nodes import intent_classifier
+
+    monkeypatch.setattr(config, "ENABLE_INTENT_CLASSIFIER", True)
+    monkeypatch.setattr(intent_classifier, "get_classifier", lambda: classifier)
+
+
+def test_confident_classifier_decides_without_the_llm(monkeypatch):
+    from nodes.intent_classifier import IntentPrediction
+
+    monkeypatch.setattr(config, "ENABLE_LLM_ROUTER", True)
+    monkeypatch.setattr("nodes.router._llm_route", Mock(side_effect=AssertionError("llm called")))
+    _use_classifier(monkeypatch, _FakeClassifier(IntentPrediction(frozenset({"reputation"}), 0.9)))
+
+    decision = route(_state("Is 14469 a famous team?"))
+
+    assert decision.method == "classifier"
+    assert decision.sources == frozenset({"stats", "chroma", "chief_delphi", "reddit"})
+
+
+def test_unsure_classifier_defers_to_the_llm_router(monkeypatch):
+    from nodes.intent_classifier import IntentPrediction
+
+    monkeypatch.setattr(config, "INTENT_CLASSIFIER_MIN_CONFIDENCE", 0.6)
+    llm = RouteDecision(intents=frozenset({"comparison"}), sources=frozenset({"stats", "chroma", "reddit"}),
+                        method="llm")
+    monkeypatch.setattr("nodes.router._llm_route", lambda q: llm)
+    _use_classifier(monkeypatch, _FakeClassifier(IntentPrediction(frozenset({"strategy"}), 0.4)))
+
+    assert route(_state("Is 14469 going places?")) == llm
+
+
+def test_classifier_failure_falls_back_gracefully(monkeypatch):
+    _use_classifier(monkeypatch, _FakeClassifier(error=RuntimeError("no model")))
+
+    decision = route(_state("What is the meaning of life?"))
+
+    assert decision.method == "fallback"
+    assert decision.sources == frozenset({"stats", "chroma"})
+
+
+def test_rules_still_run_before_the_classifier(monkeypatch):
+    classifier = _FakeClassifier()
+    _use_classifier(monkeypatch, classifier)
+
+    assert route(_state("What drivetrain does Technophobia use?")).method == "rules"
+    assert classifier.questions == []
+
+
+def test_intent_examples_cover_every_intent():
+    from nodes.intent_classifier import INTENTS, load_examples
+    from nodes.router import INTENT_SOURCES
+
+    examples = load_examples()
+    assert set(INTENTS) == set(INTENT_SOURCES)
+    assert all(set(e["intents"]) <= set(INTENTS) for e in examples)
+    for intent in INTENTS:
+        assert sum(intent in e["intents"] for e in examples) >= 15
+    assert sum(not e["intents"] for e in examples) >= 15
+
+
+def test_classifier_learns_its_training_set(hash_ef):
+    from nodes.intent_classifier import IntentClassifier, load_examples
+
+    examples = load_examples()
+    classifier = IntentClassifier(hash_ef, examples)
+
+    correct = sum(classifier.predict(e["question"]).intents == frozenset(e["intents"]) for e in examples)
+    assert correct / len(examples) >= 0.9
+    prediction = classifier.predict("What does the FTC community think of 9295?")
+    assert prediction.intents == frozenset({"reputation"}) and 0 <= prediction.confidence <= 1
+
+
+def test_classifier_reports_a_held_out_score(hash_ef):
+    from nodes.intent_classifier import IntentClassifier, load_examples
+
+    examples = load_examples()
+    score = IntentClassifier(hash_ef, examples).held_out_score(0.6)
+
+    assert score.examples == len(examples)
+    assert 0 <= score.accuracy <= 1 and 0 <= score.coverage <= 1
+    assert IntentClassifier(hash_ef, examples).held_out_score(0.0).coverage == 1.0
+
+
+def test_failed_classifier_training_is_not_retried(monkeypatch):
+    import clients
+    from nodes import intent_classifier
+
+    embeddings = Mock(side_effect=RuntimeError("no model"))
+    monkeypatch.setattr(clients, "get_embeddings", embeddings)
+    monkeypatch.setattr(config, "ENABLE_INTENT_CLASSIFIER", True)
+    monkeypatch.setattr(config, "ENABLE_LLM_ROUTER", False)
+    intent_classifier.get_classifier.cache_clear()
+    try:
+        assert route(_state("What is the meaning of life?")).method == "fallback"
+        assert route(_state("What is the meaning of life?")).method == "fallback"
+        assert embeddings.call_count == 1
+    finally:
+        intent_classifier.get_classifier.cache_clear()
@@ -1,3 +1,5 @@
+import json
+
 from stats import compute_team_season_facts
 from nodes.base import PipelineState
 from nodes.stats_node import (
@@ -77,7 +79,7 @@ def test_fetch_facts_dicts_bounded_returns_none_for_failed_team(monkeypatch, pay
             return payload_9295_2025
         raise ConnectionError("simulated failure")
 
-    monkeypatch.setattr("nodes.stats_node.data_retrieval.fetch_team_data", fake_fetch)
+    monkeypatch.setattr("nodes.stats_node.data_retrieval.load_team_data", fake_fetch)
 
     results = _fetch_facts_dicts_bounded((9295, 99999), 2025, "All", budget_seconds=2.0)
 
@@ -89,7 +91,7 @@ def test_fetch_facts_dicts_bounded_returns_none_for_failed_team(monkeypatch, pay
 def test_fetch_facts_dicts_bounded_preserves_team_order(monkeypatch, payload_9295_2025, payload_9930_2025_sparse):
     fixtures = {9295: payload_9295_2025, 9930: payload_9930_2025_sparse}
     monkeypatch.setattr(
-        "nodes.stats_node.data_retrieval.fetch_team_data",
+        "nodes.stats_node.data_retrieval.load_team_data",
         lambda team_number, season, region: fixtures[team_number],
     )
 
@@ -104,9 +106,8 @@ def test_fetch_facts_dicts_bounded_times_out_gracefully(monkeypatch):
 
     def slow_fetch(team_number, season, region):
         time.sleep(2)
-        return None
 
-    monkeypatch.setattr("nodes.stats_node.data_retrieval.fetch_team_data", slow_fetch)
+    monkeypatch.setattr("nodes.stats_node.data_retrieval.load_team_data", slow_fetch)
 
     start = time.monotonic()
     results = _fetch_facts_dicts_bounded((1, 2), 2025, "All", budget_seconds=0.2)
@@ -119,11 +120,22 @@ def test_fetch_facts_dicts_bounded_times_out_gracefully(monkeypatch):
 # --- stats_node integration: head-to-head is appended, but never at the cost of the base facts ---
 
 class _FakeVectorStore:
-    def __init__(self, docs):
+    def __init__(self, docs, metadatas=None):
         self._docs = docs
+        self._metadatas = metadatas
+        self.calls = 0
 
     def get(self, ids, include=None):
-        return {"documents": self._docs}
+        self.calls += 1
+        result = {"documents": self._docs}
+        if self._metadatas is not None and "metadatas" in (include or []):
+            result["metadatas"] = self._metadatas
+        return result
+
+
+def _facts_meta(payload, season):
+    facts = compute_team_season_facts(payload, season, "All")
+    return {"type": "season_facts", "team": facts["team"], "facts_json": json.dumps(facts)}
 
 
 def test_stats_node_single_team_has_no_head_to_head(monkeypatch):
@@ -145,7 +157,7 @@ def test_stats_node_two_teams_appends_head_to_head(monkeypatch, payload_9295_202
     )
     fixtures = {9295: payload_9295_2025, 9930: payload_9930_2025_sparse}
     monkeypatch.setattr(
-        "nodes.stats_node.data_retrieval.fetch_team_data",
+        "nodes.stats_node.data_retrieval.load_team_data",
         lambda team_number, season, region: fixtures[team_number],
     )
 
@@ -167,7 +179,7 @@ def test_stats_node_head_to_head_failure_still_returns_base_facts(monkeypatch):
     def broken_fetch(team_number, season, region):
         raise RuntimeError("FTCScout is down")
 
-    monkeypatch.setattr("nodes.stats_node.data_retrieval.fetch_team_data", broken_fetch)
+    monkeypatch.setattr("nodes.stats_node.data_retrieval.load_team_data", broken_fetch)
 
     state = PipelineState(question="x", team_nums=(9295, 9930), season=2025, region="All")
     result = stats_node(state)  # must not raise, must not lose the base facts
@@ -180,10 +192,80 @@ def test_stats_node_head_to_head_failure_still_returns_base_facts(monkeypatch):
 
 def test_stats_node_more_than_max_comparison_teams_skips_head_to_head(monkeypatch):
     monkeypatch.setattr(
-        "nodes.stats_node.get_vector_store", lambda: _FakeVectorStore(["facts"] * 4),
+        "nodes.stats_node.get_vector_store", lambda: _FakeVectorStore(["facts"] * 7),
     )
-    state = PipelineState(question="x", team_nums=(1, 2, 3, 4), season=2025, region="All")
+    state = PipelineState(question="x", team_nums=(1, 2, 3, 4, 5, 6, 7), season=2025, region="All")
 
     result = stats_node(state)
 
     assert HEAD_TO_HEAD_MARKER not in result.text
+
+
+def test_head_to_head_reads_stored_payloads_without_network(monkeypatch, payload_9295_2025, payload_9930_2025_sparse):
+    import data_retrieval
+    import payload_store
+
+    for team, payload in ((9295, payload_9295_2025), (9930, payload_9930_2025_sparse)):
+        payload_store.get_store().put(team, 2022, "All", data_retrieval.PAYLOAD_SCHEMA_VERSION, payload)
+
+    # No fetch is patched: the offline network guard fails the test if
+    # either team misses the store.
+    results = _fetch_facts_dicts_bounded((9295, 9930), 2022, "All", budget_seconds=2.0)
+
+    assert [r["team"] for r in results] == [9295, 9930]
+
+
+# --- head-to-head from stored facts (season_facts `facts_json` metadata) ---
+
+def test_head_to_head_uses_stored_facts_without_loading(monkeypatch, payload_9295_2025, payload_9930_2025_sparse):
+    store = _FakeVectorStore(
+        ["Team 9295 facts.", "Team 9930 facts."],
+        [_facts_meta(payload_9930_2025_sparse, 2025), _facts_meta(payload_9295_2025, 2025)],
+    )
+    monkeypatch.setattr("nodes.stats_node.get_vector_store", lambda: store)
+
+    def must_not_load(team_number, season, region):
+        raise AssertionError("head-to-head loaded a payload although facts were stored")
+
+    monkeypatch.setattr("nodes.stats_node.data_retrieval.load_team_data", must_not_load)
+
+    result = stats_node(PipelineState(question="x", team_nums=(9295, 9930), season=2025, region="All"))
+
+    assert store.calls == 1
+    expected = render_head_to_head([
+        compute_team_season_facts(payload_9295_2025, 2025, "All"),
+        compute_team_season_facts(payload_9930_2025_sparse, 2025, "All"),
+    ])
+    assert result.text.endswith(expected)
+
+
+def test_head_to_head_covers_six_teams(monkeypatch, payload_9295_2025):
+    metas = []
+    for team in range(1, 7):
+        facts = {**compute_team_season_facts(payload_9295_2025, 2025, "All"), "team": team}
+        metas.append({"team": team, "facts_json": json.dumps(facts)})
+    monkeypatch.setattr("nodes.stats_node.get_vector_store", lambda: _FakeVectorStore(["facts"] * 6, metas))
+
+    result = stats_node(PipelineState(question="x", team_nums=(1, 2, 3, 4, 5, 6), season=2025, region="All"))
+
+    assert HEAD_TO_HEAD_MARKER in result.text
+    assert "Team 6: " in result.text
+
+
+def test_head_to_head_loads_only_teams_without_stored_facts(monkeypatch, payload_9295_2025,
+                                                           payload_9930_2025_sparse):
+    store = _FakeVectorStore(["Team 9295 facts.", "Team 9930 facts."], [_facts_meta(payload_9295_2025, 2025), {}])
+    monkeypatch.setattr("nodes.stats_node.get_vector_store", lambda: store)
+    loaded = []
+
+    def load(team_number, season, region):
+        loaded.append(team_number)
+        return payload_9930_2025_sparse
+
+    monkeypatch.setattr("nodes.stats_node.data_retrieval.load_team_data", load)
+
+    result = stats_node(PipelineState(question="x", team_nums=(9295, 9930), season=2025, region="All"))
+
+    assert loaded == [9930]
+    assert HEAD_TO_HEAD_MARKER in result.text
+
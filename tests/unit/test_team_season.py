@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pytest
+
+from processor import process_team_data
+from stats import compute_team_season_facts
+from team_season import MatchRecord, TeamSeason
+
+
+def test_parses_only_on_field_played_matches(payload_14469_2022):
+    team = TeamSeason.from_payload(payload_14469_2022, 2022)
+
+    assert team.number == 14469 and team.season == 2022
+    assert len(team.matches) == 29
+    assert team.totals.shape == team.auto.shape == team.dc.shape == team.eg.shape == (29,)
+    assert np.nanmax(team.totals) == 306
+    high = team.matches[int(np.nanargmax(team.totals))]
+    assert (high.description, high.event_code, high.alliance, high.split) == ("F-1", "USILPWLT", "blue", True)
+
+
+def test_records_are_slotted(payload_14469_2022):
+    team = TeamSeason.from_payload(payload_14469_2022, 2022)
+    for record in (team, team.matches[0], team.events[0], team.awards[0], team.quick_stats):
+        assert not hasattr(record, "__dict__")
+
+
+def test_remote_season_scores_are_flat(payload_20266_2021_remote):
+    team = TeamSeason.from_payload(payload_20266_2021_remote, 2021)
+    remote = [m for m in team.matches if m.event_code == "CABCNVS3"]
+    assert remote and not any(m.split for m in remote)
+    assert all(m.total is not None for m in remote)
+
+
+def test_missing_components_are_nan():
+    match = MatchRecord("E", "Q-1", 2025, "red", "One", "Captain", True, {"totalPoints": 10})
+    team = TeamSeason._build(
+        [match], number=1, name="T", season=2025, city=None, state=None, country=None, rookie_year=None,
+        school=None, quick_stats=None, awards=(), events=(),
+    )
+    assert team.totals.tolist() == [10.0]
+    assert np.isnan(team.eg).all()
+
+
+@pytest.mark.parametrize("fixture_name,season", [
+    ("payload_14469_2022", 2022), ("payload_14469_2025", 2025), ("payload_20266_2021_remote", 2021),
+    ("payload_9930_2025_sparse", 2025),
+])
+def test_consumers_give_the_same_output_from_the_model(request, fixture_name, season):
+    raw = request.getfixturevalue(fixture_name)
+    team = TeamSeason.from_payload(raw, season)
+
+    assert process_team_data(team, season, "All") == process_team_data(raw, season, "All")
+    assert compute_team_season_facts(team, season, "All") == compute_team_season_facts(raw, season, "All")
+
+
+def test_round_trips_through_bytes_and_is_compact(payload_14469_2025):
+    team = TeamSeason.from_payload(payload_14469_2025, 2025)
+    blob = team.to_bytes()
+    restored = TeamSeason.from_bytes(blob)
+
+    assert restored.matches == team.matches and restored.events == team.events and restored.awards == team.awards
+    np.testing.assert_array_equal(restored.totals, team.totals)
+    assert process_team_data(restored, 2025, "All") == process_team_data(payload_14469_2025, 2025, "All")
+    assert len(blob) * 10 < len(json.dumps(payload_14469_2025))
+
+
+def test_rejects_unknown_format():
+    import zstandard
+
+    blob = zstandard.ZstdCompressor().compress(json.dumps({"v": 99}).encode())
+    with pytest.raises(ValueError):
+        TeamSeason.from_bytes(blob)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from pathlib import Path
 
@@ -92,6 +93,19 @@ def test_search_raises_on_http_error(monkeypatch):
         discourse.search("anything")
 
 
+def test_asearch_parses_the_same_way(monkeypatch):
+    captured = {}
+
+    async def fake_aget(url, *, params=None, timeout=None, **kwargs):
+        captured.update(url=url, params=params)
+        return _FakeResponse(RAW_HIT)
+
+    monkeypatch.setattr("tools.http.aget", fake_aget)
+
+    assert asyncio.run(discourse.asearch("14469 FTC")) == discourse._parse(RAW_HIT, 5)
+    assert captured == {"url": discourse.SEARCH_URL, "params": {"term": "14469 FTC"}}
+
+
 def test_search_term_passed_via_params_not_interpolated(monkeypatch):
     """The search host is a fixed constant and `term` must go through
     `params=` (URL-encoded), never string-interpolated into the URL --
@@ -1,3 +1,5 @@
+import asyncio
+
 import config
 from tools import reddit
 
@@ -112,3 +114,50 @@ def test_get_client_reads_config(monkeypatch):
     assert captured["client_secret"] == "test-secret"
     assert captured["user_agent"] == "test-agent"
     reddit.get_client.cache_clear()
+
+
+# --- asearch_ftc: the same results over Reddit's OAuth API ---
+
+class _FakeHttpxResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def test_asearch_ftc_authenticates_once_and_maps_results(monkeypatch):
+    monkeypatch.setattr(config, "REDDIT_CLIENT_ID", "test-id")
+    monkeypatch.setattr(config, "REDDIT_CLIENT_SECRET", "test-secret")
+    monkeypatch.setattr(reddit, "_token", {"value": None, "expires_at": 0.0})
+    posts, searches = [], []
+
+    async def fake_post(url, **kwargs):
+        posts.append((url, kwargs["auth"], kwargs["data"]))
+        return _FakeHttpxResponse({"access_token": "tok", "expires_in": 3600})
+
+    async def fake_get(url, *, params=None, **kwargs):
+        searches.append((url, params, kwargs["headers"]["Authorization"]))
+        return _FakeHttpxResponse({"data": {"children": [{"data": {
+            "title": "14469 HOW Robot Reveal 2025", "selftext": "x" * 1000,
+            "permalink": "/r/FTC/comments/abc123/14469_reveal/", "score": 42, "num_comments": 7,
+            "created_utc": 1700000000.0,
+        }}]}})
+
+    monkeypatch.setattr("tools.http.apost", fake_post)
+    monkeypatch.setattr("tools.http.aget", fake_get)
+
+    results = asyncio.run(reddit.asearch_ftc("14469", limit=3))
+    asyncio.run(reddit.asearch_ftc("9295", limit=3))
+
+    assert results[0]["url"] == "https://reddit.com/r/FTC/comments/abc123/14469_reveal/"
+    assert len(results[0]["selftext_excerpt"]) == 500
+    assert results[0]["score"] == 42
+    assert posts == [(reddit.TOKEN_URL, ("test-id", "test-secret"), {"grant_type": "client_credentials"})]
+    assert [s[0] for s in searches] == [reddit.SEARCH_URL] * 2
+    assert searches[0][1]["q"] == "14469"
+    assert searches[0][1]["sort"] == "relevance" and searches[0][1]["t"] == "year" and searches[0][1]["limit"] == 3
+    assert searches[1][2] == "bearer tok"